@@ -0,0 +1,391 @@
+"""Pure Python/NumPy stand-in for the OrcaFlex API (OrcFxAPI).
+
+Only the parts used by OrcaFOWT are implemented. Results are synthetic
+(deterministic for the same object, variable and position), and sizes and
+latencies are configurable, so the Python overhead of OrcaFOWT can be
+measured without an OrcaFlex licence.
+
+Usage (before importing OrcaFOWT modules):
+
+    import sys, FakeOrcFxAPI
+    sys.modules["OrcFxAPI"] = FakeOrcFxAPI
+
+The configuration is the dict 'config', updated from the JSON in the
+environment variable FAKE_ORCFXAPI_CONFIG, e.g.:
+
+    {"samples": 6001, "nodes": 201, "latency": {"RunSimulation": 0.5}}
+"""
+
+from collections import namedtuple
+import json
+import os
+import pickle
+import time
+import zlib
+
+import numpy as np
+
+config = {
+    "lines": 2,  # lines created when loading a file
+    "nodes": 51,  # nodes per line
+    "samples": 601,  # samples of dynamic results
+    "sample interval": 0.1,
+    "statics iterations": 20,  # from the template configuration
+    "file size": 1024,  # bytes written by SaveData/SaveSimulation
+    # Seconds spent by each call (e.g.: "RunSimulation", "TimeHistory")
+    "latency": dict(),
+}
+config.update(json.loads(os.environ.get("FAKE_ORCFXAPI_CONFIG", "{}")))
+
+# Object types
+otGeneral = 1
+otEnvironment = 3
+otVessel = 5
+otLine = 6
+otConstraint = 9
+otTurbine = 10
+otLineType = 20
+otVesselType = 21
+otVerticalVariationFactor = 30
+
+# Periods
+pnBuildUp = 0
+pnStaticState = -1
+pnWholeSimulation = 32767
+pnLatestWave = 32766
+
+ObjectExtra = namedtuple("ObjectExtra", ["kind", "values"], defaults=[()])
+oeEndA = ObjectExtra("End A")
+oeEndB = ObjectExtra("End B")
+
+SpecifiedPeriod = namedtuple(
+    "SpecifiedPeriod", ["FromTime", "ToTime"], defaults=[None, None]
+)
+TimeHistorySpecification = namedtuple(
+    "TimeHistorySpecification",
+    ["ObjectName", "VarName", "ObjectExtra"],
+    defaults=[None],
+)
+ModalAnalysisSpecification = namedtuple(
+    "ModalAnalysisSpecification",
+    ["calculateShapes", "firstMode", "lastMode", "includeCoupledObjects"],
+    defaults=[True, -1, -1, False],
+)
+ModeDetails = namedtuple(
+    "ModeDetails",
+    [
+        "modeNumber",
+        "period",
+        "mass",
+        "stiffness",
+        "shapeWrtLocal",
+        "shapeWrtGlobal",
+    ],
+)
+Statistics = namedtuple("Statistics", ["Mean", "StdDev", "Min", "Max"])
+
+
+class DataFileType:
+    Binary = 0
+    Text = 1
+
+
+def _wait(call: str) -> None:
+    latency = config["latency"].get(call, 0.0)
+    if latency:
+        time.sleep(latency)
+
+
+def oeNodeNum(node):
+    return ObjectExtra("Node", (node,))
+
+
+def oeArcLength(arc_length):
+    return ObjectExtra("Arc length", (arc_length,))
+
+
+def oeVessel(x, y, z):
+    return ObjectExtra("Vessel", (x, y, z))
+
+
+def oeTurbine(blade, arc_length):
+    return ObjectExtra("Turbine", (blade, arc_length))
+
+
+def oeEnvironment(x, y, z):
+    return ObjectExtra("Environment", (x, y, z))
+
+
+def SetLibraryPolicy(policy) -> None:
+    pass
+
+
+def _n_samples(period) -> int:
+    if period == pnStaticState or (
+        isinstance(period, SpecifiedPeriod)
+        and period.FromTime == pnStaticState
+    ):
+        return 1
+    return config["samples"]
+
+
+def _synthetic(name, var, extra, n_samples) -> np.ndarray:
+    # Deterministic signal: mean + harmonic + noise
+    seed = zlib.crc32(repr((name, var, extra)).encode())
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) * config["sample interval"]
+    mean, amplitude = rng.uniform(1.0, 1000.0), rng.uniform(0.01, 0.1)
+    period = rng.uniform(5.0, 20.0)
+    signal = mean * (1.0 + amplitude * np.sin(2.0 * np.pi * t / period))
+    return signal + rng.normal(0.0, 0.01 * mean, n_samples)
+
+
+def GetMultipleTimeHistories(specifications, period=None) -> np.ndarray:
+    _wait("GetMultipleTimeHistories")
+    n = _n_samples(period)
+    return np.column_stack(
+        [
+            _synthetic(spec.ObjectName.Name, spec.VarName, spec.ObjectExtra, n)
+            for spec in specifications
+        ]
+    )
+
+
+class OrcaFlexObject:
+    def __init__(self, model, obj_type, name) -> None:
+        self.__dict__["model"] = model
+        self.__dict__["type"] = obj_type
+        self.__dict__["data"] = {"Name": name}
+
+    def __getattr__(self, name):
+        data = self.__dict__["data"]
+        if name in data:
+            return data[name]
+        if name == "name":
+            return data["Name"]
+        raise AttributeError(f"'{data['Name']}' has no data item '{name}'")
+
+    def __setattr__(self, name, value) -> None:
+        self.__dict__["data"][name] = value
+
+    @property
+    def Name(self) -> str:
+        return self.__dict__["data"]["Name"]
+
+    def CreateClone(self, name=None, model=None):
+        model = model or self.__dict__["model"]
+        clone = model.CreateObject(self.__dict__["type"], name)
+        clone.__dict__["data"].update(
+            {k: v for k, v in self.__dict__["data"].items() if k != "Name"}
+        )
+        return clone
+
+    def SampleTimes(self, period=None) -> np.ndarray:
+        return np.arange(_n_samples(period)) * config["sample interval"]
+
+    def TimeHistory(
+        self, varNames, period=None, objectExtra=None
+    ) -> np.ndarray:
+        _wait("TimeHistory")
+        n = _n_samples(period)
+        if isinstance(varNames, str):
+            return _synthetic(self.Name, varNames, objectExtra, n)
+        return np.column_stack(
+            [_synthetic(self.Name, var, objectExtra, n) for var in varNames]
+        )
+
+    def LinkedStatistics(self, varNames, period=None, objectExtra=None):
+        _wait("LinkedStatistics")
+        values = {
+            var: self.TimeHistory(var, period, objectExtra) for var in varNames
+        }
+        return LinkedStatistics(values)
+
+
+class LinkedStatistics:
+    def __init__(self, values) -> None:
+        self.values = values
+
+    def Query(self, varName, linkedVarName):
+        data = self.values[varName]
+        return Statistics(data.mean(), data.std(), data.min(), data.max())
+
+
+class Line(OrcaFlexObject):
+    def __init__(self, model, name) -> None:
+        super().__init__(model, otLine, name)
+        nodes = config["nodes"]
+        self.Length = [float(nodes - 1)]
+        self.TargetSegmentLength = [1.0]
+        self.EndBConnection = "Anchored"
+        self.NodeArclengths = np.linspace(0.0, float(nodes - 1), nodes)
+        self.NumberOfSections = 1
+        self.CumulativeLength = [float(nodes - 1)]
+
+
+class Modes:
+    def __init__(self, obj, specification=None) -> None:
+        _wait("Modes")
+        spec = specification or ModalAnalysisSpecification()
+        # Whole system -> DoFs of all lines
+        if isinstance(obj, Model):
+            objects = [o for o in obj.objects if o.type == otLine]
+            name = "Whole system"
+        else:
+            objects, name = [obj], obj.Name
+        n_nodes = [
+            len(o.NodeArclengths) if o.type == otLine else 2 for o in objects
+        ]
+        self.dofCount = sum(3 * (n - 1) for n in n_nodes)
+        first = max(spec.firstMode, 1)
+        last = spec.lastMode if spec.lastMode > 0 else self.dofCount
+
+        self.modeCount = last - first + 1
+        self.owner = np.concatenate(
+            [
+                np.full(3 * (n - 1), o, dtype=object)
+                for o, n in zip(objects, n_nodes)
+            ]
+        )
+        self.nodeNumber = np.concatenate(
+            [np.repeat(np.arange(2, n + 1), 3) for n in n_nodes]
+        )
+        self.dofName = np.tile(["X", "Y", "Z"], self.dofCount // 3)
+
+        rng = np.random.default_rng(zlib.crc32(name.encode()))
+        self.modeNumber = np.arange(first, last + 1)
+        self.period = 100.0 / self.modeNumber
+        self.frequency = 1.0 / self.period
+        self.mass = rng.uniform(1.0, 10.0, self.modeCount)
+        self.stiffness = self.mass * (2.0 * np.pi / self.period) ** 2
+        self.shapeWrtGlobal = rng.normal(size=(self.modeCount, self.dofCount))
+        self.shapeWrtLocal = rng.normal(size=(self.modeCount, self.dofCount))
+
+    def modeDetails(self, index) -> ModeDetails:
+        return ModeDetails(
+            self.modeNumber[index],
+            self.period[index],
+            self.mass[index],
+            self.stiffness[index],
+            self.shapeWrtLocal[index],
+            self.shapeWrtGlobal[index],
+        )
+
+
+class Model:
+    def __init__(self, fileName=None) -> None:
+        self.general = OrcaFlexObject(self, otGeneral, "General")
+        self.environment = OrcaFlexObject(self, otEnvironment, "Environment")
+        self.objects = []
+        self.staticsProgressHandler = None
+        # Positions from a previous statics -> warm start
+        self.calculated_positions = False
+        if fileName is not None:
+            self.LoadData(fileName)
+
+    def __getitem__(self, name):
+        for obj in self.objects:
+            if obj.Name == name:
+                return obj
+        raise KeyError(name)
+
+    def CreateObject(self, obj_type, name=None):
+        _wait("CreateObject")
+        if name is None:
+            name = f"Object{len(self.objects) + 1}"
+        if obj_type == otLine:
+            obj = Line(self, name)
+        else:
+            obj = OrcaFlexObject(self, obj_type, name)
+        self.objects.append(obj)
+        return obj
+
+    def DestroyObject(self, obj) -> None:
+        self.objects.remove(obj if not isinstance(obj, str) else self[obj])
+
+    def _default_objects(self) -> None:
+        self.objects = []
+        self.CreateObject(otVessel, "Platform")
+        self.CreateObject(otTurbine, "Turbine")
+        for i in range(config["lines"]):
+            self.CreateObject(otLineType, f"Line type {i + 1}")
+            line = self.CreateObject(otLine, f"Line {i + 1}")
+            line.EndAConnection = "Platform"
+
+    def LoadData(self, fileName) -> None:
+        if fileName is not None and os.path.isfile(fileName):
+            with open(fileName, "rb") as file:
+                data = file.read()
+            if data.startswith(pickle.PROTO):
+                return self.LoadDataMem(data)
+        _wait("LoadData")
+        self._default_objects()
+
+    def LoadDataMem(self, data) -> None:
+        # Data saved by 'SaveDataMem' -> objects restored
+        try:
+            objects = pickle.loads(data)
+        except Exception:
+            return self.LoadData(None)
+        _wait("LoadData")
+        self.objects = []
+        for obj_type, obj_data in objects:
+            self.CreateObject(obj_type, obj_data["Name"]).data.update(obj_data)
+
+    def LoadSimulation(self, fileName) -> None:
+        _wait("LoadSimulation")
+        self._default_objects()
+
+    def _save(self, fileName, call) -> None:
+        _wait(call)
+        with open(fileName, "wb") as file:
+            file.write(b"\0" * config["file size"])
+
+    def SaveData(self, fileName) -> None:
+        if not fileName.endswith(".dat"):
+            return self._save(fileName, "SaveData")
+        # Binary data -> objects kept (see 'LoadData')
+        with open(fileName, "wb") as file:
+            file.write(self.SaveDataMem())
+
+    def SaveSimulation(self, fileName) -> None:
+        self._save(fileName, "SaveSimulation")
+
+    def SaveDataMem(self, dataFileType=DataFileType.Binary) -> bytes:
+        _wait("SaveDataMem")
+        if dataFileType == DataFileType.Text:
+            return b"\0" * config["file size"]
+        # Binary -> objects kept (see 'LoadDataMem')
+        return pickle.dumps([(obj.type, obj.data) for obj in self.objects])
+
+    def SaveSimulationMem(self) -> bytes:
+        _wait("SaveSimulationMem")
+        # Objects kept (see 'LoadSimulationMem'), padded to the file size
+        data = pickle.dumps([(obj.type, obj.data) for obj in self.objects])
+        return data + b"\0" * max(config["file size"] - len(data), 0)
+
+    def LoadSimulationMem(self, data) -> None:
+        _wait("LoadSimulation")
+        self.objects = []
+        for obj_type, obj_data in pickle.loads(data):
+            self.CreateObject(obj_type, obj_data["Name"]).data.update(obj_data)
+
+    def CalculateStatics(self) -> None:
+        _wait("CalculateStatics")
+        iterations = (
+            2 if self.calculated_positions else config["statics iterations"]
+        )
+        for it in range(1, iterations + 1):
+            if self.staticsProgressHandler is not None:
+                self.staticsProgressHandler(
+                    self, f"Whole system statics: iteration {it}"
+                )
+
+    def UseCalculatedPositions(self, **kwargs) -> None:
+        self.calculated_positions = True
+
+    def RunSimulation(self) -> None:
+        _wait("RunSimulation")
+
+    def Reset(self) -> None:
+        pass
@@ -0,0 +1,245 @@
+"""End-to-end benchmarks of OrcaFOWT with the fake OrcaFlex API.
+
+Each input file (default: all in 'inputs/') is executed with
+'OrcaFOWT.main' in a fresh process, with 'FakeOrcFxAPI' registered as
+"OrcFxAPI" and the output directories redirected to a temporary one. The
+best wall time of the repetitions is appended to a history file (JSON
+lines). Each input is compared with its baseline: the median of its times
+in the last '--window' entries of the history run with the same fake API
+configuration. Inputs slower than the baseline by more than the threshold
+are reported as regressions and the exit status is 1 (e.g.: to fail a CI
+job). Inputs without history are only recorded.
+
+Timings depend on the machine, so the history is not versioned. In pull
+requests (see '.github/workflows/benchmarks.yml'), the base commit is
+benchmarked first on the same runner, into an empty history, which is
+the baseline of the pull request.
+
+Usage:
+    python benchmarks/run_benchmarks.py [inputs ...] [--repeat 3]
+        [--threshold 0.2] [--window 5] [--history benchmarks/history.jsonl]
+        [--no-record]
+
+The fake API is configured with the environment variable
+FAKE_ORCFXAPI_CONFIG (see 'FakeOrcFxAPI.py').
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OrcaFOWT benchmarks")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(ROOT_DIR, "inputs", "*.json"))),
+        help="input files (default: all in 'inputs/')",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as regression",
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=5,
+        help="number of history entries of the baseline of each input",
+    )
+    parser.add_argument(
+        "--history", default=os.path.join(BENCH_DIR, "history.jsonl")
+    )
+    parser.add_argument(
+        "--no-record", action="store_true", help="do not append to the history"
+    )
+    # Internal: run a single input in this process
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def prepare_input(input_file: str, work_dir: str) -> str:
+    """Copy an input file, redirecting output directories to 'work_dir'
+
+    Args:
+        input_file (str): [description]
+        work_dir (str): [description]
+
+    Returns:
+        str: name of the input (without extension)
+    """
+
+    with open(input_file, "r") as f:
+        data = json.load(f)
+
+    output = data["File IO"].setdefault("output", dict())
+    output["dir"] = "./"
+    output["results dir"] = "./results/"
+    os.makedirs(os.path.join(work_dir, "results"), exist_ok=True)
+
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    with open(os.path.join(work_dir, name + ".json"), "w") as f:
+        json.dump(data, f, indent=4)
+
+    return name
+
+
+def run_single(name: str) -> float:
+    """Execute an input (in the current directory) with the fake API
+
+    Args:
+        name (str): input name (without extension)
+
+    Returns:
+        float: wall time in seconds
+    """
+
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    sys.path[:0] = [SRC_DIR, BENCH_DIR]
+
+    import FakeOrcFxAPI
+
+    sys.modules["OrcFxAPI"] = FakeOrcFxAPI
+
+    import OrcaFOWT
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        t0 = time.perf_counter()
+        OrcaFOWT.main([name, "--input-dir", "./"])
+        return time.perf_counter() - t0
+
+
+def run_input(input_file: str) -> float:
+    """Execute an input in a new process and temporary directory
+
+    Args:
+        input_file (str): [description]
+
+    Returns:
+        float: wall time in seconds
+    """
+
+    work_dir = tempfile.mkdtemp(prefix="orcafowt-bench-")
+    try:
+        name = prepare_input(input_file, work_dir)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single", name],
+            cwd=work_dir,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Benchmark of '{input_file}' failed:\n{proc.stderr}"
+            )
+        return json.loads(proc.stdout.splitlines()[-1])["elapsed"]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def load_baselines(history_file: str, config: str, window: int) -> dict:
+    """Baseline time of each input: median of its last 'window' results
+    with the same fake API configuration
+
+    Args:
+        history_file (str): [description]
+        config (str): FAKE_ORCFXAPI_CONFIG of the current run
+        window (int): [description]
+
+    Returns:
+        dict: input name -> time (s)
+    """
+
+    if not os.path.isfile(history_file):
+        return dict()
+    with open(history_file, "r") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    times: dict[str, list[float]] = dict()
+    for entry in reversed(entries):
+        if entry.get("fake config", "{}") != config:
+            continue
+        for name, elapsed in entry.get("results", dict()).items():
+            if len(times.setdefault(name, [])) < window:
+                times[name].append(elapsed)
+    return {name: statistics.median(vals) for name, vals in times.items()}
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.single:
+        print(json.dumps({"elapsed": run_single(args.single)}))
+        return 0
+
+    config = os.environ.get("FAKE_ORCFXAPI_CONFIG", "{}")
+    baselines = load_baselines(args.history, config, args.window)
+    results = dict()
+    regressions = []
+
+    print(f"{'Input':45s} {'Best [s]':>10s} {'Baseline':>10s} {'Change':>8s}")
+    for input_file in args.inputs:
+        name = os.path.splitext(os.path.basename(input_file))[0]
+        results[name] = min(run_input(input_file) for _ in range(args.repeat))
+
+        line = f"{name:45s} {results[name]:10.3f}"
+        if name in baselines:
+            change = results[name] / baselines[name] - 1.0
+            line += f" {baselines[name]:10.3f} {change:+8.1%}"
+            if change > args.threshold:
+                regressions.append(name)
+                line += "  <- regression"
+        print(line)
+
+    if not args.no_record:
+        entry = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "fake config": config,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:"
+            f" {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
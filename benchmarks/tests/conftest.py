@@ -0,0 +1,16 @@
+"""Unit tests of the modules that do not use the OrcaFlex API.
+
+Run from the repository root:
+    python -m pytest benchmarks/tests
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path[:0] = [
+    os.path.join(ROOT_DIR, "src"),
+    os.path.join(ROOT_DIR, "benchmarks"),
+]
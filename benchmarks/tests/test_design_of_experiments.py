@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import DesignOfExperiments as doe
+
+
+def test_full_factorial():
+    combinations = list(doe.full_factorial([[1, 2], ["a", "b", "c"]]))
+    assert len(combinations) == 6
+    assert combinations[0] == (1, "a") and combinations[-1] == (2, "c")
+
+
+def test_latin_hypercube_strata():
+    unit = doe.latin_hypercube(10, 3, np.random.default_rng(0))
+    assert unit.shape == (10, 3)
+    assert ((unit >= 0.0) & (unit < 1.0)).all()
+    # One sample in each stratum of each dimension
+    for dim in range(3):
+        assert sorted((unit[:, dim] * 10).astype(int)) == list(range(10))
+
+
+def test_latin_hypercube_seed():
+    a = doe.latin_hypercube(8, 2, np.random.default_rng(42))
+    b = doe.latin_hypercube(8, 2, np.random.default_rng(42))
+    c = doe.latin_hypercube(8, 2, np.random.default_rng(43))
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(a, c)
+
+
+def test_sobol_bounds_and_seed():
+    pytest.importorskip("scipy.stats")
+    a = doe.sobol(6, 3, seed=7)
+    assert a.shape == (6, 3)
+    assert ((a >= 0.0) & (a < 1.0)).all()
+    np.testing.assert_array_equal(a, doe.sobol(6, 3, seed=7))
+    assert not np.array_equal(a, doe.sobol(6, 3, seed=8))
+    # Seeds drawn for the journal (see 'BatchJournal') are large integers
+    big = 75233595289498306131681092778082300176
+    np.testing.assert_array_equal(doe.sobol(4, 2, big), doe.sobol(4, 2, big))
+
+
+def test_halton():
+    points = doe.halton(4, 2)
+    np.testing.assert_allclose(points[:, 0], [0.5, 0.25, 0.75, 0.125])
+    np.testing.assert_allclose(points[:, 1], [1 / 3, 2 / 3, 1 / 9, 4 / 9])
+
+
+def test_primes():
+    assert doe.get_primes(6) == [2, 3, 5, 7, 11, 13]
+
+
+def test_scale_range():
+    unit = np.array([0.0, 0.5, 0.999])
+    np.testing.assert_allclose(
+        doe.scale(unit, {"range": [10.0, 20.0]}), [10.0, 15.0, 19.99]
+    )
+    np.testing.assert_allclose(
+        doe.scale(np.array([0.0, 0.5]), {"range": [1.0, 100.0], "log": True}),
+        [1.0, 10.0],
+    )
+
+
+def test_scale_values():
+    unit = np.array([0.0, 0.33, 0.34, 0.99])
+    assert doe.scale(unit, {"values": ["a", "b", "c"]}) == ["a", "a", "b", "c"]
+
+
+def test_scale_values_range():
+    # Range of discrete values, e.g.: latin hypercube samples
+    unit = doe.latin_hypercube(6, 1, np.random.default_rng(1))[:, 0]
+    values = doe.scale(unit, {"values": {"from": 1.0, "to": 3.0, "step": 1.0}})
+    assert sorted(values) == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+    assert all(type(v) is float for v in values)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from Fatigue import Fatigue, FatigueCurve, get_turning_points, rainflow
+
+# Example of ASTM E1049-85 (rainflow counting): range -> cycles
+astm_sequence = [-2.0, 1.0, -3.0, 5.0, -1.0, 3.0, -4.0, 4.0, -2.0]
+astm_cycles = {3.0: 0.5, 4.0: 1.5, 6.0: 0.5, 8.0: 1.0, 9.0: 0.5}
+
+
+def count_by_range(ranges, counts) -> dict:
+    cycles = dict()
+    for r, c in zip(ranges, counts):
+        cycles[float(r)] = cycles.get(float(r), 0.0) + float(c)
+    return cycles
+
+
+def test_turning_points_plateaus():
+    block = np.array([0.0, 1.0, 1.0, 2.0, 2.0, 0.0, 0.0, 0.0, 3.0])[:, None]
+    values, channels = get_turning_points(block)
+    np.testing.assert_array_equal(values, [0.0, 2.0, 0.0, 3.0])
+    np.testing.assert_array_equal(channels, 0)
+
+
+def test_rainflow_astm_example():
+    block = np.array(astm_sequence)[:, None]
+    ranges, means, counts, channels = rainflow(*get_turning_points(block))
+    assert count_by_range(ranges, counts) == astm_cycles
+    # Full cycle between -1 and 3
+    assert means[counts == 1.0].tolist() == [1.0]
+
+
+def test_rainflow_channels_independent():
+    # Same sequence scaled in a second channel, and a constant channel
+    sequence = np.array(astm_sequence)
+    block = np.column_stack([sequence, 2.0 * sequence, np.ones_like(sequence)])
+    ranges, _, counts, channels = rainflow(*get_turning_points(block))
+    assert (
+        count_by_range(ranges[channels == 0], counts[channels == 0])
+        == astm_cycles
+    )
+    assert count_by_range(ranges[channels == 1], counts[channels == 1]) == {
+        2.0 * r: c for r, c in astm_cycles.items()
+    }
+    assert counts[channels == 2].sum() == 0.5  # first and last samples
+
+
+def test_curve_damage():
+    curve = FatigueCurve({"m": 3.0, "a": 1e12, "scale": 2.0, "threshold": 1.0})
+    damage = curve.get_damage(np.array([10.0, 0.4]), np.array([1.0, 1.0]))
+    np.testing.assert_allclose(damage, [20.0**3 / 1e12, 0.0])
+
+
+def test_bilinear_curve():
+    # N = max over segments -> the least damaging segment
+    curve = FatigueCurve({"m": [3.0, 5.0], "log a": [12.0, 15.0]})
+    n = max(1e12 * 100.0**-3, 1e15 * 100.0**-5)
+    np.testing.assert_allclose(
+        curve.get_damage(np.array([100.0]), np.ones(1)), 1.0 / n
+    )
+
+
+def test_fatigue_channels_and_chunks():
+    opt = {
+        "curves": {"chain": {"m": 3.0, "a": 1e12}},
+        "lines": [{"id": "all", "curve": "chain"}],
+        "chunk size": 1,
+        "workers": 2,
+    }
+    fatigue = Fatigue(opt)
+    sequence = np.array(astm_sequence)
+    names = ["Line1_NodeA_Tension", "Line2_NodeA_Tension", "Line1_NodeA_X"]
+    fatigue.update(names, np.column_stack([sequence, sequence, sequence]))
+
+    expected = sum(c * r**3 for r, c in astm_cycles.items()) / 1e12
+    assert list(fatigue.damage) == names[:2]
+    np.testing.assert_allclose(list(fatigue.damage.values()), expected)
+    assert fatigue.cycles["Line1_NodeA_Tension"] == 4.0
@@ -0,0 +1,116 @@
+import pytest
+
+import LoadCaseMatrix as lcm
+
+
+def get_dlc(**kwargs) -> dict:
+    dlc = {
+        "name": "1.1",
+        "wind": {"type": "constant", "speed": 10.0, "direction": 0.0},
+        "wave": {"type": "JONSWAP", "Hs": 2.0, "Tp": 8.0, "direction": 0.0},
+    }
+    return dlc | kwargs
+
+
+def test_get_values():
+    assert lcm.get_values(None) == [None]
+    assert lcm.get_values(3.0) == [3.0]
+    assert lcm.get_values([1, 2]) == [1, 2]
+    values = lcm.get_values({"from": 4.0, "to": 6.0, "step": 1.0})
+    assert values == [4.0, 5.0, 6.0]
+    assert all(type(v) is float for v in values)
+
+
+def test_expand_combinations():
+    dlc = get_dlc(**{"wind speed": [8.0, 10.0], "wind direction": [0.0, 30.0]})
+    cases = lcm.expand_dlc(dlc, seeds=[])
+    assert len(cases) == 4
+    # Wave direction aligned with the wind by default
+    for case in cases:
+        assert case.wave["direction"] == case.wind["direction"]
+        assert case.dlcs == ("1.1",)
+
+
+def test_expand_seeds():
+    dlc = get_dlc(seeds=2, **{"wind speed": [8.0, 10.0]})
+    cases = lcm.expand_dlc(dlc, seeds=[11, 12, 13])
+    assert len(cases) == 4
+    assert sorted({case.wave["seed"] for case in cases}) == [11, 12]
+    # Constant wind -> seed has no effect
+    assert all("seed" not in case.wind for case in cases)
+
+
+def test_conditional_sea_states():
+    states = [
+        {"wind speed": 8.0, "Hs": 1.5, "Tp": 7.0},
+        {"wind speed": 10.0, "Hs": 2.5, "Tp": 9.0},
+        {"Hs": 4.0, "Tp": 11.0},
+    ]
+    dlc = get_dlc(**{"wind speed": [8.0, 10.0], "sea states": states})
+    cases = lcm.expand_dlc(dlc, seeds=[])
+    pairs = sorted((case.wind["speed"], case.wave["Hs"]) for case in cases)
+    assert pairs == [(8.0, 1.5), (8.0, 4.0), (10.0, 2.5), (10.0, 4.0)]
+
+    with pytest.raises(ValueError):
+        lcm.get_sea_states(dlc | {"sea states": states[:1]}, 12.0)
+
+
+def test_normalise_wind():
+    assert lcm.normalise_wind("null") == lcm.still_wind
+    still = {"type": "constant", "speed": 0.0, "direction": 45.0}
+    assert lcm.normalise_wind(still) == lcm.still_wind
+    wind = {
+        "type": "constant",
+        "speed": 0.1 + 0.2,
+        "direction": -90.0,
+        "seed": 1,
+    }
+    assert lcm.normalise_wind(wind) == {
+        "type": "constant",
+        "speed": 0.3,
+        "direction": 270.0,
+    }
+
+
+def test_normalise_wave():
+    assert lcm.normalise_wave({"type": "JONSWAP", "Hs": 0.0}) == "null"
+    wave = {"type": "Airy", "height": 1.0, "direction": 360.0, "seed": 3}
+    assert lcm.normalise_wave(wave) == {
+        "type": "Airy",
+        "height": 1.0,
+        "direction": 0.0,
+    }
+    wave = {"type": "JONSWAP", "Hs": 2.0, "direction": 0.0, "seed": 3}
+    assert lcm.normalise_wave(wave)["seed"] == 3
+
+
+def test_deduplicate():
+    a = lcm.expand_dlc(get_dlc(name="1.1", **{"wind speed": [8.0, 10.0]}), [])
+    b = lcm.expand_dlc(get_dlc(name="1.2", **{"wind speed": [10.0, 12.0]}), [])
+    # Same still cases from different definitions
+    c = lcm.expand_dlc(
+        {"name": "6.1", "wind": "null", "wind direction": [0.0, 90.0]}, []
+    )
+
+    cases = lcm.deduplicate(a + b + c)
+    assert len(cases) == 4
+    assert [case.wind["speed"] for case in cases[:3]] == [8.0, 10.0, 12.0]
+    assert cases[1].dlcs == ("1.1", "1.2")
+    assert cases[3].dlcs == ("6.1",) and cases[3].wave == "null"
+
+
+def test_order_cases():
+    wave = {"type": "JONSWAP", "Hs": 2.0, "Tp": 8.0, "direction": 0.0}
+    waves = [wave | {"Hs": 3.0}, wave, wave, "null", wave | {"seed": 2}]
+    waves.append(wave | {"seed": 1})
+    speeds = [12.0, 8.0, 12.0, 8.0, 8.0, 8.0]
+    cases = [
+        lcm.LoadCase(
+            i, ("a",), {"type": "constant", "speed": speed}, case_wave
+        )
+        for i, (speed, case_wave) in enumerate(zip(speeds, waves))
+    ]
+    ordered = [case.index for case in lcm.order_cases(cases)]
+    # Waves first (Hs 2 before 3, "null" last), then wind speed, then seed
+    assert ordered == [1, 5, 4, 2, 0, 3]
+    assert lcm.order_cases([]) == []
@@ -0,0 +1,24 @@
+import os
+
+from ModalCache import ModalCache
+
+
+def test_memory_entries_bounded():
+    cache = ModalCache({"max entries": 2})
+    for key in ["a", "b", "c"]:
+        cache.store(key, key.upper())
+    # Least recently used dropped
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+    cache.store("d", "D")
+    assert list(cache.entries) == ["b", "d"]
+    assert cache.hits == 1
+
+
+def test_disk_entries(tmp_path):
+    cache = ModalCache({"dir": str(tmp_path)})
+    cache.store("key", {"period": [1.0]})
+    # Only complete files (no temporary ones), not kept in memory
+    assert os.listdir(tmp_path) == ["key.pkl"]
+    assert not cache.entries
+    assert ModalCache({"dir": str(tmp_path)}).get("key") == {"period": [1.0]}
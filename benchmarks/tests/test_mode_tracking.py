@@ -0,0 +1,72 @@
+import numpy as np
+
+from ModeTracking import ModeTracker, get_mac, match_modes, resample_shapes
+
+
+def get_shapes(n_nodes: int, n_modes: int = 3) -> np.ndarray:
+    # Sine modes of a string, single DoF -> mode x node x DoF
+    x = np.linspace(0.0, 1.0, n_nodes)
+    return np.stack([np.sin((m + 1) * np.pi * x) for m in range(n_modes)])[
+        ..., None
+    ]
+
+
+def test_mac_identity():
+    shapes = get_shapes(50).reshape(3, -1)
+    mac = get_mac(shapes, shapes)
+    np.testing.assert_allclose(mac, np.eye(3), atol=1e-12)
+
+
+def test_mac_scale_invariant():
+    shapes = get_shapes(50).reshape(3, -1)
+    np.testing.assert_allclose(np.diag(get_mac(shapes, -2.5 * shapes)), 1.0)
+
+
+def test_mac_null_shape():
+    a = np.zeros((1, 4))
+    assert get_mac(a, np.ones((1, 4)))[0, 0] == 0.0
+
+
+def test_resample_same_points():
+    shapes = get_shapes(10)
+    np.testing.assert_array_equal(
+        resample_shapes(shapes, 10), shapes.reshape(3, -1)
+    )
+
+
+def test_resample_linear():
+    # Linear shape -> interpolated exactly
+    shapes = np.linspace(0.0, 1.0, 5)[None, :, None]
+    np.testing.assert_allclose(
+        resample_shapes(shapes, 9), np.linspace(0.0, 1.0, 9)[None, :]
+    )
+
+
+def test_resample_single_node():
+    shapes = np.array([[[1.0, 2.0, 3.0]], [[4.0, 5.0, 6.0]]])
+    np.testing.assert_array_equal(
+        resample_shapes(shapes, 100), [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    )
+
+
+def test_match_modes_threshold():
+    mac = np.array([[0.1, 0.95], [0.9, 0.2], [0.3, 0.4]])
+    assert sorted(match_modes(mac, 0.8)) == [(0, 1), (1, 0)]
+
+
+def test_tracker_crossing_modes():
+    tracker = ModeTracker(threshold=0.8, n_points=20)
+    shapes = get_shapes(30)
+    np.testing.assert_array_equal(tracker.update(shapes), [1, 2, 3])
+    # Modes 1 and 2 swapped (crossing) and other number of nodes
+    swapped = get_shapes(40)[[1, 0, 2]]
+    np.testing.assert_array_equal(tracker.update(swapped), [2, 1, 3])
+    assert len(tracker.mac) == 1
+    assert len(tracker) == 3
+
+
+def test_tracker_new_mode():
+    tracker = ModeTracker(threshold=0.8, n_points=20)
+    tracker.update(get_shapes(30, 2))
+    np.testing.assert_array_equal(tracker.update(get_shapes(30, 3)), [1, 2, 3])
+    assert len(tracker) == 3
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from OnlineStatistics import OnlineStatistics
+
+# Reference skewness and kurtosis
+stats = pytest.importorskip("scipy.stats")
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(1)
+    return np.column_stack(
+        [rng.normal(2.0, 3.0, 1000), rng.gamma(2.0, 1.0, 1000)]
+    )
+
+
+def check_moments(frame, samples):
+    np.testing.assert_allclose(frame.loc["mean"], samples.mean(axis=0))
+    np.testing.assert_allclose(frame.loc["std"], samples.std(axis=0, ddof=1))
+    np.testing.assert_allclose(frame.loc["min"], samples.min(axis=0))
+    np.testing.assert_allclose(frame.loc["max"], samples.max(axis=0))
+    np.testing.assert_allclose(frame.loc["skewness"], stats.skew(samples))
+    np.testing.assert_allclose(frame.loc["kurtosis"], stats.kurtosis(samples))
+
+
+def test_single_block(samples):
+    acc = OnlineStatistics((5, 50, 95))
+    acc.update(["a", "b"], samples)
+    frame = acc.to_frame()
+    check_moments(frame, samples)
+    # Exact percentiles of a single block
+    np.testing.assert_allclose(
+        frame.loc[["p5", "p50", "p95"]],
+        np.percentile(samples, [5, 50, 95], axis=0),
+    )
+
+
+def test_merged_blocks(samples):
+    acc = OnlineStatistics()
+    for block in np.array_split(samples, [100, 101, 640]):
+        acc.update(["a", "b"], block)
+    check_moments(acc.to_frame(), samples)
+
+
+def test_combine_accumulators(samples):
+    first, second = OnlineStatistics(), OnlineStatistics()
+    first.update(["a", "b"], samples[:300])
+    second.update(["b", "a"], samples[300:, ::-1])
+    first.combine(second)
+    check_moments(first.to_frame(), samples)
+
+
+def test_channels_added_later(samples):
+    acc = OnlineStatistics(n_channels=1)
+    acc.update(["a"], samples[:, 0])
+    acc.update(["b"], samples[:, 1])
+    assert acc.channels == ["a", "b"]
+    check_moments(acc.to_frame(), samples)
+
+
+def test_row_names():
+    acc = OnlineStatistics((50,))
+    acc.update(["X"], [[1.0], [3.0]])
+    row = acc.to_row()
+    assert row["X_mean"] == 2.0
+    assert row["X_p50"] == 2.0
+    assert row["X_max"] == 3.0
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import run_benchmarks
+
+
+def run_wave_seeds(tmp_path, batch: dict, save: dict, config: dict):
+    # Wave seed batch (8 cases) with the fake API, in a new process
+    with open(
+        os.path.join(run_benchmarks.ROOT_DIR, "inputs", "FOWTC-WaveSeed.json")
+    ) as f:
+        data = json.load(f)
+    data["Save options"] |= save
+    data["Batch"]["wave seed"] |= {"number of cases": 9} | batch
+    input_file = tmp_path / "input" / "parallel.json"
+    input_file.parent.mkdir()
+    input_file.write_text(json.dumps(data))
+
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    name = run_benchmarks.prepare_input(str(input_file), str(work_dir))
+    proc = subprocess.run(
+        [sys.executable, run_benchmarks.__file__, "--single", name],
+        cwd=work_dir,
+        env=os.environ | {"FAKE_ORCFXAPI_CONFIG": json.dumps(config)},
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return work_dir
+
+
+def test_files_of_parallel_batch(tmp_path):
+    # Background writer -> all files of the cases written before the batch
+    # ends
+    file_size = 2**24
+    work_dir = run_wave_seeds(
+        tmp_path,
+        {"workers": 2},
+        {"batch simulation": True, "background writers": 1},
+        {"file size": file_size},
+    )
+
+    for case in range(1, 9):
+        for extension in [".yml", ".sim"]:
+            file_name = work_dir / f"wave_seed_{case}_of_9{extension}"
+            assert file_name.stat().st_size == file_size
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_start_blocks(tmp_path, workers):
+    # Blocks of cases (one per worker) -> every case journaled once
+    work_dir = run_wave_seeds(
+        tmp_path, {"workers": workers, "warm start": True}, dict(), dict()
+    )
+
+    with open(work_dir / "results" / "parallel_journal.jsonl") as f:
+        entries = [json.loads(line) for line in f]
+    cases = [e["case"] for e in entries if e["status"] == "done"]
+    assert sorted(cases) == [f"wave_seed_{case}_of_9" for case in range(1, 9)]
+
+    with open(work_dir / "results" / "parallel_warm_start.json") as f:
+        report = json.load(f)
+    assert report["cases"] == 8
+    assert None not in report["iterations per case"].values()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from ResultsBuilder import ResultsBuilder
+
+
+def test_columns_in_order():
+    builder = ResultsBuilder()
+    builder["Time"] = [0.0, 0.1, 0.2]
+    builder.add_block(["a", "b"], np.arange(6.0).reshape(3, 2))
+    frame = builder.to_frame()
+    assert list(frame.columns) == ["Time", "a", "b"]
+    np.testing.assert_array_equal(frame["b"], [1.0, 3.0, 5.0])
+
+
+def test_replaced_column():
+    builder = ResultsBuilder()
+    builder.add_block(["a", "b"], [[1.0, 2.0]])
+    builder["a"] = [5.0]
+    assert builder.to_frame().loc[0].tolist() == [5.0, 2.0]
+
+
+def test_repeated_names_in_block():
+    builder = ResultsBuilder(n_cols=3)
+    builder.add_block(["a", "b", "a"], [[1.0, 2.0, 3.0]])
+    frame = builder.to_frame()
+    assert list(frame.columns) == ["a", "b"]
+    assert frame.loc[0].tolist() == [3.0, 2.0]
+
+
+def test_reserve_keeps_data():
+    builder = ResultsBuilder()
+    builder["a"] = [1.0, 2.0]
+    builder.reserve(100)
+    assert builder.capacity >= 101
+    builder.add_block([f"n{i}" for i in range(100)], np.ones((2, 100)))
+    frame = builder.to_frame()
+    assert frame.shape == (2, 101)
+    np.testing.assert_array_equal(frame["a"], [1.0, 2.0])
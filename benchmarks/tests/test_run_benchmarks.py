@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import run_benchmarks
+
+
+def write_history(path, entries) -> None:
+    with open(path, "w") as f:
+        for config, results in entries:
+            f.write(
+                json.dumps({"fake config": config, "results": results}) + "\n"
+            )
+
+
+def test_baselines_median_of_window(tmp_path):
+    history = tmp_path / "history.jsonl"
+    write_history(
+        history,
+        [
+            ("{}", {"a": 100.0}),
+            ("{}", {"a": 1.0, "b": 5.0}),
+            ('{"statics": 2}', {"a": 50.0}),
+            ("{}", {"a": 3.0}),
+            ("{}", {"a": 2.0}),
+        ],
+    )
+    # Last 3 entries of the same configuration, entries without an input
+    # are skipped
+    baselines = run_benchmarks.load_baselines(str(history), "{}", 3)
+    assert baselines == {"a": 2.0, "b": 5.0}
+    assert run_benchmarks.load_baselines(str(tmp_path / "none"), "{}", 3) == {}
+
+
+@pytest.mark.parametrize("elapsed, status", [(1.1, 0), (1.5, 1)])
+def test_exit_status(tmp_path, monkeypatch, elapsed, status):
+    history = tmp_path / "history.jsonl"
+    write_history(history, [("{}", {"a": 1.0})] * 3)
+    monkeypatch.delenv("FAKE_ORCFXAPI_CONFIG", raising=False)
+    monkeypatch.setattr(
+        run_benchmarks, "run_input", lambda input_file: elapsed
+    )
+
+    argv = ["a.json", "--repeat", "1", "--history", str(history)]
+    assert run_benchmarks.main(argv + ["--no-record"]) == status
+    assert len(history.read_text().splitlines()) == 3
+    # Regressions are recorded too (the median baseline is not shifted by
+    # a single slow entry)
+    assert run_benchmarks.main(argv) == status
+    assert len(history.read_text().splitlines()) == 4
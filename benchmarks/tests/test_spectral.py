@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from Spectral import Spectral
+
+signal = pytest.importorskip("scipy.signal")
+
+dt = 0.1
+
+
+@pytest.fixture
+def elevation():
+    rng = np.random.default_rng(2)
+    t = np.arange(4096) * dt
+    return np.sin(2.0 * np.pi * 0.2 * t) + 0.3 * rng.standard_normal(len(t))
+
+
+def get_spectral(segment=256, overlap=0.5) -> Spectral:
+    opt = {"segment": segment, "overlap": overlap, "channels": ["^Platform"]}
+    return Spectral(opt, dt)
+
+
+@pytest.mark.parametrize("segment, overlap", [(256, 0.5), (200, 0.25)])
+def test_psd_against_welch(elevation, segment, overlap):
+    spectral = get_spectral(segment, overlap)
+    spectral.set_reference(elevation)
+    spectral.update(
+        ["Platform1_X", "Line1_NodeA_Tension"],
+        np.column_stack([elevation] * 2),
+    )
+    spectra = spectral.get_spectra()
+
+    frequencies, psd = signal.welch(
+        elevation,
+        fs=1.0 / dt,
+        window="hann",
+        nperseg=segment,
+        noverlap=segment - int(segment * (1.0 - overlap)),
+    )
+    np.testing.assert_allclose(spectra.index, frequencies)
+    np.testing.assert_allclose(spectra["Platform1_X_PSD"], psd, rtol=1e-10)
+    np.testing.assert_allclose(spectra["Wave elevation_PSD"], psd, rtol=1e-10)
+    # Channels not selected
+    assert "Line1_NodeA_Tension_PSD" not in spectra
+
+
+def test_rao_of_scaled_response(elevation):
+    spectral = get_spectral()
+    spectral.set_reference(elevation)
+    spectral.update(["Platform1_X"], 2.0 * elevation[:, None])
+    rao = spectral.get_rao()
+
+    peak = np.argmin(np.abs(rao.index - 0.2))
+    assert rao["Platform1_X_RAO"].iloc[peak] == pytest.approx(2.0)
+    assert rao["Platform1_X_phase"].iloc[peak] == pytest.approx(0.0, abs=1e-9)
+    assert rao["Platform1_X_coherence"].iloc[peak] == pytest.approx(1.0)
+
+
+def test_combine_simulations(elevation):
+    # Two simulations (e.g.: seeds) -> average of the segments of both
+    first, second = get_spectral(), get_spectral()
+    for spectral, x in [(first, elevation[:2048]), (second, elevation[2048:])]:
+        spectral.set_reference(x)
+        spectral.update(["Platform1_X"], x[:, None])
+        spectral.release_segments()
+    first.combine(second)
+
+    frequencies, psd_a = signal.welch(elevation[:2048], 1.0 / dt, nperseg=256)
+    _, psd_b = signal.welch(elevation[2048:], 1.0 / dt, nperseg=256)
+    np.testing.assert_allclose(
+        first.get_spectra()["Platform1_X_PSD"],
+        0.5 * (psd_a + psd_b),
+        rtol=1e-10,
+    )
@@ -1,6 +1,10 @@
 import OrcFxAPI as orca
 from collections import namedtuple
+import re
 from IO import IO
+from Profiler import Profiler
+from ModalCache import ModalCache
+from ParallelModal import ModalTask, run_modal_tasks
 
 
 class Analysis:
@@ -24,6 +28,10 @@ class Analysis:
                 "details": None,
             },
         }
+        # Modal analyses run concurrently (see 'ParallelModal')
+        self.modal_workers = 1
+        self.modal_mode = "threads"
+        self.modal_cache: ModalCache = None
 
         self.set_analysis(
             general_opt,
@@ -70,50 +78,167 @@ class Analysis:
 
         # Modal
         if self.modal:
-            modal = ana_opt["modal"]
+            modal = ana_opt.get("modal", dict())
 
             # Set modal analysis for lines
             if modal.get("lines"):
                 # Iterate definitions in JSON file and set lines modal analysis
                 for line in modal["lines"]:
-                    spec = orca.ModalAnalysisSpecification(
-                        calculateShapes=line["shapes"],
-                        firstMode=line["modes"][0],
-                        lastMode=line["modes"][1],
-                        includeCoupledObjects=line.get(
-                            "include coupled",
-                            False,
-                        ),
-                    )
                     self.modal_opt["lines"][line["id"]] = {
                         "opt": self.mode_description(
                             lines[line["id"]],
-                            spec,
+                            Analysis.get_modal_spec(line),
                         ),
                         "details": None,
                     }
-            # TODO
-            # if modal.get('whole system'):
+
+            # Whole system (all modes, if the range is not defined)
+            system = modal.get("whole system")
+            if system:
+                if not isinstance(system, dict):
+                    system = dict()
+                self.modal_opt["system"]["opt"] = self.mode_description(
+                    None, Analysis.get_modal_spec(system)
+                )
+
+            parallel = modal.get("parallel", dict())
+            self.modal_workers = parallel.get("workers", 1)
+            self.modal_mode = parallel.get("mode", "threads")
+            if modal.get("cache"):
+                self.modal_cache = ModalCache(modal["cache"])
+
+    @staticmethod
+    def get_modal_spec(opt: dict) -> dict:
+        """Arguments of 'orca.ModalAnalysisSpecification'
+
+        Args:
+            opt (dict): modal analysis of a line or of the whole system
+
+        Returns:
+            dict: [description]
+        """
+
+        modes = opt.get("modes", [-1, -1])
+        return {
+            "calculateShapes": opt.get("shapes", True),
+            "firstMode": modes[0],
+            "lastMode": modes[1],
+            "includeCoupledObjects": opt.get("include coupled", False),
+        }
+
+    @staticmethod
+    @Profiler.timed("statics")
+    def calculate_statics(model: orca.Model) -> int:
+        """Calculate statics and count the iterations
+
+        Args:
+            model (orca.Model): [description]
+
+        Returns:
+            int: number of statics iterations (None if the progress of the
+                statics does not show them)
+        """
+
+        iterations = [None]
+
+        def count_iterations(model, progress) -> bool:
+            # e.g.: "Whole system statics: iteration 25, ..."
+            found = re.search(r"iteration\s+(\d+)", progress, re.IGNORECASE)
+            if found:
+                iterations[0] = max(iterations[0] or 0, int(found.group(1)))
+            return False  # do not cancel
+
+        model.staticsProgressHandler = count_iterations
+        try:
+            model.CalculateStatics()
+        finally:
+            model.staticsProgressHandler = None
+
+        return iterations[0]
+
+    def get_modal_tasks(self, post) -> list[ModalTask]:
+        """Modal analyses with requested results
+
+        Args:
+            post (Post): [description]
+
+        Returns:
+            list[ModalTask]: [description]
+        """
+
+        tasks = []
+        for line_id, val in self.modal_opt["lines"].items():
+            outputs = post.get_line_modal_definition(line_id)
+            if outputs is None:
+                continue
+            name = "Line" + str(line_id)
+            tasks.append(
+                ModalTask(
+                    name,
+                    val["opt"].ref.Name,
+                    val["opt"].spec,
+                    outputs,
+                    post.get_modal_memmap_file(outputs, name),
+                )
+            )
+
+        system = self.modal_opt["system"]["opt"]
+        if system is not None:
+            outputs = post.get_system_modal_definition(
+                system.spec["calculateShapes"]
+            )
+            tasks.append(
+                ModalTask(
+                    "System",
+                    None,
+                    system.spec,
+                    outputs,
+                    post.get_modal_memmap_file(outputs, "System"),
+                )
+            )
+        return tasks
+
+    def run_modal(self, model: orca.Model, post) -> None:
+        """Modal analyses of the lines and of the whole system (concurrently
+        and/or from the cache), with results saved in 'post'
+
+        Args:
+            model (orca.Model): model in the static state
+            post (Post): [description]
+        """
+
+        tasks = self.get_modal_tasks(post)
+        if self.modal_cache is not None:
+            modal = self.modal_cache.run_tasks(
+                model, tasks, self.modal_workers, self.modal_mode
+            )
+        else:
+            modal = run_modal_tasks(
+                model, tasks, self.modal_workers, self.modal_mode
+            )
+        results = {task.name: output for task, output in zip(tasks, modal)}
+
+        post.results["modal"] |= results
+        for line_id, val in self.modal_opt["lines"].items():
+            val["details"] = results.get("Line" + str(line_id))
+        self.modal_opt["system"]["details"] = results.get("System")
 
     def run_simulation(self, Orcaflex, post) -> None:
         if self.static:
             print("Running statics . . .")
-            Orcaflex.CalculateStatics()
+            with Profiler.phase("statics"):
+                Orcaflex.CalculateStatics()
             print("Static analysis finished!\n")
 
         if self.modal:
             print("Running modal . . .")
-            for line_id, val in self.modal_opt["lines"].items():
-                val["details"] = orca.Modes(
-                    val["opt"].ref,
-                    val["opt"].spec,
-                )
-                post.process_line_modal(line_id, val["details"])
+            self.run_modal(Orcaflex, post)
             print("Modal analysis finished!\n")
 
         if self.dynamic:
             print("Running dynamics . . .")
             # print(getcwd())
             # chdir('./database')
-            Orcaflex.RunSimulation()
+            with Profiler.phase("dynamics"):
+                Orcaflex.RunSimulation()
             print("Dynamic analysis finished!\n")
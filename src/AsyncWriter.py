@@ -0,0 +1,103 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import atexit
+import threading
+
+
+class AsyncWriter:
+    """Background thread(s) to write files while the next batch case runs
+
+    The number of pending tasks is bounded: 'submit' blocks when the queue
+    is full (back-pressure). Errors are raised by 'flush', at the end of
+    the batch, and pending files are written before the interpreter exits.
+    """
+
+    def __init__(self, n_threads: int = 1, max_pending: int = 4) -> None:
+        """[summary]
+
+        Args:
+            n_threads (int, optional): writer threads. Defaults to 1.
+            max_pending (int, optional): maximum number of tasks queued or
+                running. Defaults to 4.
+        """
+
+        self.executor = ThreadPoolExecutor(
+            n_threads, thread_name_prefix="writer"
+        )
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+        # Submitted and not flushed tasks
+        self.futures: list[Future] = []
+        # Tasks submitted since the last call to 'pop_recent'
+        self.recent: list[Future] = []
+
+        atexit.register(self.close)
+
+    def submit(self, func, *args) -> Future:
+        """Queue a write task (blocks if there are too many pending tasks)
+
+        Args:
+            func (callable): [description]
+            args: arguments of 'func'
+
+        Returns:
+            Future: [description]
+        """
+
+        self.slots.acquire()
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+
+        # Keep only unfinished tasks or the ones with errors
+        self.futures = [
+            f
+            for f in self.futures
+            if not f.done() or f.exception() is not None
+        ]
+        self.futures.append(future)
+        self.recent.append(future)
+
+        return future
+
+    def pop_recent(self) -> list[Future]:
+        """Tasks submitted since the last call (e.g.: files of a case)
+
+        Returns:
+            list[Future]: [description]
+        """
+
+        recent, self.recent = self.recent, []
+        return recent
+
+    @staticmethod
+    def wait(futures: list[Future]) -> None:
+        """Wait tasks and raise the first error
+
+        Args:
+            futures (list[Future]): [description]
+        """
+
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+
+    def flush(self) -> None:
+        """Wait all pending tasks and raise errors"""
+
+        futures, self.futures = self.futures, []
+        self.recent = []
+        wait(futures)
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            raise RuntimeError(
+                f"{len(errors)} error(s) writing batch files"
+            ) from errors[0]
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def write_bytes(file_name: str, data: bytes) -> None:
+    with open(file_name, "wb") as file:
+        file.write(data)
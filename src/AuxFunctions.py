@@ -1,5 +1,8 @@
 import numpy as np
+import pandas as pd
 from itertools import product
+import json
+from Profiler import Profiler
 
 
 def get_numpy_random_gen(seed_generator=None) -> np.random.Generator:
@@ -78,14 +81,302 @@ def pre_and_append_to_colnames(colnames, prefix, postfix) -> list[str]:
     ]
 
 
-def export_results(data, filename, formats, predicate="") -> None:
+def to_serializable(obj):
+    # Used as 'default' in json.dump(s) -> NumPy arrays and scalars
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+@Profiler.timed()
+def export_results(
+    data, filename, formats, predicate="", options=None
+) -> list[str]:
+    """Export a DataFrame in the requested formats
+
+    Args:
+        data (pd.DataFrame): [description]
+        filename (str): file name, without extension
+        formats (str | list[str]): "excel", "csv", "parquet", "feather"
+            and/or "hdf5"
+        predicate (str, optional): appended to file name. Defaults to "".
+        options (dict, optional): options of each format, e.g.
+            {"parquet": {"compression": "zstd"}}. Defaults to None.
+
+    Returns:
+        list[str]: saved files
+    """
+
+    saved = []
+    if options is None:
+        options = dict()
 
     if "excel" in formats:
         full_excel_name = filename + predicate + ".xlsx"
         print(f'\nSaving "{full_excel_name}" file . . .')
         data.to_excel(full_excel_name)
+        saved.append(full_excel_name)
 
     if "csv" in formats:
         full_csv_name = filename + predicate + ".csv"
         print(f'\nSaving "{full_csv_name}" file . . .')
         data.to_csv(full_csv_name, sep=";", header=True)
+        saved.append(full_csv_name)
+
+    # Binary (columnar) formats -> metadata with sample period and units
+    binary = [fmt for fmt in ["parquet", "feather", "hdf5"] if fmt in formats]
+    if binary:
+        metadata = get_results_metadata(data)
+    for fmt in binary:
+        full_name = filename + predicate + results_extensions[fmt]
+        print(f'\nSaving "{full_name}" file . . .')
+        write_binary_results(
+            data, full_name, fmt, metadata, options.get(fmt, dict())
+        )
+        saved.append(full_name)
+
+    return saved
+
+
+# Extensions of binary result files
+results_extensions = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "hdf5": ".h5",
+}
+
+# Key of results metadata in binary files
+metadata_key = "orcafowt"
+
+# Units of results, by column name suffix
+results_units = {
+    "Time": "s",
+    "Tension": "kN",
+    "X": "m",
+    "Y": "m",
+    "Z": "m",
+    "DynamicX": "m",
+    "DynamicY": "m",
+    "DynamicZ": "m",
+    "Rotation1": "deg",
+    "Rotation2": "deg",
+    "Rotation3": "deg",
+    "DynamicRx": "deg",
+    "DynamicRy": "deg",
+    "DynamicRz": "deg",
+    "Azimuth": "deg",
+    "Declination": "deg",
+    "Gamma": "deg",
+    "Period": "s",
+    "Mass": "te",
+    "Stiffness": "kN/m",
+}
+
+
+def get_column_unit(col_name: str) -> str:
+    # Suffix -> text after the last "_" (without spaces)
+    suffix = col_name.rsplit("_", 1)[-1].replace(" ", "")
+    if suffix in results_units:
+        return results_units[suffix]
+    if "Strain" in suffix:
+        return "-"
+    return ""
+
+
+def get_results_metadata(data) -> dict:
+    metadata = {
+        "units": {str(col): get_column_unit(str(col)) for col in data.columns}
+    }
+
+    if "Time" in data.columns and len(data) > 1:
+        metadata["sample period"] = float(
+            data["Time"].iloc[1] - data["Time"].iloc[0]
+        )
+
+    return metadata
+
+
+def write_binary_results(data, full_name, fmt, metadata, opt) -> None:
+    """Write results in a columnar binary format
+
+    Args:
+        data (pd.DataFrame): [description]
+        full_name (str): file name, with extension
+        fmt (str): "parquet", "feather" or "hdf5"
+        metadata (dict): sample period and units
+        opt (dict): options of the format
+    """
+
+    if fmt == "hdf5":
+        write_hdf5(data, full_name, metadata, opt)
+        return None
+
+    # Parquet and Feather (requires PyArrow)
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data)
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or dict()),
+            metadata_key: json.dumps(metadata),
+        }
+    )
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(
+            table,
+            full_name,
+            compression=opt.get("compression", "snappy"),
+            compression_level=opt.get("compression level", None),
+        )
+    elif fmt == "feather":
+        import pyarrow.feather as feather
+
+        feather.write_feather(
+            table,
+            full_name,
+            compression=opt.get("compression", "lz4"),
+            compression_level=opt.get("compression level", None),
+        )
+
+
+def write_hdf5(data, full_name, metadata, opt) -> None:
+    """Write results in HDF5 (requires PyTables)
+
+    "table" format by default, with a data column per result, so subsets
+    of columns are selected when reading (see 'read_results'). The header
+    of a table is limited in size (several hundred columns, depending on
+    the names), so the columns are split in tables ("results_0",
+    "results_1", ...) of up to "columns per table" (defaults to 500) and
+    the table of each column is saved in the "columns" node. With
+    "format": "fixed", results are saved in a single "results" node,
+    which is always read as a whole.
+
+    Args:
+        data (pd.DataFrame): [description]
+        full_name (str): file name, with extension
+        metadata (dict): sample period and units
+        opt (dict): options of the format
+    """
+
+    with pd.HDFStore(
+        full_name,
+        mode="w",
+        complevel=opt.get("compression level", 0),
+        complib=opt.get("compression", None),
+    ) as store:
+        if opt.get("format", "table") == "fixed":
+            store.put("results", data, format="fixed")
+        else:
+            size = opt.get("columns per table", 500)
+            tables = [
+                data.columns[i : i + size]
+                for i in range(0, data.shape[1], size)
+            ]
+            table_ids = []
+            while tables:
+                columns = tables.pop(0)
+                key = f"results_{len(table_ids)}"
+                if not put_hdf5_table(store, key, data[columns]):
+                    # Header too large (long names) -> half the columns
+                    half = len(columns) // 2
+                    tables[:0] = [columns[:half], columns[half:]]
+                    continue
+                table_ids.extend([len(table_ids)] * len(columns))
+            store.put(
+                "columns", pd.Series(table_ids, index=data.columns.astype(str))
+            )
+        # Node attributes are limited to 64 kB -> metadata (units of
+        # thousands of columns) in its own node
+        store.put(metadata_key, pd.Series([json.dumps(metadata)]))
+
+
+def put_hdf5_table(store, key: str, data) -> bool:
+    """Write a table with a data column per result
+
+    Args:
+        store (pd.HDFStore): [description]
+        key (str): [description]
+        data (pd.DataFrame): [description]
+
+    Returns:
+        bool: False if the columns exceed the table header (not written)
+    """
+
+    from tables.exceptions import HDF5ExtError
+
+    try:
+        store.put(key, data, format="table", data_columns=True, index=False)
+    except (HDF5ExtError, ValueError):
+        if data.shape[1] <= 1:
+            raise
+        if key in store:
+            store.remove(key)
+        return False
+    return True
+
+
+def read_results(full_name, columns=None):
+    """Read results exported in a binary format (see 'export_results')
+
+    Args:
+        full_name (str): file name, with extension
+        columns (list[str], optional): subset of columns. Defaults to all.
+
+    Returns:
+        pd.DataFrame: [description]
+    """
+
+    if full_name.endswith(results_extensions["parquet"]):
+        return pd.read_parquet(full_name, columns=columns)
+    if full_name.endswith(results_extensions["feather"]):
+        return pd.read_feather(full_name, columns=columns)
+    if full_name.endswith(results_extensions["hdf5"]):
+        with pd.HDFStore(full_name, mode="r") as store:
+            if "columns" not in store:
+                # "fixed" format -> read all columns
+                data = store.get("results")
+                return data if columns is None else data[columns]
+
+            # Only the tables of the selected columns are read
+            table_ids = store.get("columns")
+            if columns is not None:
+                table_ids = table_ids.loc[columns]
+            parts = [
+                store.select(f"results_{table}", columns=list(cols.index))
+                for table, cols in table_ids.groupby(table_ids, sort=True)
+            ]
+        return pd.concat(parts, axis=1)[list(table_ids.index)]
+
+    print(f'Invalid results file "{full_name}"')
+    exit()
+
+
+def read_results_metadata(full_name) -> dict:
+    """Sample period and units of results exported in a binary format
+
+    Args:
+        full_name (str): file name, with extension
+
+    Returns:
+        dict: [description]
+    """
+
+    if full_name.endswith(results_extensions["hdf5"]):
+        with pd.HDFStore(full_name, mode="r") as store:
+            return json.loads(store.get(metadata_key).iloc[0])
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Only the schema is read
+    if full_name.endswith(results_extensions["parquet"]):
+        schema = pq.read_schema(full_name)
+    else:
+        # Feather (V2) files are Arrow IPC files
+        with pa.memory_map(full_name, "r") as source:
+            schema = pa.ipc.open_file(source).schema
+
+    return json.loads(schema.metadata[metadata_key.encode()])
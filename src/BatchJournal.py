@@ -0,0 +1,120 @@
+from IO import IO
+import AuxFunctions as aux
+
+import numpy as np
+
+import json
+import os
+import threading
+
+
+class BatchJournal:
+    """Append-only manifest of the finished cases of a batch
+
+    Each line of the file (JSON lines) describes a case: its name,
+    parameters, status, saved files and row of the batch results. When
+    executed with '--resume', finished cases with the same parameters
+    are not simulated again. The seed of batches with random cases is also
+    recorded, so a resumed batch draws the same cases.
+    """
+
+    def __init__(self) -> None:
+        self.file_name = (
+            IO.results_dir + IO.name_no_extension + "_journal.jsonl"
+        )
+
+        # Finished cases: name -> journal entry
+        self.finished: dict[str, dict] = dict()
+        # Seed of the random cases (see 'get_seed_generator')
+        self.seed_generator: int = None
+        # Cases may be recorded by background writers
+        self.lock = threading.Lock()
+
+        if IO.resume and os.path.isfile(self.file_name):
+            self.finished = self.load()
+            print(
+                f'\nResuming batch: {len(self.finished)} finished cases in "',
+                f'{self.file_name}"',
+                sep="",
+            )
+        else:
+            # New batch -> new journal
+            open(self.file_name, "w").close()
+
+    def load(self) -> dict[str, dict]:
+        finished = dict()
+        with open(self.file_name, "r") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # incomplete line (execution interrupted)
+                if entry["status"] == "seed generator":
+                    self.seed_generator = entry["seed"]
+                elif entry["status"] == "done":
+                    finished[entry["case"]] = entry
+        return finished
+
+    @staticmethod
+    def normalize(data):
+        # Data as read from the journal file (e.g.: tuples -> lists)
+        return json.loads(json.dumps(data, default=aux.to_serializable))
+
+    def is_finished(self, name: str, params: dict) -> bool:
+        """Check if a case (with the same parameters) was finished
+
+        Args:
+            name (str): case name (see 'BatchSimulations.get_file_name')
+            params (dict): [description]
+
+        Returns:
+            bool: [description]
+        """
+
+        entry = self.finished.get(name)
+        return entry is not None and entry["params"] == self.normalize(params)
+
+    def get_seed_generator(self) -> int:
+        """Seed of the random cases of the batch: the one of the resumed
+        batch or a new one (recorded in the journal)
+
+        Returns:
+            int: [description]
+        """
+
+        if self.seed_generator is None:
+            self.seed_generator = int(np.random.SeedSequence().entropy)
+            self.write(
+                {"status": "seed generator", "seed": self.seed_generator}
+            )
+        return self.seed_generator
+
+    def get_row(self, name: str):
+        return self.finished[name]["row"]
+
+    def record(self, name, params, files, row, status="done") -> None:
+        """Append a case to the journal
+
+        Args:
+            name (str): [description]
+            params (dict): [description]
+            files (list[str]): [description]
+            row (list | None): [description]
+            status (str, optional): Defaults to "done".
+        """
+
+        entry = {
+            "case": name,
+            "params": params,
+            "status": status,
+            "files": files,
+            "row": row,
+        }
+        self.write(entry)
+
+    def write(self, entry: dict) -> None:
+        line = json.dumps(entry, default=aux.to_serializable) + "\n"
+        with self.lock, open(self.file_name, "a") as journal:
+            journal.write(line)
+            journal.flush()
+            os.fsync(journal.fileno())
@@ -2,25 +2,83 @@
 from IO import IO
 import AuxFunctions as aux
 from OrcaflexModel import OrcaflexModel
+from Analysis import Analysis
+from SimulationCache import SimulationCache
+from ResultSink import ResultSink
+from Profiler import Profiler
+from ParallelModal import ModalTask, run_modal_tasks, modal_pool
+from ModalCache import ModalCache
+from ModeTracking import ModeTracker
+import DesignOfExperiments as doe
+import LoadCaseMatrix as lcm
 
 # Other imports
+from abc import ABC, abstractmethod
 from collections import namedtuple
 from itertools import product
 import numpy as np
+import json
+import os
+
+# Results of a batch case: row of the batch results (or None), the
+# postprocessed results (see 'Post.results'), the saved Orcaflex files,
+# the number of statics iterations (None if unknown), the spectra
+# accumulator (see 'Spectral') and if statics was calculated with warm start
+CaseOutput = namedtuple(
+    "CaseOutput",
+    ["row", "results", "files", "statics_iterations", "spectra", "warm_start"],
+    defaults=[[], None, None, False],
+)
+
+# Harmonic motion imposed to a vessel DoF
+DoF = namedtuple("DoF", ["name", "period", "amplitude", "phase"])
 
 
 def set_and_run_batch(orca_model: OrcaflexModel, post) -> None:
+    # Initialize object and do the analyses
+    batch = create_batch(post)
+    print()  # blank line
+    # Modal worker processes reused by all cases (see 'ParallelModal')
+    with modal_pool():
+        batch.execute_batch(orca_model, post)
+    # After all cases (e.g.: refinement rounds of the thrust curve)
+    if batch.statics_report:
+        batch.report_warm_start()
+
+
+def create_batch(post):
+    """Initialize the batch object defined in the input file
+
+    Args:
+        post (Post): [description]
+
+    Returns:
+        BatchSimulations: [description]
+    """
+
     # Get a string with batch type...
     batch_type = aux.get_ith_key(IO.input_data["Batch"], 0)
-    batch_type = aux.to_title_and_remove_ws(batch_type)
-    # ... initialize object and do the analyses
-    batch = eval(batch_type + "(post)")
-    print()  # blank line
-    batch.execute_batch(orca_model, post)
+    if batch_type.lower() not in batch_types:
+        raise ValueError(
+            f'Unknown batch type "{batch_type}"'
+            f" (available: {list(batch_types)})"
+        )
+    # ... and initialize object
+    return batch_types[batch_type.lower()](post)
 
 
-class BatchSimulations:
-    """[summary]"""
+class BatchSimulations(ABC):
+    """Base class of batch simulations
+
+    Each batch is a sequence of independent cases. Derived classes
+    define the cases and how to set each one in the model, while
+    this class runs them, sequentially or with worker processes
+    (see 'ParallelBatch'), and collects the results in case order (as
+    they finish, for blocks of cases run with warm start).
+    """
+
+    # Key of the batch options in the "Batch" block of the input file
+    input_key: str = ""
 
     def __init__(self, post) -> None:
         """[summary]
@@ -29,10 +87,479 @@ class BatchSimulations:
             post (Post): [description]
         """
 
+        self.opt = IO.input_data["Batch"][self.input_key]
+
+        # Number of worker processes (1 -> run in the current process)
+        self.n_workers = self.set_n_workers(self.opt.get("workers", 1))
+        # Reference model prepared to run cases
+        self.model_ready = False
+
+        # Results of previously simulated cases
+        self.cache = None
+        if self.opt.get("cache"):
+            self.cache = SimulationCache(self.opt["cache"])
+
+        # Destination of case results -> created when running cases
+        # (only in the main process)
+        self.sink: ResultSink = None
+        # Cases in the order they were run
+        self.run_order = []
+
+        # Start statics of each case from the solution of the previous one
+        self.warm_start = self.opt.get("warm start", False)
+        # Statics iterations of each case (None -> unknown)
+        self.statics_report: dict[str, int] = dict()
+        # Statics complete state of the previous case (see 'apply_warm_start')
+        self.warm_state: bytes = None
+        # Cases that start from the template configuration (first case of
+        # each worker), used to estimate the iterations saved
+        self.cold_cases: set[str] = set()
+
+    @staticmethod
+    def set_n_workers(workers) -> int:
+        """[summary]
+
+        Args:
+            workers (int | str): number of processes or "all" (CPU count)
+
+        Returns:
+            int: [description]
+        """
+
+        if workers == "all":
+            return os.cpu_count() or 1
+        return max(int(workers), 1)
+
+    def prepare_model(self, orca_model: OrcaflexModel) -> None:
+        """Edit the reference model before running the first case
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+        """
+
+    @abstractmethod
+    def get_cases(self) -> list:
+        """Cases of the batch, in the order the results are collected
+
+        Returns:
+            list: [description]
+        """
+
+    @abstractmethod
+    def set_case(self, orca_model: OrcaflexModel, case) -> None:
+        """Set the case parameters in the model
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            case ([type]): [description]
+        """
+
+    @abstractmethod
+    def get_file_name(self, case) -> str:
+        """File name (without extension) used to save the case
+
+        Args:
+            case ([type]): [description]
+
+        Returns:
+            str: [description]
+        """
+
+    @abstractmethod
+    def get_case_params(self, case) -> dict:
+        """Parameters that define a case (used as cache key)
+
+        Args:
+            case ([type]): [description]
+
+        Returns:
+            dict: [description]
+        """
+
+    def get_post_params(self) -> dict:
+        """Batch options used to postprocess a case (used as cache key)
+
+        Returns:
+            dict: [description]
+        """
+        return dict()
+
+    def get_case_output(
+        self, orca_model: OrcaflexModel, post, case
+    ) -> CaseOutput:
+        """Postprocess the simulation of a case
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+            case ([type]): [description]
+
+        Returns:
+            CaseOutput: [description]
+        """
+
+        post.process_simulation_results(orca_model.orca_refs)
+
+        row = None
+        if post.summary is not None or post.fatigue is not None:
+            # Summary and/or fatigue damage -> row of the batch results
+            row = {"case": self.get_file_name(case)} | self.get_case_params(
+                case
+            )
+            row |= post.get_case_row()
+
+        return CaseOutput(row, post.results, spectra=post.get_spectral())
+
+    def collect_output(self, post, output: CaseOutput) -> None:
+        """Use the output of a case, as it finishes (in case order)
+
+        Args:
+            post (Post): [description]
+            output (CaseOutput): [description]
+        """
+
+    def run_case(self, orca_model: OrcaflexModel, post, case) -> CaseOutput:
+        """Set, run, postprocess and save (Orcaflex files) a case
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+            case ([type]): [description]
+
+        Returns:
+            CaseOutput: [description]
+        """
+
+        self.apply_warm_start(orca_model)
+        self.set_case(orca_model, case)
+        file_name = self.get_file_name(case)
+        post.case_name = file_name
+
+        if self.cache is None:
+            iterations = self.run_simulation(orca_model, post)
+            output = self.get_case_output(orca_model, post, case)
+            files = IO.save_model_step_from_batch(orca_model.model, file_name)
+            return output._replace(
+                files=files,
+                statics_iterations=iterations,
+                warm_start=self.warm_start,
+            )
+
+        key = self.cache.get_key(self.input_key, self.get_case_params(case))
+        post_key = self.cache.get_post_key(self.get_post_params())
+
+        # Same case and postprocessing -> skip simulation and postprocessing,
+        # unless the simulation must be saved and it is not cached (the
+        # model was not run for this case)
+        output = self.cache.get_output(key, post_key)
+        sim_file = self.cache.get_simulation(key)
+        if output is not None and (
+            sim_file is not None or not IO.save_options["batch simulation"]
+        ):
+            print("Results loaded from cache")
+            files = IO.save_model_step_from_batch(
+                orca_model.model, file_name, sim_file
+            )
+            return output._replace(files=files)
+
+        # Same case -> load simulation (only postprocessing changed)
+        iterations = None
+        if sim_file is not None:
+            orca_model.reload_simulation(sim_file)
+        else:
+            iterations = self.run_simulation(orca_model, post)
+
+        output = self.get_case_output(orca_model, post, case)
+        files = IO.save_model_step_from_batch(orca_model.model, file_name)
+        self.cache.store(key, post_key, output, orca_model.model)
+
+        return output._replace(
+            files=files,
+            statics_iterations=iterations,
+            warm_start=self.warm_start and sim_file is None,
+        )
+
+    def run_simulation(self, orca_model: OrcaflexModel, post):
+        """Run the simulation of a case
+
+        With warm start or modal analyses ("run modal" action), statics is
+        calculated first and the dynamics starts from the statics complete
+        state (statics is not calculated again). With warm start, statics
+        starts from the positions of the previous case and its state is
+        kept so its positions are the initial positions of the next case
+        (see 'apply_warm_start'). Modal analyses of each case use the modal
+        cache, if defined (see 'Analysis.run_modal').
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+
+        Returns:
+            int | None: statics iterations (with warm start, None if unknown)
+        """
+
+        model = orca_model.model
+        analysis = getattr(orca_model, "analysis", None)
+        modal = analysis is not None and analysis.modal
+        if not (self.warm_start or modal):
+            with Profiler.phase("dynamics"):
+                model.RunSimulation()
+            return None
+
+        iterations = Analysis.calculate_statics(model)
+        if self.warm_start:
+            self.warm_state = model.SaveSimulationMem()
+        if modal:
+            analysis.run_modal(model, post)
+        with Profiler.phase("dynamics"):
+            model.RunSimulation()
+
+        return iterations if self.warm_start else None
+
+    def apply_warm_start(self, orca_model: OrcaflexModel) -> None:
+        """Use the converged positions of the previous case as initial
+        positions, before setting the next case
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+        """
+
+        if self.warm_state is None:
+            return None
+
+        model = orca_model.model
+        with Profiler.phase("warm start"):
+            # Statics complete state -> same data of the previous case
+            model.LoadSimulationMem(self.warm_state)
+            model.UseCalculatedPositions(
+                SetLinesToUserSpecifiedStartingShape=True
+            )
+        # Previous references are invalid after loading a simulation
+        orca_model.set_orcaflex_objects_ref()
+        self.warm_state = None
+
+    def get_blocks(self, cases: list) -> list[list]:
+        """Contiguous blocks of ordered cases, one per worker process, so
+        successive cases of a worker are similar (warm start)
+
+        Args:
+            cases (list): [description]
+
+        Returns:
+            list[list]: [description]
+        """
+
+        size = -(-len(cases) // min(self.n_workers, max(len(cases), 1)))
+        return [cases[i : i + size] for i in range(0, len(cases), size)]
+
+    def run_cases(self, orca_model: OrcaflexModel, post, cases=None) -> None:
+        """Run cases and push their results to the sink, in case order (as
+        they finish, for blocks of cases of worker processes with warm start)
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+            cases (iterable, optional): Defaults to all cases of the batch.
+        """
+
+        # Sink (journal) before the cases -> seed of random cases
+        self.open_sink(post)
+        if cases is None:
+            cases = self.get_cases()
+        blocks = None
+        if self.warm_start:
+            cases = self.order_cases(list(cases))
+            blocks = self.get_blocks(cases) if self.n_workers > 1 else [cases]
+            self.cold_cases |= {
+                self.get_file_name(block[0]) for block in blocks if block
+            }
+        IO.start_writer()
+
+        if self.n_workers > 1:
+            # Imported here -> 'ParallelBatch' creates batch objects
+            from ParallelBatch import run_parallel
+
+            outputs = run_parallel(
+                cases, self.n_workers, self.is_finished, blocks
+            )
+        else:
+            outputs = self.run_sequential(orca_model, post, cases)
+
+        for case, output in outputs:
+            name = self.get_file_name(case)
+            self.run_order.append(case)
+            # Finished in a previous execution -> row from the journal
+            if output is None:
+                self.sink.push_finished(name)
+            else:
+                self.collect_output(post, output)
+                self.sink.push(name, self.get_case_params(case), output)
+                if output.warm_start:
+                    self.statics_report[name] = output.statics_iterations
+
+        # Files written in background -> finished and without errors
+        IO.flush_writer()
+
+        # Rows with case parameters and statistics (see 'get_case_output')
+        rows = self.sink.get_rows()
+        if rows and isinstance(rows[0], dict):
+            post.set_case_results(rows)
+
+    def open_sink(self, post) -> None:
+        if self.sink is None:
+            self.sink = ResultSink(post)
+
+    def get_seed_generator(self, seed=None):
+        """Seed of the random generator of the cases
+
+        Without a seed in the input file, a random one is drawn and recorded
+        in the journal, so a resumed batch ('--resume') draws the same cases
+        (the sink must be open, see 'run_cases').
+
+        Args:
+            seed (int, optional): seed of the input file. Defaults to None.
+
+        Returns:
+            int: [description]
+        """
+
+        if seed is not None:
+            return seed
+        return self.sink.journal.get_seed_generator()
+
+    def run_sequential(self, orca_model: OrcaflexModel, post, cases):
+        """Run cases in the current process
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+            cases (iterable): [description]
+
+        Yields:
+            tuple: (case, CaseOutput), output is None for finished cases
+        """
+
+        for case in cases:
+            if self.is_finished(case):
+                yield case, None
+                continue
+
+            if not self.model_ready:
+                self.prepare_model(orca_model)
+                self.model_ready = True
+            # Results of the previous case are kept by the sink
+            post.clear_results()
+            with Profiler.profile_case(self.get_file_name(case)):
+                output = self.run_case(orca_model, post, case)
+            yield case, output
+
+    def order_cases(self, cases: list) -> list:
+        """Order cases so that successive ones are as similar as possible
+        (nearest neighbour, starting from the first case)
+
+        Numeric parameters are normalized by their range. A change in a text
+        parameter (e.g.: DoF name) is farther than any numeric change.
+
+        Args:
+            cases (list): [description]
+
+        Returns:
+            list: [description]
+        """
+
+        if len(cases) < 3:
+            return cases
+
+        params = [self.get_case_params(case) for case in cases]
+        numeric, text = [], []
+        for key, value in params[0].items():
+            if isinstance(value, str):
+                text.append([p[key] for p in params])
+            elif isinstance(value, (int, float)):
+                numeric.append([p[key] for p in params])
+
+        n_cases = len(cases)
+        x = (
+            np.array(numeric, dtype=float).T
+            if numeric
+            else np.zeros((n_cases, 0))
+        )
+        span = np.ptp(x, axis=0)
+        x = x / np.where(span > 0.0, span, 1.0)
+        labels = (
+            np.array(text, dtype=object).T if text else np.zeros((n_cases, 0))
+        )
+
+        remaining = np.ones(n_cases, dtype=bool)
+        order = [0]
+        remaining[0] = False
+        for _ in range(n_cases - 1):
+            last = order[-1]
+            dist = np.abs(x - x[last]).sum(axis=1)
+            if labels.size:
+                dist += (x.shape[1] + 1) * (labels != labels[last]).any(axis=1)
+            dist[~remaining] = np.inf
+            order.append(int(np.argmin(dist)))
+            remaining[order[-1]] = False
+
+        return [cases[i] for i in order]
+
+    def report_warm_start(self) -> None:
+        """Statics iterations of the cases run with warm start
+
+        The first case of each worker starts from the template configuration,
+        so the mean of their iterations is used to estimate the iterations
+        saved. If the iterations of any case are unknown (not shown in the
+        progress of the statics), the totals are unknown (None).
+        """
+
+        iterations = list(self.statics_report.values())
+        cold = [
+            it
+            for name, it in self.statics_report.items()
+            if name in self.cold_cases
+        ] or iterations[:1]
+        total = saved = cold_mean = None
+        if None not in iterations:
+            total = sum(iterations)
+            cold_mean = sum(cold) / len(cold)
+            saved = round(cold_mean * len(iterations) - total)
+        statics = IO.input_data["Analysis"].get("statics", dict())
+        report = {
+            "cases": len(iterations),
+            "total iterations": total,
+            "cold start iterations": cold_mean,
+            "estimated iterations saved": saved,
+            "max iterations": statics.get("max iterations", 400),
+            "tolerance": statics.get("tolerance", 1e-6),
+            "iterations per case": self.statics_report,
+        }
+
+        if total is None:
+            print(
+                f"\nWarm start: {report['cases']} cases,",
+                "statics iterations unknown",
+            )
+        else:
+            print(
+                f"\nWarm start: {total} statics iterations in",
+                f"{report['cases']} cases (~{saved} saved)",
+            )
+        file_name = IO.results_dir + IO.name_no_extension + "_warm_start.json"
+        with open(file_name, "w") as report_file:
+            json.dump(report, report_file, indent=4)
+
+    def is_finished(self, case) -> bool:
+        return self.sink.journal.is_finished(
+            self.get_file_name(case), self.get_case_params(case)
+        )
+
 
 class ThrustCurve(BatchSimulations):
     """[summary]"""
 
+    input_key = "thrust curve"
+
     def __init__(self, post):
         """[summary]
 
@@ -42,16 +569,30 @@ class ThrustCurve(BatchSimulations):
         super().__init__(post)
 
         # Input options
-        opt = IO.input_data["Batch"]["thrust curve"]
+        opt = self.opt
 
         # wind speed range to simulate
         self.eval_range = aux.get_range_or_list(opt["wind speed"])
 
         self.vars_to_eval, self.names = self.set_vars_to_eval(opt["monitors"])
 
+        # Turbine(s) to evaluate (e.g.: farm) -> columns of each turbine
+        self.turbines = opt.get("turbines", [1])
+        if not isinstance(self.turbines, list):
+            self.turbines = [self.turbines]
+        if len(self.turbines) > 1:
+            self.names = [
+                f"Turbine{t} {name}"
+                for t in self.turbines
+                for name in self.names
+            ]
+
         self.wind_direction = opt.get("direction", 0.0)
         self.profile = self.set_profile(opt.get("profile", None))
 
+        # Adaptive sampling -> "wind speed" is the initial (coarse) range
+        self.adaptive = opt.get("adaptive", None)
+
     def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
         """[summary]
 
@@ -122,9 +663,117 @@ class ThrustCurve(BatchSimulations):
             post ([type]): [description]
         """
 
-        expoent = str(
-            IO.input_data["Batch"]["thrust curve"]["profile"]["expoent"],
+        # Iterate speeds
+        if self.adaptive:
+            self.eval_adaptive_range(orca_model, post)
+        else:
+            self.run_cases(orca_model, post)
+        post.row_list.extend(self.sink.get_rows())
+        # Speeds in the order of the rows (see 'Post.set_thrust_curves')
+        self.eval_range = np.array(self.run_order, dtype=float)
+
+        # Mount curves data
+        post.set_thrust_curves(self.names, self.eval_range)
+
+    def eval_adaptive_range(self, orca_model: OrcaflexModel, post) -> None:
+        """Evaluate the initial wind speeds and refine where the monitored
+        variables have large curvature or jumps, until the tolerance or the
+        maximum number of cases is reached
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+        """
+
+        opt = self.adaptive
+        max_cases = opt.get("max cases", 50)
+        # Columns (of the rows) used to refine the range
+        monitors = opt.get("monitors", self.names)
+        # Monitor of each turbine (names without the turbine prefix)
+        prefixed = len(self.turbines) > 1
+        cols = [
+            i
+            for i, name in enumerate(self.names)
+            if name in monitors
+            or (prefixed and name.split(" ", 1)[1] in monitors)
+        ]
+
+        self.run_cases(orca_model, post, [float(v) for v in self.eval_range])
+
+        while len(self.run_order) < max_cases:
+            # Rows and speeds in the order the cases were run
+            rows = np.array(self.sink.get_rows(), dtype=float)
+            new_speeds = self.get_refinement(
+                np.array(self.run_order, dtype=float),
+                rows[:, cols],
+                opt.get("tolerance", 0.02),
+                opt.get("jump", 0.2),
+                opt.get("min step", 0.1),
+            )[: max_cases - len(self.run_order)]
+            if not new_speeds:
+                break
+
+            print(
+                f"\nRefining thrust curve with {len(new_speeds)} wind speeds"
+            )
+            self.run_cases(orca_model, post, new_speeds)
+
+    @staticmethod
+    def get_refinement(speeds, values, tol, jump, min_step) -> list[float]:
+        """Wind speeds to add, sorted by decreasing error
+
+        Error of a point -> distance to the line between its neighbours.
+        Intervals next to points with error above 'tol', or with a jump
+        above 'jump', are halved. Both are relative to the range of each
+        variable.
+
+        Args:
+            speeds (np.ndarray): evaluated wind speeds
+            values (np.ndarray): (speeds x variables) results
+            tol (float): [description]
+            jump (float): [description]
+            min_step (float): smallest interval to be halved
+
+        Returns:
+            list[float]: [description]
+        """
+
+        order = np.argsort(speeds)
+        x, y = speeds[order], values[order]
+        if x.size < 3:
+            return []
+
+        # Normalize each variable by its range
+        span = np.ptp(y, axis=0)
+        y = y / np.where(span > 0.0, span, 1.0)
+
+        # Deviation from linear interpolation of the neighbours
+        w = ((x[1:-1] - x[:-2]) / (x[2:] - x[:-2]))[:, None]
+        point_err = np.abs(y[1:-1] - (1.0 - w) * y[:-2] - w * y[2:]).max(
+            axis=1
         )
+
+        # Error of each interval -> its points and its jump
+        interval_err = np.abs(np.diff(y, axis=0)).max(axis=1)
+        interval_err = np.where(interval_err > jump, interval_err, 0.0)
+        point_err = np.where(point_err > tol, point_err, 0.0)
+        interval_err[:-1] = np.maximum(interval_err[:-1], point_err)
+        interval_err[1:] = np.maximum(interval_err[1:], point_err)
+
+        refine = (interval_err > 0.0) & (np.diff(x) >= 2.0 * min_step)
+        ids = np.flatnonzero(refine)
+        ids = ids[np.argsort(-interval_err[ids], kind="stable")]
+
+        return [round(float(0.5 * (x[i] + x[i + 1])), 6) for i in ids]
+
+    def prepare_model(self, orca_model: OrcaflexModel) -> None:
+        """[summary]
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+        """
+
+        expoent = str(self.opt["profile"]["expoent"])
         # Set wind profile (same for all velocities)
         orca_model.create_wind_profile(
             self.profile["height"],
@@ -132,35 +781,46 @@ class ThrustCurve(BatchSimulations):
             f"wind profile - exp{expoent}",
         )
 
-        # Iterate speeds
-        for speed in self.eval_range:
-            # Set wind speed
-            orca_model.set_wind(
-                {
-                    "type": "constant",
-                    "speed": speed,
-                    "direction": self.wind_direction,
-                }
-            )
+    def get_cases(self) -> list:
+        return list(self.eval_range)
 
-            # Run simulation
-            print("Running with wind speed: ", speed, "m/s")
-            orca_model.model.RunSimulation()
+    def set_case(self, orca_model: OrcaflexModel, speed) -> None:
+        # Set wind speed
+        orca_model.set_wind(
+            {
+                "type": "constant",
+                "speed": speed,
+                "direction": self.wind_direction,
+            }
+        )
+        print("Running with wind speed: ", speed, "m/s")
 
-            # Save
-            IO.save_step_from_batch(
-                orca_model.model,
-                "wind_speed_" + str(speed),
-                post,
-            )
+    def get_file_name(self, speed) -> str:
+        return "wind_speed_" + str(speed)
 
-            # Get results
-            post.append_thrust_results(
-                orca_model.orca_refs["turbines"][1], self.vars_to_eval
-            )
+    def get_case_params(self, speed) -> dict:
+        return {
+            "wind speed": speed,
+            "direction": self.wind_direction,
+            "profile": self.profile,
+        }
 
-        # Mount curves data
-        post.set_thrust_curves(self.names, self.eval_range)
+    def get_post_params(self) -> dict:
+        return {"monitors": self.opt["monitors"], "turbines": self.turbines}
+
+    def get_case_output(
+        self, orca_model: OrcaflexModel, post, speed
+    ) -> CaseOutput:
+        # Get results
+        row = []
+        for turbine_id in self.turbines:
+            row.extend(
+                post.append_thrust_results(
+                    orca_model.orca_refs["turbines"][turbine_id],
+                    self.vars_to_eval,
+                )
+            )
+        return CaseOutput(row, post.results)
 
     def set_profile(self, opt):
 
@@ -183,6 +843,8 @@ class ThrustCurve(BatchSimulations):
 class VesselHarmonicMotion(BatchSimulations):
     """[summary]"""
 
+    input_key = "vessel harmonic motion"
+
     def __init__(self, post) -> None:
         """[summary]
 
@@ -193,12 +855,17 @@ class VesselHarmonicMotion(BatchSimulations):
         super().__init__(post)
 
         # Input options
-        opt = IO.input_data["Batch"]["vessel harmonic motion"]
+        opt = self.opt
 
         self.combine_dofs = opt.get("combine dofs", False)
         self.dof_position = opt["position"]
         self.dofs_to_oscilate = list(opt["position"].keys())
 
+        # Platform(s) with imposed motion (e.g.: farm)
+        self.platforms = opt.get("platforms", [1])
+        if not isinstance(self.platforms, list):
+            self.platforms = [self.platforms]
+
     def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
         """[summary]
 
@@ -219,33 +886,45 @@ class VesselHarmonicMotion(BatchSimulations):
             orca_model (OrcaflexModel): [description]
             post ([type]): [description]
         """
-        DoF = namedtuple("DoF", ["name", "period", "amplitude", "phase"])
-        vessel = orca_model.orca_refs["vessels"][1]
-        vessel.SuperimposedMotion = "Displacement RAOs + harmonic motion"
 
+        self.run_cases(orca_model, post)
+
+    def prepare_model(self, orca_model: OrcaflexModel) -> None:
+        for vessel_id in self.platforms:
+            vessel = orca_model.orca_refs["vessels"][vessel_id]
+            vessel.SuperimposedMotion = "Displacement RAOs + harmonic motion"
+
+    def get_cases(self) -> list[DoF]:
+        cases = []
         # Iterate thorugh DoFs...
-        for dof, cases in self.get_all_combinations().items():
+        for dof, combs in self.get_all_combinations().items():
             # ... check if it has oscilation ...
             if dof not in self.dofs_to_oscilate:
                 continue
             # ... if it is, simulate all combinations
-            for c in cases:
-                dof_name = dof.title()
-                dof_data = DoF(dof_name, c[0], c[1], c[2])
+            cases.extend([DoF(dof.title(), c[0], c[1], c[2]) for c in combs])
+
+        return cases
 
-                orca_model.set_vessel_harmonic_motion(dof_data)
+    def set_case(self, orca_model: OrcaflexModel, dof_data: DoF) -> None:
+        for vessel_id in self.platforms:
+            orca_model.set_vessel_harmonic_motion(dof_data, vessel_id)
 
-                # Run simulation
-                print(f"\nRunning scenario with oscilation in {dof_name}")
-                print(f"period= {c[0]},  amplitude= {c[1]}, phase= {c[2]}")
-                orca_model.model.RunSimulation()
+        print(f"\nRunning scenario with oscilation in {dof_data.name}")
+        print(
+            f"period= {dof_data.period},  amplitude= {dof_data.amplitude},",
+            f"phase= {dof_data.phase}",
+        )
 
-                # Get results
-                post.process_simulation_results(orca_model.orca_refs)
+    def get_file_name(self, dof_data: DoF) -> str:
+        return (
+            dof_data.name.lower()
+            + f"_period{dof_data.period}_ampl{dof_data.amplitude}"
+            + f"_phase{dof_data.phase}"
+        )
 
-                # Save
-                file_name = dof + f"_period{c[0]}_ampl{c[1]}_phase{c[2]}"
-                IO.save_step_from_batch(orca_model.model, file_name, post)
+    def get_case_params(self, dof_data: DoF) -> dict:
+        return dof_data._asdict() | {"platforms": self.platforms}
 
     def get_all_combinations(self) -> dict[str, list]:
         """[summary]
@@ -294,6 +973,8 @@ class VesselHarmonicMotion(BatchSimulations):
 class WaveSeed(BatchSimulations):
     """[summary]"""
 
+    input_key = "wave seed"
+
     def __init__(self, post) -> None:
         """[summary]
 
@@ -304,10 +985,11 @@ class WaveSeed(BatchSimulations):
         super().__init__(post)
 
         # Input options
-        self.n_cases = IO.input_data["Batch"]["wave seed"]["number of cases"]
-        self.rng = aux.get_numpy_random_gen(
-            IO.input_data["Batch"]["wave seed"].get("seed generator", None)
-        )
+        self.n_cases = self.opt["number of cases"]
+
+        # Spectra averaged over the seeds (see 'Spectral')
+        self.spectra = None
+        self.n_averaged = 0
 
     def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
         """[summary]
@@ -330,21 +1012,681 @@ class WaveSeed(BatchSimulations):
             post (Post): [description]
         """
 
-        orca_env = orca_model.model.environment
+        self.run_cases(orca_model, post)
+
+        # Averaged spectra -> exported with the results of the batch
+        if self.spectra is not None:
+            print(f"\nSpectra averaged over {self.n_averaged} wave seeds")
+            post.results["spectra"] = self.spectra.get_spectra()
+            post.results["rao"] = self.spectra.get_rao()
+
+    def collect_output(self, post, output) -> None:
+        # Average spectra as each seed finishes
+        if output.spectra is None:
+            return None
+        if self.spectra is None:
+            self.spectra = output.spectra
+        else:
+            self.spectra.combine(output.spectra)
+        self.n_averaged += 1
+
+    def get_cases(self) -> list[tuple[int, int]]:
+        # Seeds are drawn here to not depend on the process running the case
+        rng = aux.get_numpy_random_gen(
+            self.get_seed_generator(self.opt.get("seed generator", None))
+        )
+        return [
+            (case, aux.get_seed(rng)) for case in range(1, self.n_cases, 1)
+        ]
+
+    def set_case(self, orca_model: OrcaflexModel, case) -> None:
+        orca_model.model.environment.WaveSeed = case[1]
+
+        print(
+            f"\nRunning simulation {case[0]}/{self.n_cases}:",
+            f"\twave seed={case[1]}",
+        )
+
+    def get_file_name(self, case) -> str:
+        return f"wave_seed_{case[0]}_of_{self.n_cases}"
+
+    def get_case_params(self, case) -> dict:
+        return {"wave seed": case[1]}
+
+
+class ModalSweep(BatchSimulations):
+    """Modal analyses of lines with swept properties
+
+    Each case sets the swept parameters, calculates statics and runs the
+    modal analysis of the lines ("lines", IDs). The modes of each case are
+    matched to the modes of the previous cases by the MAC of their shapes
+    (see 'ModeTracker'), so the batch results have a continuous period
+    curve per tracked mode ("Line1 Track3 period"). Input example:
+
+        "modal sweep": {
+            "lines": [1],
+            "modes": [1, 20],
+            "parameters": [
+                {"name": "length", "segment": 2, "values": [100.0, 120.0]},
+                {
+                    "name": "line type",
+                    "segment": 1,
+                    "values": ["Cable", "Cable2"]
+                },
+                {
+                    "name": "current",
+                    "values": {"from": 0.0, "to": 1.0, "step": 0.5}
+                },
+                {
+                    "name": "data",
+                    "object": "Line1",
+                    "item": "EndAZ",
+                    "values": [-5.0, 0.0]
+                }
+            ],
+            "MAC threshold": 0.8,
+            "cache": {"dir": "./modal_cache/"}
+        }
+
+    "cache" reuses the modal results of repeated cases or sweeps (see
+    'ModalCache'). "data" sets any data item of an object (e.g.: end
+    position of a line, to change its top tension). The cases are the
+    combinations (full factorial) of the parameter values.
+    """
+
+    input_key = "modal sweep"
+
+    # Parameter -> setter (orca_model, parameter options, value)
+    setters = {
+        "length": lambda om, p, v: ModalSweep.set_segment(om, p, "Length", v),
+        "line type": lambda om, p, v: ModalSweep.set_segment(
+            om, p, "LineType", v
+        ),
+        "target segment length": lambda om, p, v: ModalSweep.set_segment(
+            om, p, "TargetSegmentLength", v
+        ),
+        "current": lambda om, p, v: setattr(
+            om.model.environment, "RefCurrentSpeed", v
+        ),
+        "data": lambda om, p, v: ModalSweep.set_data_item(om, p, v),
+    }
+
+    def __init__(self, post) -> None:
+        """[summary]
+
+        Args:
+            post (Post): [description]
+        """
+
+        super().__init__(post)
+
+        opt = self.opt
+        self.line_ids = opt.get("lines", [1])
+        if not isinstance(self.line_ids, list):
+            self.line_ids = [self.line_ids]
+        self.spec = Analysis.get_modal_spec(opt | {"shapes": True})
+        # Shapes are needed to track the modes
+        self.outputs = {
+            "period": True,
+            "mass": True,
+            "stiffness": True,
+            "global shape": True,
+        }
+
+        self.parameters = opt["parameters"]
+        for param in self.parameters:
+            if param["name"] not in ModalSweep.setters:
+                raise ValueError(
+                    f'Unknown modal sweep parameter "{param["name"]}"'
+                )
+            param["label"] = ModalSweep.get_label(param)
+
+        # Modal analyses of the lines of a case (see 'ParallelModal')
+        parallel = opt.get("parallel", dict())
+        self.modal_workers = parallel.get("workers", 1)
+        self.modal_mode = parallel.get("mode", "threads")
+        self.modal_cache = (
+            ModalCache(opt["cache"]) if opt.get("cache") else None
+        )
+
+        # Line -> mode tracker
+        self.trackers = {
+            line_id: ModeTracker(
+                opt.get("MAC threshold", 0.8), opt.get("tracking points", 100)
+            )
+            for line_id in self.line_ids
+        }
+        # Line -> case of each MAC matrix (compared with the previous one)
+        self.mac_names: dict[int, list[str]] = {
+            line_id: [] for line_id in self.line_ids
+        }
+
+    @staticmethod
+    def get_label(param: dict) -> str:
+        if param["name"] == "data":
+            return f'{param["object"]} {param["item"]}'
+        if param.get("segment"):
+            return f'{param["name"]} {param["segment"]}'
+        return param["name"]
+
+    @staticmethod
+    def set_segment(orca_model: OrcaflexModel, param: dict, item: str, value):
+        line = orca_model.orca_refs["lines"][param.get("line", 1)]
+        getattr(line, item)[param.get("segment", 1) - 1] = value
+
+    @staticmethod
+    def set_data_item(orca_model: OrcaflexModel, param: dict, value):
+        obj = orca_model.model[param["object"]]
+        if param.get("index") is None:
+            setattr(obj, param["item"], value)
+        else:
+            getattr(obj, param["item"])[param["index"]] = value
+
+    def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
+        """[summary]
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+        """
+
+        self.run_cases(orca_model, post)
+        self.save_mac()
+
+        if IO.actions["plot results"]:
+            post.plot.plot_batch(post, self)
+
+    def get_cases(self) -> list[tuple]:
+        # NumPy scalars (ranges) -> Python values (JSON case parameters)
+        values = [
+            [
+                v.item() if isinstance(v, np.generic) else v
+                for v in aux.get_range_or_list(param["values"])
+            ]
+            for param in self.parameters
+        ]
+        return list(product(*values))
+
+    def set_case(self, orca_model: OrcaflexModel, case: tuple) -> None:
+        for param, value in zip(self.parameters, case):
+            ModalSweep.setters[param["name"]](orca_model, param, value)
+
+        print(f"\nRunning modal case: {self.get_case_params(case)}")
+
+    def get_file_name(self, case: tuple) -> str:
+        return "modal_" + "_".join(
+            f'{param["label"].replace(" ", "")}{value}'
+            for param, value in zip(self.parameters, case)
+        )
+
+    def get_case_params(self, case: tuple) -> dict:
+        return {
+            param["label"]: value
+            for param, value in zip(self.parameters, case)
+        }
+
+    def get_post_params(self) -> dict:
+        return {"lines": self.line_ids, "spec": self.spec}
+
+    def run_simulation(self, orca_model: OrcaflexModel, post):
+        """Statics of a case (modal analyses in 'get_case_output')
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+
+        Returns:
+            int | None: statics iterations (with warm start, None if unknown)
+        """
+
+        model = orca_model.model
+        iterations = Analysis.calculate_statics(model)
+        if not self.warm_start:
+            return None
+        # Modal analyses from the statics state (see 'apply_warm_start')
+        self.warm_state = model.SaveSimulationMem()
+        return iterations
+
+    def get_case_output(
+        self, orca_model: OrcaflexModel, post, case
+    ) -> CaseOutput:
+        tasks = [
+            ModalTask(
+                f"Line{line_id}",
+                orca_model.orca_refs["lines"][line_id].Name,
+                self.spec,
+                self.outputs,
+                None,
+            )
+            for line_id in self.line_ids
+        ]
+        if self.modal_cache is not None:
+            modal = self.modal_cache.run_tasks(
+                orca_model.model, tasks, self.modal_workers, self.modal_mode
+            )
+        else:
+            modal = run_modal_tasks(
+                orca_model.model, tasks, self.modal_workers, self.modal_mode
+            )
+        for task, results in zip(tasks, modal):
+            post.results["modal"][task.name] = results
+
+        row = {"case": self.get_file_name(case)} | self.get_case_params(case)
+        return CaseOutput(row, post.results)
+
+    def collect_output(self, post, output: CaseOutput) -> None:
+        # Modes tracked in the order the cases finish (similar successive
+        # cases with warm start) -> periods of each track in the row. Cases
+        # finished in a previous execution (resumed) are not tracked
+        for line_id, tracker in self.trackers.items():
+            results = output.results["modal"][f"Line{line_id}"]
+            n_mac = len(tracker.mac)
+            tracks = tracker.update(results.shapes["global shape"])
+            if len(tracker.mac) > n_mac:
+                self.mac_names[line_id].append(output.row["case"])
+            for track, period in zip(tracks, results.data["period"]):
+                output.row[f"Line{line_id} Track{track} period"] = period
+
+    def save_mac(self) -> None:
+        """Save the MAC matrices between successive cases (tracks x modes)"""
+
+        if not IO.save_options["results"]:
+            return None
+        for line_id, tracker in self.trackers.items():
+            if not tracker.mac:
+                continue
+            file_name = (
+                IO.results_dir
+                + IO.name_no_extension
+                + f"_Line{line_id}_mac.npz"
+            )
+            np.savez_compressed(
+                file_name,
+                **dict(zip(self.mac_names[line_id], tracker.mac)),
+            )
+            print(f'\nSaving "{file_name}" file . . .')
+
+
+class ParameterSweep(BatchSimulations):
+    """Sweep of any data items of the model (design of experiments)
+
+    Cases are generated lazily (see 'DesignOfExperiments') and run through
+    the usual run/postprocess/save cycle, with a row per case (parameters,
+    summary and fatigue damage). Input example:
+
+        "parameter sweep": {
+            "design": "latin hypercube",
+            "samples": 1000,
+            "seed": 1,
+            "parameters": [
+                {
+                    "object": "Environment",
+                    "item": "RefCurrentSpeed",
+                    "range": [0.0, 1.5]
+                },
+                {
+                    "ref": ["lines", 1],
+                    "item": "Length",
+                    "index": 0,
+                    "values": [90.0, 100.0]
+                },
+                {
+                    "object": "Turbine",
+                    "item": "InitialZ",
+                    "name": "hub z",
+                    "range": [88, 92]
+                }
+            ]
+        }
+
+    Designs: "full factorial" (default, "values" or ranges with "from",
+    "to" and "step"), "latin hypercube", "sobol" (SciPy) and "halton".
+    Sampled designs map "range" ([min, max], "log": true for a log scale)
+    or discrete "values". The object of a parameter is given by name
+    ("object") or by type and ID ("ref", see 'OrcaflexModel.orca_refs').
+    """
+
+    input_key = "parameter sweep"
+
+    def __init__(self, post) -> None:
+        """[summary]
+
+        Args:
+            post (Post): [description]
+        """
+
+        super().__init__(post)
+
+        opt = self.opt
+        self.design = opt.get("design", "full factorial")
+        self.n_samples = opt.get("samples", 100)
+        self.seed = opt.get("seed")
+        self.parameters = opt["parameters"]
+        for param in self.parameters:
+            param.setdefault("name", ParameterSweep.get_label(param))
+
+    @staticmethod
+    def get_label(param: dict) -> str:
+        if "object" in param:
+            obj = param["object"]
+        else:
+            obj = " ".join(map(str, param["ref"]))
+        index = f'[{param["index"]}]' if param.get("index") is not None else ""
+        return f'{obj} {param["item"]}{index}'
+
+    def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
+        """[summary]
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+        """
+
+        print(f"Parameter sweep: {self.get_n_cases()} cases ({self.design})")
+        self.run_cases(orca_model, post)
+
+    def get_n_cases(self) -> int:
+        if self.design != "full factorial":
+            return self.n_samples
+        return int(np.prod([len(values) for values in self.get_values()]))
+
+    def get_values(self) -> list[list]:
+        # NumPy scalars (ranges) -> Python values (JSON case parameters)
+        return [
+            [
+                v.item() if isinstance(v, np.generic) else v
+                for v in aux.get_range_or_list(param["values"])
+            ]
+            for param in self.parameters
+        ]
+
+    def get_cases(self):
+        """Cases (index and parameter values), generated as they are run
+
+        Yields:
+            tuple[int, tuple]: [description]
+        """
+
+        if self.design == "full factorial":
+            combinations = doe.full_factorial(self.get_values())
+        else:
+            # Seed recorded in the journal (if not given) -> same samples
+            # when resumed
+            seed = self.get_seed_generator(self.seed)
+            samplers = {
+                "latin hypercube": lambda n, d: doe.latin_hypercube(
+                    n, d, np.random.default_rng(seed)
+                ),
+                "sobol": lambda n, d: doe.sobol(n, d, seed),
+                "halton": doe.halton,
+            }
+            if self.design not in samplers:
+                raise ValueError(f'Unknown design "{self.design}"')
+            unit = samplers[self.design](self.n_samples, len(self.parameters))
+            columns = [
+                doe.scale(unit[:, dim], param)
+                for dim, param in enumerate(self.parameters)
+            ]
+            combinations = zip(*columns)
+
+        for index, values in enumerate(combinations, 1):
+            yield index, tuple(values)
+
+    @staticmethod
+    def get_object(orca_model: OrcaflexModel, param: dict):
+        if "ref" in param:
+            category, obj_id = param["ref"]
+            return orca_model.orca_refs[category][obj_id]
+        if param["object"] == "Environment":
+            return orca_model.model.environment
+        if param["object"] == "General":
+            return orca_model.model.general
+        return orca_model.model[param["object"]]
+
+    def set_case(self, orca_model: OrcaflexModel, case) -> None:
+        for param, value in zip(self.parameters, case[1]):
+            obj = ParameterSweep.get_object(orca_model, param)
+            if param.get("index") is None:
+                setattr(obj, param["item"], value)
+            else:
+                getattr(obj, param["item"])[param["index"]] = value
+
+        print(f"\nRunning case {case[0]}: {self.get_case_params(case)}")
+
+    def get_file_name(self, case) -> str:
+        return f"case{case[0]:05d}"
+
+    def get_case_params(self, case) -> dict:
+        return {
+            param["name"]: value
+            for param, value in zip(self.parameters, case[1])
+        }
+
+    def get_case_output(
+        self, orca_model: OrcaflexModel, post, case
+    ) -> CaseOutput:
+        output = super().get_case_output(orca_model, post, case)
+        if output.row is not None:
+            return output
+
+        # Row of each case, even without summary/fatigue
+        row = {"case": self.get_file_name(case)} | self.get_case_params(case)
+        return output._replace(row=row)
+
+
+class DesignLoadCases(BatchSimulations):
+    """Design load case (DLC) matrix, e.g.: IEC 61400-3 tables
+
+    Each DLC is expanded into the combinations of its wind speeds, wind
+    directions, sea states, wave directions and seeds (see
+    'LoadCaseMatrix'). Cases that are the same after normalisation (e.g.:
+    in more than one DLC, or with null wave height and different wave
+    directions) are run once, with all their DLCs in the "DLC" column.
+    Cases are ordered by wave, wind and seeds, and the wind and the wave
+    are only set when they change from the previous case run by the
+    process. Input example:
+
+        "design load cases": {
+            "seed generator": 1,
+            "cases": [
+                {
+                    "name": "1.2",
+                    "wind": {
+                        "type": "NPD spectrum",
+                        "frequency": {"min": 0.001, "max": 1.0},
+                        "components": 100
+                    },
+                    "wave": {
+                        "type": "JONSWAP",
+                        "parameters": "Automatic",
+                        "frequency": {"min": 0.5, "max": 10.0}
+                    },
+                    "wind speed": {"from": 4.0, "to": 24.0, "step": 2.0},
+                    "wind direction": [0.0, 30.0],
+                    "sea states": [
+                        {"wind speed": 4.0, "Hs": 1.1, "Tz": 5.8},
+                        ...
+                    ],
+                    "wave direction": "aligned",
+                    "seeds": 6
+                }
+            ]
+        }
+
+    "wind" and "wave" are the base definitions ("Environment" input).
+    "wave direction" is "aligned" (default, same as the wind) or a list.
+    "seeds" is a number of seeds, drawn once for the batch (the same seeds
+    in all DLCs), or a list of seeds. Unique cases and their DLCs are saved
+    with the results ("_dlc_cases.json").
+    """
+
+    input_key = "design load cases"
+
+    def __init__(self, post) -> None:
+        """[summary]
+
+        Args:
+            post (Post): [description]
+        """
+
+        super().__init__(post)
+
+        self.dlcs = self.opt["cases"]
+        self.cases: list[lcm.LoadCase] = None
+        self.n_combinations = 0
+
+        # Last case set in the model (of this process) and number of times
+        # each setter was called
+        self.last_case: lcm.LoadCase = None
+        self.n_set = {"wind": 0, "wave": 0}
+
+    def execute_batch(self, orca_model: OrcaflexModel, post) -> None:
+        """[summary]
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            post (Post): [description]
+        """
+
+        # Sink (journal) before the cases -> seed of random cases
+        self.open_sink(post)
+        cases = self.get_cases()
+        print(
+            f"Design load cases: {len(cases)} unique cases from",
+            f"{self.n_combinations} combinations of {len(self.dlcs)} DLCs",
+        )
 
-        for case in range(1, self.n_cases, 1):
-            orca_env.WaveSeed = aux.get_seed(self.rng)
+        self.run_cases(orca_model, post, cases)
+        self.save_case_map()
 
-            # Run simulation
+        if self.n_workers == 1:
             print(
-                f"\nRunning simulation {case}/{self.n_cases}:",
-                f"\twave seed={orca_env.WaveSeed}",
+                f"\nWind set {self.n_set['wind']} times and wave set",
+                f"{self.n_set['wave']} times in {len(cases)} cases",
             )
-            orca_model.model.RunSimulation()
 
-            # Get results
-            post.process_simulation_results(orca_model.orca_refs)
+    def get_cases(self) -> list[lcm.LoadCase]:
+        if self.cases is not None:
+            return self.cases
+
+        # Seeds are drawn here to not depend on the process running the case
+        n_seeds = max(
+            [
+                dlc["seeds"]
+                for dlc in self.dlcs
+                if isinstance(dlc.get("seeds"), int)
+            ],
+            default=0,
+        )
+        rng = aux.get_numpy_random_gen(
+            self.get_seed_generator(self.opt.get("seed generator", None))
+        )
+        seeds = [int(aux.get_seed(rng)) for _ in range(n_seeds)]
+
+        combinations = []
+        for dlc in self.dlcs:
+            combinations += lcm.expand_dlc(dlc, seeds)
+        self.n_combinations = len(combinations)
+
+        cases = lcm.order_cases(lcm.deduplicate(combinations))
+        self.cases = [
+            case._replace(index=i) for i, case in enumerate(cases, 1)
+        ]
+        return self.cases
+
+    def order_cases(self, cases: list) -> list:
+        # Already ordered to share the model state (see 'get_cases')
+        return cases
+
+    def set_case(self, orca_model: OrcaflexModel, case: lcm.LoadCase) -> None:
+        last = self.last_case
+        self.set_definition(
+            orca_model, "wave", case.wave, None if last is None else last.wave
+        )
+        self.set_definition(
+            orca_model, "wind", case.wind, None if last is None else last.wind
+        )
+
+        self.last_case = case
+        print(f"\nRunning DLC case {case.index}: {self.get_case_params(case)}")
 
-            # Save
-            file_name = f"wave_seed_{case}_of_{self.n_cases}"
-            IO.save_step_from_batch(orca_model.model, file_name, post)
+    def set_definition(
+        self, orca_model: OrcaflexModel, name: str, definition, last
+    ) -> None:
+        """Set the wind or the wave of a case, if changed
+
+        Args:
+            orca_model (OrcaflexModel): [description]
+            name (str): "wind" or "wave"
+            definition (dict | str): [description]
+            last (dict | str): definition of the previous case (None ->
+                first case)
+        """
+
+        data, seed = lcm.split_seed(definition)
+        last_data, last_seed = lcm.split_seed(last)
+        if data != last_data:
+            getattr(orca_model, f"set_{name}")(definition)
+            self.n_set[name] += 1
+            return None
+
+        # Only the seed changed -> spectrum and components are kept
+        if seed is None or seed == last_seed:
+            return None
+        env = orca_model.model.environment
+        if name == "wave":
+            env.UserSpecifiedRandomWaveSeeds = True
+            env.WaveSeed = seed
+        else:
+            env.WindSeed = seed
+
+    def get_file_name(self, case: lcm.LoadCase) -> str:
+        return f"DLC{case.dlcs[0]}_case{case.index:04d}"
+
+    def get_case_params(self, case: lcm.LoadCase) -> dict:
+        params = {"DLC": ", ".join(case.dlcs)}
+        params |= lcm.flatten(case.wind, "wind")
+        return params | lcm.flatten(case.wave, "wave")
+
+    def get_case_output(
+        self, orca_model: OrcaflexModel, post, case
+    ) -> CaseOutput:
+        output = super().get_case_output(orca_model, post, case)
+        if output.row is not None:
+            return output
+
+        # Row of each case, even without summary/fatigue
+        row = {"case": self.get_file_name(case)} | self.get_case_params(case)
+        return output._replace(row=row)
+
+    def save_case_map(self) -> None:
+        """Save the unique cases run and their DLCs"""
+
+        if not IO.save_options["results"]:
+            return None
+        case_map = {
+            self.get_file_name(case): {
+                "DLC": list(case.dlcs),
+                "wind": case.wind,
+                "wave": case.wave,
+            }
+            for case in self.run_order
+        }
+        file_name = IO.results_dir + IO.name_no_extension + "_dlc_cases.json"
+        with open(file_name, "w") as map_file:
+            json.dump(case_map, map_file, indent=4)
+        print(f'\nSaving "{file_name}" file . . .')
+
+
+# Batch types by input key (see 'create_batch')
+batch_types = {
+    cls.input_key: cls
+    for cls in [
+        ThrustCurve,
+        VesselHarmonicMotion,
+        WaveSeed,
+        ModalSweep,
+        ParameterSweep,
+        DesignLoadCases,
+    ]
+}
@@ -0,0 +1,132 @@
+"""Sampling plans (designs of experiments) of parameter sweeps.
+
+Sampled designs return points in the unit hypercube (samples x dimensions),
+which are mapped to the parameter values by 'scale'. The full factorial
+design is a lazy iterator of value combinations.
+"""
+
+import AuxFunctions as aux
+
+from itertools import product
+import numpy as np
+
+
+def full_factorial(values: list[list]):
+    """All combinations of the values of each parameter (lazy)
+
+    Args:
+        values (list[list]): values of each parameter
+
+    Returns:
+        Iterator[tuple]: [description]
+    """
+
+    return product(*values)
+
+
+def latin_hypercube(n_samples: int, n_dims: int, rng: np.random.Generator):
+    """Latin hypercube: one sample in each of the 'n_samples' strata of each
+    dimension, with random pairing of the strata
+
+    Args:
+        n_samples (int): [description]
+        n_dims (int): [description]
+        rng (np.random.Generator): [description]
+
+    Returns:
+        np.ndarray: samples x dimensions, in [0, 1)
+    """
+
+    strata = np.argsort(rng.random((n_dims, n_samples)), axis=1).T
+    return (strata + rng.random((n_samples, n_dims))) / n_samples
+
+
+def sobol(n_samples: int, n_dims: int, seed=None):
+    """Scrambled Sobol sequence (requires SciPy, otherwise a Halton
+    sequence is used)
+
+    Args:
+        n_samples (int): [description]
+        n_dims (int): [description]
+        seed (int, optional): [description]. Defaults to None.
+
+    Returns:
+        np.ndarray: samples x dimensions, in [0, 1)
+    """
+
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        print(
+            "SciPy is not available, using a Halton sequence instead of Sobol"
+        )
+        return halton(n_samples, n_dims)
+
+    # Balance properties of Sobol sequences hold for powers of 2
+    m = int(np.ceil(np.log2(max(n_samples, 1))))
+    return qmc.Sobol(n_dims, scramble=True, seed=seed).random_base2(m)[
+        :n_samples
+    ]
+
+
+def halton(n_samples: int, n_dims: int):
+    """Halton sequence (radical inverse in the first prime bases), skipping
+    the first point (origin)
+
+    Args:
+        n_samples (int): [description]
+        n_dims (int): [description]
+
+    Returns:
+        np.ndarray: samples x dimensions, in [0, 1)
+    """
+
+    primes = get_primes(n_dims)
+    index = np.arange(1, n_samples + 1)
+    points = np.zeros((n_samples, n_dims))
+    for dim, base in enumerate(primes):
+        i, factor = index.copy(), 1.0 / base
+        while i.any():
+            points[:, dim] += factor * (i % base)
+            i //= base
+            factor /= base
+    return points
+
+
+def get_primes(n: int) -> list[int]:
+    primes, candidate = [], 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def scale(unit: np.ndarray, param: dict) -> list:
+    """Values of a parameter from points in [0, 1)
+
+    Args:
+        unit (np.ndarray): [description]
+        param (dict): "range" ([min, max], optionally with "log": true) or
+            "values" (discrete, equally likely, list or range with "from",
+            "to" and "step")
+
+    Returns:
+        list: [description]
+    """
+
+    if param.get("range") is not None:
+        low, high = param["range"]
+        if param.get("log"):
+            values = np.exp(np.log(low) + unit * (np.log(high) - np.log(low)))
+        else:
+            values = low + unit * (high - low)
+        return values.tolist()
+
+    # NumPy scalars (ranges) -> Python values (JSON case parameters)
+    values = [
+        v.item() if isinstance(v, np.generic) else v
+        for v in aux.get_range_or_list(param["values"])
+    ]
+    index = np.minimum((unit * len(values)).astype(int), len(values) - 1)
+    return [values[i] for i in index]
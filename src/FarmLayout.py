@@ -0,0 +1,271 @@
+import numpy as np
+
+
+class FarmLayout:
+    """Input sections of a wind farm, from a compact layout definition
+
+    Platforms are placed on a grid (or at given positions) and the same
+    mooring, tower and turbine definitions are repeated for each one. The
+    items are appended to the sections of the input ("Platforms",
+    "Keypoints", "Lines", "Towers" and "Turbines"), so IDs of the farm
+    objects follow the objects defined explicitly. Input example:
+
+        "Farm": {
+            "grid": {"rows": 2, "columns": 3, "spacing": [1500.0, 1500.0]},
+            "platform": {
+                "z": 0.0, "constraint type": {"imposed motion": false}
+            },
+            "moorings": {
+                "angles": [0.0, 120.0, 240.0], "segment set": 1,
+                "fairlead radius": 40.0, "fairlead z": -14.0,
+                "anchor radius": 800.0, "anchor z": -200.0,
+                "shared": {"segment set": 2, "neighbours": "row"}
+            },
+            "turbine": {"clone": "Turbine", "position": [0.0, 0.0, 90.0]},
+            "tower": {
+                "section": "tower",
+                "nacelle": [0.0, 0.0, 0.0, 0.0, 180.0, 0.0],
+                "platform": [0.0, 0.0, 15.0, 0.0, 180.0, 0.0]
+            }
+        }
+
+    "grid" may be replaced by "positions" ([[x, y], ...]). Shared lines
+    connect neighbouring platforms ("row", "column" or "grid") and replace
+    the anchored lines in the same direction. Fairleads are given relative
+    to the platform and anchors in global coordinates.
+    """
+
+    def __init__(self, opt: dict) -> None:
+        """[summary]
+
+        Args:
+            opt (dict): "Farm" input
+        """
+
+        self.opt = opt
+        self.positions, self.cells = self.get_positions()
+
+    def get_positions(self) -> tuple[np.ndarray, list]:
+        """Position (x, y) and grid cell (row, column) of each platform
+
+        Returns:
+            tuple[np.ndarray, list]: [description]
+        """
+
+        if self.opt.get("positions") is not None:
+            positions = np.asarray(self.opt["positions"], dtype=float)[:, :2]
+            return positions, [None] * len(positions)
+
+        grid = self.opt["grid"]
+        rows, columns = grid["rows"], grid["columns"]
+        spacing = np.broadcast_to(
+            np.asarray(grid["spacing"], dtype=float), (2,)
+        )
+        cells = [(r, c) for r in range(rows) for c in range(columns)]
+        local = np.array([[c * spacing[0], r * spacing[1]] for r, c in cells])
+
+        # Grid rotated by the heading, around the origin
+        heading = np.radians(grid.get("heading", 0.0))
+        rotation = np.array(
+            [
+                [np.cos(heading), -np.sin(heading)],
+                [np.sin(heading), np.cos(heading)],
+            ]
+        )
+        positions = local @ rotation.T + np.asarray(
+            grid.get("origin", [0.0, 0.0])
+        )
+        return positions, cells
+
+    def get_neighbours(self) -> list[tuple[int, int]]:
+        """Pairs of platforms (indices) connected by shared lines
+
+        Returns:
+            list[tuple[int, int]]: [description]
+        """
+
+        shared = self.opt.get("moorings", dict()).get("shared")
+        if not shared:
+            return []
+        if shared.get("pairs"):
+            return [(i - 1, j - 1) for i, j in shared["pairs"]]
+
+        neighbours = shared.get("neighbours", "grid")
+        index = {cell: i for i, cell in enumerate(self.cells)}
+        pairs = []
+        for i, cell in enumerate(self.cells):
+            if cell is None:
+                continue
+            r, c = cell
+            if neighbours in ("row", "grid") and (r, c + 1) in index:
+                pairs.append((i, index[(r, c + 1)]))
+            if neighbours in ("column", "grid") and (r + 1, c) in index:
+                pairs.append((i, index[(r + 1, c)]))
+        return pairs
+
+    def get_sections(self, data: dict) -> dict:
+        """Sections of the input with the farm objects appended
+
+        Args:
+            data (dict): input (explicit objects are kept)
+
+        Returns:
+            dict: "Platforms", "Keypoints", "Lines", "Towers" and "Turbines"
+        """
+
+        platforms = list(data.get("Platforms") or [])
+        keypoints = data.get("Keypoints") or dict()
+        keypoints = {
+            "anchors": list(keypoints.get("anchors", [])),
+            "fairleads": list(keypoints.get("fairleads", [])),
+        }
+        lines = list(data.get("Lines") or [])
+        towers = list(data.get("Towers") or [])
+        turbines = list(data.get("Turbines") or [])
+
+        # Farm platforms -> IDs after the explicit ones
+        first_id = len(platforms) + 1
+        ids = list(range(first_id, first_id + len(self.positions)))
+        names = [f"Platform {i + 1}" for i in range(len(self.positions))]
+        platform = self.opt.get("platform", dict())
+        for name, (x, y) in zip(names, self.positions):
+            platforms.append(
+                {
+                    "name": name,
+                    "position": [float(x), float(y), platform.get("z", 0.0)],
+                    "angles": platform.get("angles", [0.0, 0.0, 0.0]),
+                    "constraint type": platform.get(
+                        "constraint type", {"imposed motion": False}
+                    ),
+                    "tags": ["farm"] + platform.get("tags", []),
+                }
+            )
+
+        self.add_moorings(ids, names, keypoints, lines)
+
+        turbine = self.opt.get("turbine")
+        if turbine:
+            for i, (pid, name) in enumerate(zip(ids, names)):
+                turbines.append(
+                    {
+                        "name": f"Turbine {i + 1}",
+                        "clone": turbine.get("clone"),
+                        "platform": pid,
+                        "position": turbine.get("position", [0.0, 0.0, 0.0]),
+                        "tags": ["farm"],
+                    }
+                )
+
+        tower = self.opt.get("tower")
+        if tower:
+            for i, name in enumerate(names):
+                towers.append(
+                    {
+                        "name": f"Tower {i + 1}",
+                        # Nacelle -> turbine of the platform (if generated)
+                        "nacelle": {
+                            "id": f"Turbine {i + 1}" if turbine else name,
+                            "end": tower["nacelle"],
+                        },
+                        "platform": {"id": name, "end": tower["platform"]},
+                        "section": tower["section"],
+                        "tags": ["farm"],
+                    }
+                )
+
+        return {
+            "Platforms": platforms,
+            "Keypoints": keypoints,
+            "Lines": lines,
+            "Towers": towers,
+            "Turbines": turbines,
+        }
+
+    def add_moorings(self, ids, names, keypoints: dict, lines: list) -> None:
+        """Anchored and shared lines of the farm platforms
+
+        Args:
+            ids (list[int]): platform IDs
+            names (list[str]): platform names
+            keypoints (dict): "anchors" and "fairleads" (appended)
+            lines (list): line definitions (appended)
+        """
+
+        moorings = self.opt.get("moorings")
+        if not moorings:
+            return None
+
+        fairleads = {tuple(k): i for i, k in enumerate(keypoints["fairleads"])}
+
+        def get_fairlead(angle) -> int:
+            # Fairleads relative to the platform -> shared by all platforms
+            radius = moorings.get("fairlead radius", 0.0)
+            coord = (
+                round(radius * np.cos(np.radians(angle)), 6),
+                round(radius * np.sin(np.radians(angle)), 6),
+                moorings.get("fairlead z", 0.0),
+            )
+            if coord not in fairleads:
+                fairleads[coord] = len(keypoints["fairleads"])
+                keypoints["fairleads"].append(list(coord))
+            return fairleads[coord] + 1
+
+        # Direction (deg) of the shared lines of each platform
+        pairs = self.get_neighbours()
+        shared_angles = [[] for _ in ids]
+        for i, j in pairs:
+            dx, dy = self.positions[j] - self.positions[i]
+            angle = np.degrees(np.arctan2(dy, dx))
+            shared_angles[i].append(angle)
+            shared_angles[j].append(angle + 180.0)
+
+        def is_shared(i, angle) -> bool:
+            return any(
+                abs((angle - a + 180.0) % 360.0 - 180.0) < 1.0
+                for a in shared_angles[i]
+            )
+
+        anchor_radius = moorings.get("anchor radius", 0.0)
+        for i, (pid, name) in enumerate(zip(ids, names)):
+            x, y = self.positions[i]
+            for k, angle in enumerate(moorings.get("angles", [])):
+                if is_shared(i, angle):
+                    continue
+                rad = np.radians(angle)
+                keypoints["anchors"].append(
+                    [
+                        float(x + anchor_radius * np.cos(rad)),
+                        float(y + anchor_radius * np.sin(rad)),
+                        moorings.get("anchor z", 0.0),
+                    ]
+                )
+                lines.append(
+                    {
+                        "name": f"{name} mooring {k + 1}",
+                        "has anchor": True,
+                        "platform": pid,
+                        "ends": [
+                            get_fairlead(angle),
+                            len(keypoints["anchors"]),
+                        ],
+                        "segment set": moorings["segment set"],
+                        "tags": ["farm", "mooring"],
+                    }
+                )
+
+        shared = moorings.get("shared", dict())
+        for i, j in pairs:
+            dx, dy = self.positions[j] - self.positions[i]
+            angle = np.degrees(np.arctan2(dy, dx))
+            lines.append(
+                {
+                    "name": f"Shared line {i + 1}-{j + 1}",
+                    "has anchor": False,
+                    "platform": [ids[i], ids[j]],
+                    "ends": [get_fairlead(angle), get_fairlead(angle + 180.0)],
+                    "segment set": shared.get(
+                        "segment set", moorings["segment set"]
+                    ),
+                    "tags": ["farm", "shared"],
+                }
+            )
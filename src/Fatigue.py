@@ -0,0 +1,300 @@
+from concurrent.futures import ThreadPoolExecutor
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def get_turning_points(block: np.ndarray):
+    """Turning points (reversals) of each channel, flattened
+
+    Plateaus are reduced to one point and the first and last samples are
+    always kept.
+
+    Args:
+        block (np.ndarray): samples x channels
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: values and channel (column) of each
+            turning point, channel by channel
+    """
+
+    n_samples, n_channels = block.shape
+    if n_samples < 3:
+        mask = np.ones_like(block, dtype=bool)
+    else:
+        slope = np.sign(np.diff(block, axis=0))
+        # Plateaus (zero slope) take the slope before them
+        rows = np.where(slope != 0, np.arange(n_samples - 1)[:, None], 0)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        slope = np.take_along_axis(slope, rows, axis=0)
+
+        mask = np.ones_like(block, dtype=bool)
+        mask[1:-1] = (slope[1:] != slope[:-1]) & (slope[1:] != 0)
+
+    # Transposed -> points ordered by channel, then by time
+    channels, samples = np.nonzero(mask.T)
+    return block[samples, channels], channels
+
+
+def rainflow(values: np.ndarray, channels: np.ndarray):
+    """Rainflow counting of (flattened) turning points of many channels
+
+    Four-point method, applied to all channels at once: in each pass,
+    every inner pair of reversals whose range does not exceed the ranges
+    of the adjacent pairs is counted as a full cycle and removed (pairs
+    sharing a point are left to the next pass). The residue is counted
+    as half cycles, as in ASTM E1049.
+
+    Args:
+        values (np.ndarray): turning points (see 'get_turning_points')
+        channels (np.ndarray): channel of each turning point
+
+    Returns:
+        tuple[np.ndarray, ...]: range, mean, count (1 or 0.5) and channel
+            of each cycle
+    """
+
+    ranges, means, counts, cycle_channels = [], [], [], []
+
+    while len(values) > 3:
+        delta = np.abs(np.diff(values))
+        same = channels[1:] == channels[:-1]
+        inner = delta[1:-1]
+        # Pair (k, k + 1), k = index + 1 -> points k - 1 to k + 2 in a channel
+        found = (
+            (inner <= delta[:-2])
+            & (inner <= delta[2:])
+            & same[:-2]
+            & same[1:-1]
+            & same[2:]
+        )
+        # Pairs sharing a point -> keep the first
+        found[1:] &= ~found[:-1]
+        if not found.any():
+            break
+
+        first = np.nonzero(found)[0] + 1
+        ranges.append(delta[first])
+        means.append(0.5 * (values[first] + values[first + 1]))
+        counts.append(np.ones(len(first)))
+        cycle_channels.append(channels[first])
+
+        keep = np.ones(len(values), dtype=bool)
+        keep[first] = False
+        keep[first + 1] = False
+        values, channels = values[keep], channels[keep]
+
+    # Residue -> half cycles
+    same = channels[1:] == channels[:-1]
+    ranges.append(np.abs(np.diff(values))[same])
+    means.append(0.5 * (values[1:] + values[:-1])[same])
+    counts.append(np.full(same.sum(), 0.5))
+    cycle_channels.append(channels[1:][same])
+
+    return (
+        np.concatenate(ranges),
+        np.concatenate(means),
+        np.concatenate(counts),
+        np.concatenate(cycle_channels),
+    )
+
+
+class FatigueCurve:
+    """S-N or T-N curve: N = max_i(a_i * S^-m_i), with one or more segments
+
+    The range S is the (tension or stress) range multiplied by 'scale'
+    (e.g.: stress concentration factor / area) and divided by 'reference'
+    (e.g.: minimum breaking strength, for T-N curves of mooring lines).
+    Ranges below 'threshold' (after scaling) cause no damage.
+    """
+
+    def __init__(self, opt: dict) -> None:
+        """[summary]
+
+        Args:
+            opt (dict): "m" and "log a" (or "a"), numbers or lists (one
+                value per segment), and optional "scale", "reference"
+                and "threshold"
+        """
+
+        self.m = np.atleast_1d(np.asarray(opt["m"], dtype=float))
+        if "log a" in opt:
+            self.log_a = np.atleast_1d(np.asarray(opt["log a"], dtype=float))
+        else:
+            self.log_a = np.log10(
+                np.atleast_1d(np.asarray(opt["a"], dtype=float))
+            )
+        if len(self.m) != len(self.log_a):
+            raise ValueError(
+                "Fatigue curve with different number of 'm' and 'a'"
+            )
+
+        self.scale = opt.get("scale", 1.0) / opt.get("reference", 1.0)
+        self.threshold = opt.get("threshold", 0.0)
+
+    def get_damage(self, ranges: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Damage (Miner's rule) of each cycle
+
+        Args:
+            ranges (np.ndarray): [description]
+            counts (np.ndarray): [description]
+
+        Returns:
+            np.ndarray: [description]
+        """
+
+        s = ranges * self.scale
+        valid = s > self.threshold
+        log_s = np.log10(s[valid])
+
+        # Cycles to failure -> segment with most cycles
+        log_n = np.max(self.log_a[:, None] - self.m[:, None] * log_s, axis=0)
+
+        damage = np.zeros(len(ranges))
+        damage[valid] = counts[valid] / 10.0**log_n
+        return damage
+
+
+class Fatigue:
+    """Fatigue damage of tension channels (PostProcessing "fatigue")
+
+    Channels are updated as the results are extracted (see
+    'ResultsBuilder'): turning points and rainflow cycles are obtained
+    for all channels of a block at once, optionally in chunks of channels
+    processed by threads. Example of input:
+
+        "fatigue": {
+            "curves": {
+                "chain": {"m": 3.0, "log a": 3.0, "reference": 8000.0}
+            },
+            "lines": [{"id": 1, "curve": "chain"}],
+            "variables": ["Tension"],
+            "workers": 4,
+            "chunk size": 64
+        }
+
+    Line "id" may be "all" (curve for lines without a specific one).
+    """
+
+    def __init__(self, opt: dict) -> None:
+        """[summary]
+
+        Args:
+            opt (dict): [description]
+        """
+
+        self.curves = {
+            name: FatigueCurve(curve) for name, curve in opt["curves"].items()
+        }
+        # Line ID -> curve name
+        self.line_curves = {
+            str(line["id"]): line["curve"] for line in opt["lines"]
+        }
+        variables = "|".join(opt.get("variables", ["Tension"]))
+        self.pattern = re.compile(rf"^Line(\d+)_.+_({variables})$")
+
+        self.workers = opt.get("workers", 1)
+        self.chunk_size = opt.get("chunk size", 64)
+
+        # Channel -> damage (accumulated, e.g. blocks of a channel)
+        self.damage: dict[str, float] = dict()
+        self.cycles: dict[str, float] = dict()
+
+    def get_curve(self, name: str) -> str:
+        """Curve of a channel (column name)
+
+        Args:
+            name (str): e.g. "Line1_Node5_Tension"
+
+        Returns:
+            str: curve name, None if the channel is not evaluated
+        """
+
+        found = self.pattern.match(name)
+        if found is None:
+            return None
+        return self.line_curves.get(
+            found.group(1), self.line_curves.get("all")
+        )
+
+    def update(self, names: list[str], block) -> None:
+        """Evaluate the damage of the channels of a block (if defined)
+
+        Args:
+            names (list[str]): channel names
+            block (array_like): 2D array (samples x len(names))
+        """
+
+        block = np.asarray(block, dtype=float).reshape(-1, len(names))
+
+        # Channels grouped by curve
+        groups = dict()
+        for i, name in enumerate(names):
+            curve = self.get_curve(name)
+            if curve is not None:
+                groups.setdefault(curve, []).append(i)
+
+        tasks = [
+            (curve, cols[start : start + self.chunk_size])
+            for curve, cols in groups.items()
+            for start in range(0, len(cols), self.chunk_size)
+        ]
+        if not tasks:
+            return None
+
+        def evaluate(task):
+            curve, cols = task
+            return cols, self.get_damage(self.curves[curve], block[:, cols])
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(min(self.workers, len(tasks))) as executor:
+                results = list(executor.map(evaluate, tasks))
+        else:
+            results = [evaluate(task) for task in tasks]
+
+        for cols, (damage, cycles) in results:
+            for i, col in enumerate(cols):
+                name = names[col]
+                self.damage[name] = self.damage.get(name, 0.0) + damage[i]
+                self.cycles[name] = self.cycles.get(name, 0.0) + cycles[i]
+
+    @staticmethod
+    def get_damage(curve: FatigueCurve, block: np.ndarray):
+        """Damage and number of cycles of each channel of a block
+
+        Args:
+            curve (FatigueCurve): [description]
+            block (np.ndarray): samples x channels
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: [description]
+        """
+
+        ranges, _, counts, channels = rainflow(*get_turning_points(block))
+        n_channels = block.shape[1]
+        damage = np.bincount(
+            channels, curve.get_damage(ranges, counts), minlength=n_channels
+        )
+        cycles = np.bincount(channels, counts, minlength=n_channels)
+        return damage, cycles
+
+    def to_frame(self) -> pd.DataFrame:
+        """Damage and number of cycles (rows) of each channel (columns)
+
+        Returns:
+            pd.DataFrame: [description]
+        """
+
+        return pd.DataFrame(
+            [self.damage, self.cycles], index=["damage", "cycles"]
+        )
+
+    def to_row(self) -> dict[str, float]:
+        """Damage as a flat row (e.g.: "Line1_Node5_Tension_damage")
+
+        Returns:
+            dict[str, float]: [description]
+        """
+
+        return {f"{name}_damage": float(d) for name, d in self.damage.items()}
@@ -1,5 +1,8 @@
 import json as json
+import shutil
 import AuxFunctions as aux
+from AsyncWriter import AsyncWriter, write_bytes
+from Profiler import Profiler
 
 
 class IO:
@@ -12,6 +15,11 @@ class IO:
     input_data = dict()
     name_no_extension: str = ""
 
+    # Skip batch cases finished in a previous execution (see 'BatchJournal')
+    resume: bool = False
+    # Background writer of batch files (see 'start_writer')
+    writer: AsyncWriter = None
+
     # Default actions
     actions: dict[str, bool] = {
         "load data": False,
@@ -24,6 +32,7 @@ class IO:
         "export results": False,
         "plot results": False,
         "batch simulations": False,
+        "post only": False,
     }
     # Default options
     save_options: dict = {
@@ -32,6 +41,8 @@ class IO:
         "results": False,
         "batch simulation": False,
         "batch data": False,
+        "background writers": 0,
+        "writer queue": 4,
     }
 
     @staticmethod
@@ -68,7 +79,7 @@ class IO:
         IO.actions = IO.actions | IO.input_data["Actions"]
 
         # If model will be generated with the API, (re)name some objects
-        if IO.input_data["Actions"]["generate model"]:
+        if IO.actions["generate model"]:
             IO._set_names()
         # Set inp/out directories
         if IO.input_data["File IO"]:
@@ -96,6 +107,7 @@ class IO:
                 lines[line]["name"] = "Line " + str(line + 1)
 
     @staticmethod
+    @Profiler.timed()
     def save(orcaflexmodel, post) -> None:
         """[summary]
 
@@ -137,24 +149,98 @@ class IO:
             if not formats:
                 return
 
-            res = post.results
-            for sim in ["statics", "dynamics"]:
-                if not formats.get(sim) or res[sim].empty:
-                    continue
-                aux.export_results(res[sim], filename, formats[sim], "_" + sim)
-
-            # Modal results -> for each line and whole system
-            if formats.get("modal") and res["modal"]:
-                for name, data in res["modal"].items():
-                    aux.export_results(
-                        data, filename + "_" + name, formats["modal"], "_modal"
-                    )
+            IO.export_simulation_results(filename, post.results, formats)
 
             if formats.get("batch") and not post.batch_results.empty:
                 aux.export_results(
-                    post.batch_results, filename, formats["batch"], "_batch"
+                    post.batch_results,
+                    filename,
+                    formats["batch"],
+                    "_batch",
+                    formats.get("options"),
                 )
 
+    @staticmethod
+    def export_modal_results(
+        filename, modal: dict, formats, options=None
+    ) -> list:
+        """Export the modal results of each object (see 'ModalResults'). The
+        wide table (a column per node and DoF) is only created for tabular
+        formats; "npz" saves the arrays
+
+        Args:
+            filename (str): file name prefix
+            modal (dict): name (e.g.: "Line1") -> 'ModalResults'
+            formats (str | list[str]): e.g.: ["csv", "npz"]
+            options (dict, optional): see 'aux.export_results'.
+                Defaults to None.
+
+        Returns:
+            list[str]: saved files
+        """
+
+        if isinstance(formats, str):
+            formats = [formats]
+        tabular = [fmt for fmt in formats if fmt != "npz"]
+
+        saved = []
+        for name, data in modal.items():
+            if "npz" in formats:
+                saved.append(data.save(filename + name + "_modal"))
+            if tabular:
+                saved += aux.export_results(
+                    data.to_frame(),
+                    filename + name,
+                    tabular,
+                    "_modal",
+                    options,
+                )
+        return saved
+
+    @staticmethod
+    def export_simulation_results(filename, res, formats) -> list:
+        """Export postprocessed results of a simulation, in the format
+        defined for each type of result (e.g.: "dynamics": "csv")
+
+        Args:
+            filename (str): file name, without extension
+            res (dict): results (see 'Post.results')
+            formats (dict): export formats (see 'Post.formats')
+
+        Returns:
+            list[str]: saved files
+        """
+
+        saved = []
+        for sim in [
+            "statics",
+            "dynamics",
+            "summary",
+            "fatigue",
+            "spectra",
+            "rao",
+        ]:
+            if not formats.get(sim) or res[sim].empty:
+                continue
+            saved += aux.export_results(
+                res[sim],
+                filename,
+                formats[sim],
+                "_" + sim,
+                formats.get("options"),
+            )
+
+        # Modal results -> for each line and whole system
+        if formats.get("modal") and res["modal"]:
+            saved += IO.export_modal_results(
+                filename + "_",
+                res["modal"],
+                formats["modal"],
+                formats.get("options"),
+            )
+
+        return saved
+
     @staticmethod
     def set_directories(options) -> None:
         """[summary]
@@ -175,49 +261,160 @@ class IO:
             IO.results_dir = IO.output_dir
 
     @staticmethod
-    def save_step_from_batch(orcaflexmodel, file_name, post) -> None:
-        """[summary]
+    def get_state() -> dict:
+        """Snapshot of the (class level) IO state, used to initialize
+        worker processes of parallel batches
+
+        Returns:
+            dict: input data, actions, options and directories
+        """
+
+        return {
+            "input_data": IO.input_data,
+            "name_no_extension": IO.name_no_extension,
+            "actions": IO.actions,
+            "save_options": IO.save_options,
+            "input_dir": IO.input_dir,
+            "output_dir": IO.output_dir,
+            "results_dir": IO.results_dir,
+            "resume": IO.resume,
+        }
+
+    @staticmethod
+    def set_state(state: dict) -> None:
+        """Restore the IO state from a snapshot (see 'get_state')
 
         Args:
-            orcaflexmodel ([type]): [description]
-            file_name ([type]): [description]
-            post ([type]): [description]
+            state (dict): IO state
+        """
+
+        IO.input_data = state["input_data"]
+        IO.name_no_extension = state["name_no_extension"]
+        IO.actions = state["actions"]
+        IO.save_options = state["save_options"]
+        IO.input_dir = state["input_dir"]
+        IO.output_dir = state["output_dir"]
+        IO.results_dir = state["results_dir"]
+        IO.resume = state["resume"]
+
+    @staticmethod
+    def start_writer() -> None:
+        """Start the background writer of batch files, if requested in
+        "Save options" ("background writers" > 0)
         """
+
+        n_threads = IO.save_options["background writers"]
+        if IO.writer is None and n_threads > 0:
+            IO.writer = AsyncWriter(n_threads, IO.save_options["writer queue"])
+
+    @staticmethod
+    def flush_writer() -> None:
+        """Wait files being written in background and raise write errors"""
+
+        if IO.writer is not None:
+            IO.writer.flush()
+
+    @staticmethod
+    @Profiler.timed()
+    def save_model_step_from_batch(
+        orcaflexmodel, file_name, sim_file=None
+    ) -> list:
+        """Save Orcaflex data and/or simulation of a batch case
+
+        Args:
+            orcaflexmodel (orca.Model): model of the current case
+            file_name (str): file name, without extension
+            sim_file (str, optional): simulation already saved (cached),
+                copied instead of saving the model. Defaults to None.
+
+        Returns:
+            list[str]: saved files
+        """
+
+        saved = []
         output_file = IO.output_dir + file_name
         # Orcaflex input data
         if IO.save_options["batch data"]:
             print(f'\nSaving "{output_file}.yml" file')
-            orcaflexmodel.SaveData(output_file + ".yml")
+            if IO.writer is not None:
+                # Imported here -> IO does not import the API
+                # (see 'ParallelBatch')
+                import OrcFxAPI as orca
+
+                # Copy in memory and write in background
+                data = orcaflexmodel.SaveDataMem(orca.DataFileType.Text)
+                IO.writer.submit(write_bytes, output_file + ".yml", data)
+            else:
+                orcaflexmodel.SaveData(output_file + ".yml")
+            saved.append(output_file + ".yml")
         # Orcaflex simulation
         if IO.save_options["batch simulation"]:
             print(f'\nSaving "{output_file}.sim" file')
-            orcaflexmodel.SaveSimulation(output_file + ".sim")
+            if sim_file is not None:
+                shutil.copyfile(sim_file, output_file + ".sim")
+            elif IO.writer is not None:
+                data = orcaflexmodel.SaveSimulationMem()
+                IO.writer.submit(write_bytes, output_file + ".sim", data)
+            else:
+                orcaflexmodel.SaveSimulation(output_file + ".sim")
+            saved.append(output_file + ".sim")
+
+        return saved
+
+    @staticmethod
+    @Profiler.timed()
+    def export_step_from_batch(file_name, res, formats) -> list:
+        """Export postprocessed results of a batch case
 
+        Args:
+            file_name (str): file name, without extension
+            res (dict): results of the case (see 'Post.results')
+            formats (dict): export formats (see 'Post.formats')
+
+        Returns:
+            list[str]: saved files
+        """
+
+        saved = []
         # Post processing results
         if IO.save_options["results"]:
             result_file = IO.results_dir + file_name
-            # Format to save
-            formats = post.formats
             # If no format was defined, no data is saved
             if not formats:
-                return
+                return saved
 
             print("\n\nExporting results . . .")
 
-            res = post.results
             for sim in ["statics", "dynamics"]:
-                if res[sim].empty:
+                # Formats of the time histories of batch cases
+                if not formats.get("batch") or res[sim].empty:
                     continue
-                aux.export_results(
+                saved += aux.export_results(
                     res[sim],
                     result_file,
                     formats["batch"],
                     "_" + sim,
+                    formats.get("options"),
+                )
+            # Spectra of the case (averages are exported by 'save')
+            for sim in ["spectra", "rao"]:
+                if not formats.get(sim) or res[sim].empty:
+                    continue
+                saved += aux.export_results(
+                    res[sim],
+                    result_file,
+                    formats[sim],
+                    "_" + sim,
+                    formats.get("options"),
                 )
 
             # Modal results -> for each line and whole system
             if formats.get("modal") and res["modal"]:
-                for name, data in res["modal"].items():
-                    aux.export_results(
-                        data, result_file + name, formats["modal"], "_modal"
-                    )
+                saved += IO.export_modal_results(
+                    result_file,
+                    res["modal"],
+                    formats["modal"],
+                    formats.get("options"),
+                )
+
+        return saved
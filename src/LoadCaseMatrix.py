@@ -0,0 +1,341 @@
+"""Design load case (DLC) matrices, e.g.: IEC 61400-3 tables.
+
+A DLC is expanded into the combinations of wind speeds, wind directions,
+sea states (optionally conditional on the wind speed), wave directions
+and seeds. Each case is a wind and a wave definition, as used by
+'OrcaflexModel.set_wind' and 'OrcaflexModel.set_wave'.
+
+Definitions are normalised before comparing cases, so combinations that
+give the same model are run once:
+    - floats are rounded and directions are taken in [0, 360);
+    - null wind speed -> constant wind without direction;
+    - null wave height -> "null" wave (no direction, period or seed);
+    - seeds are only kept where they are used (spectral wind, JONSWAP).
+"""
+
+from collections import namedtuple
+from itertools import product
+import json
+
+import numpy as np
+
+# Case of a DLC matrix: index (run order), names of the DLCs that include
+# it and wind and wave definitions (see 'OrcaflexModel.set_wind' and
+# 'OrcaflexModel.set_wave')
+LoadCase = namedtuple("LoadCase", ["index", "dlcs", "wind", "wave"])
+
+# Still wind (null speed) -> direction has no effect
+still_wind = {"type": "constant", "speed": 0.0, "direction": 0.0}
+# Wave types with random phases defined by the seed
+seeded_waves = ["JONSWAP"]
+
+
+def expand_dlc(dlc: dict, seeds: list) -> list[LoadCase]:
+    """All combinations of a DLC
+
+    Args:
+        dlc (dict): [description]
+        seeds (list): seeds drawn for the batch (used when "seeds" is the
+            number of seeds of the DLC)
+
+    Returns:
+        list[LoadCase]: normalised cases (not deduplicated)
+    """
+
+    name = str(dlc["name"])
+    wind_base = dlc.get("wind", still_wind)
+    wave_base = dlc.get("wave", "null")
+
+    dlc_seeds = dlc.get("seeds")
+    if isinstance(dlc_seeds, int):
+        dlc_seeds = seeds[:dlc_seeds]
+
+    cases = []
+    for speed, wind_dir, seed in product(
+        get_values(dlc.get("wind speed")),
+        get_values(dlc.get("wind direction")),
+        get_values(dlc_seeds),
+    ):
+        wind = normalise_wind(get_wind(wind_base, speed, wind_dir, seed))
+        wave_dirs = dlc.get("wave direction", "aligned")
+        if wave_dirs == "aligned":
+            wave_dirs = [wind_dir]
+
+        for sea_state, wave_dir in product(
+            get_sea_states(dlc, speed), get_values(wave_dirs)
+        ):
+            wave = normalise_wave(
+                get_wave(wave_base, sea_state, wave_dir, seed)
+            )
+            cases.append(LoadCase(None, (name,), wind, wave))
+
+    return cases
+
+
+def get_values(opt) -> list:
+    """Values of a DLC variable ("from", "to" and "step", a list or a
+    single value)
+
+    Args:
+        opt ([type]): None -> value of the base definition
+
+    Returns:
+        list: [description]
+    """
+
+    if opt is None:
+        return [None]
+    if isinstance(opt, dict):
+        opt = np.arange(opt["from"], opt["to"] + opt["step"] / 2, opt["step"])
+    elif not isinstance(opt, list):
+        opt = [opt]
+    # NumPy scalars (ranges) -> Python values (JSON case parameters)
+    return [v.item() if isinstance(v, np.generic) else v for v in opt]
+
+
+def get_sea_states(dlc: dict, speed) -> list[dict]:
+    """Sea states of a wind speed
+
+    Sea states with a "wind speed" are only combined with that wind speed
+    (e.g.: Hs and Tp conditional on the mean wind speed bin), the others
+    with all wind speeds.
+
+    Args:
+        dlc (dict): [description]
+        speed (float): [description]
+
+    Returns:
+        list[dict]: wave data of each sea state (e.g.: {"Hs": 2.0, "Tz": 6.0})
+    """
+
+    sea_states = dlc.get("sea states")
+    if not sea_states:
+        return [dict()]
+
+    matched = [
+        {key: val for key, val in state.items() if key != "wind speed"}
+        for state in sea_states
+        if state.get("wind speed") is None
+        or (speed is not None and np.isclose(state["wind speed"], speed))
+    ]
+    if not matched:
+        raise ValueError(
+            f'DLC {dlc["name"]}: no sea state for wind speed {speed}'
+        )
+    return matched
+
+
+def get_wind(base, speed, direction, seed):
+    if base == "null":
+        base = still_wind
+    wind = dict(base)
+    if speed is not None:
+        # Constant wind -> "speed", spectra -> "mean speed"
+        wind["speed" if wind["type"] == "constant" else "mean speed"] = speed
+    if direction is not None:
+        wind["direction"] = direction
+    if seed is not None:
+        wind["seed"] = seed
+    return wind
+
+
+def get_wave(base, sea_state: dict, direction, seed):
+    if base == "null":
+        return "null"
+    wave = dict(base) | sea_state
+    if direction is not None:
+        wave["direction"] = direction
+    if seed is not None:
+        wave["seed"] = seed
+    return wave
+
+
+def normalise_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        # Round-off of ranges and -0.0 -> same value
+        return round(value, 6) + 0.0
+    if isinstance(value, dict):
+        return {key: normalise_value(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [normalise_value(val) for val in value]
+    return value
+
+
+def normalise_direction(definition: dict) -> None:
+    if definition.get("direction") is not None:
+        definition["direction"] = normalise_value(
+            definition["direction"] % 360.0
+        )
+
+
+def normalise_wind(wind) -> dict:
+    """Wind definition without the data that has no effect
+
+    Args:
+        wind (dict | str): [description]
+
+    Returns:
+        dict: [description]
+    """
+
+    if wind == "null":
+        return dict(still_wind)
+
+    wind = normalise_value(wind)
+    speed = wind.get("speed", wind.get("mean speed"))
+    if speed == 0.0:
+        return dict(still_wind)
+
+    if wind["type"] == "constant":
+        # Only speed and direction are used
+        wind = {key: wind.get(key, val) for key, val in still_wind.items()}
+    normalise_direction(wind)
+    return wind
+
+
+def normalise_wave(wave):
+    """Wave definition without the data that has no effect
+
+    Args:
+        wave (dict | str): [description]
+
+    Returns:
+        dict | str: [description]
+    """
+
+    if wave == "null":
+        return "null"
+
+    wave = normalise_value(wave)
+    height = wave.get("height", wave.get("Hs"))
+    if height == 0.0:
+        return "null"
+
+    if wave["type"] not in seeded_waves:
+        wave.pop("seed", None)
+    normalise_direction(wave)
+    return wave
+
+
+def get_key(case: LoadCase) -> str:
+    return json.dumps([case.wind, case.wave], sort_keys=True)
+
+
+def deduplicate(cases: list[LoadCase]) -> list[LoadCase]:
+    """Unique cases, in order of appearance, with the names of all DLCs
+    that include each one
+
+    Args:
+        cases (list[LoadCase]): [description]
+
+    Returns:
+        list[LoadCase]: [description]
+    """
+
+    unique: dict[str, LoadCase] = dict()
+    for case in cases:
+        key = get_key(case)
+        first = unique.get(key)
+        if first is None:
+            unique[key] = case
+            continue
+        new = tuple(name for name in case.dlcs if name not in first.dlcs)
+        unique[key] = first._replace(dlcs=first.dlcs + new)
+    return list(unique.values())
+
+
+def split_seed(definition):
+    """Definition without the seed, and the seed
+
+    Args:
+        definition (dict | str): wind or wave definition
+
+    Returns:
+        tuple: [description]
+    """
+
+    if not isinstance(definition, dict):
+        return definition, None
+    rest = {key: val for key, val in definition.items() if key != "seed"}
+    return rest, definition.get("seed")
+
+
+def flatten(definition, prefix: str) -> dict:
+    """Scalar items of a definition, e.g.: {"wave Hs": 2.0, "wave
+    frequency min": 0.5}
+
+    Args:
+        definition (dict | str): [description]
+        prefix (str): [description]
+
+    Returns:
+        dict: [description]
+    """
+
+    if not isinstance(definition, dict):
+        return {prefix: definition}
+    flat = dict()
+    for key, val in definition.items():
+        flat |= flatten(val, f"{prefix} {key}")
+    return flat
+
+
+def get_state(case: LoadCase) -> list[dict]:
+    """Model state set by a case, from the most to the least expensive to
+    change: wave (spectrum and components), wind and seeds
+
+    Args:
+        case (LoadCase): [description]
+
+    Returns:
+        list[dict]: [description]
+    """
+
+    wave, wave_seed = split_seed(case.wave)
+    wind, wind_seed = split_seed(case.wind)
+    return [
+        flatten(wave, "wave"),
+        flatten(wind, "wind"),
+        {"wave seed": wave_seed, "wind seed": wind_seed},
+    ]
+
+
+def get_sort_value(value) -> tuple:
+    # Missing < numbers < other values
+    if value is None:
+        return (0, 0.0, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, float(value), "")
+    return (2, 0.0, json.dumps(value))
+
+
+def order_cases(cases: list[LoadCase]) -> list[LoadCase]:
+    """Order cases so that successive ones share the most model state
+
+    Cases are sorted by the wave, then by the wind and then by the seeds,
+    so each wave definition is set once and the wind only changes within
+    the cases of a wave.
+
+    Args:
+        cases (list[LoadCase]): [description]
+
+    Returns:
+        list[LoadCase]: [description]
+    """
+
+    states = [get_state(case) for case in cases]
+    fields = [
+        sorted(set().union(*(state[group] for state in states)))
+        for group in range(len(states[0]) if states else 0)
+    ]
+
+    def sort_key(i: int) -> tuple:
+        return tuple(
+            get_sort_value(states[i][group].get(field))
+            for group, group_fields in enumerate(fields)
+            for field in group_fields
+        )
+
+    return [cases[i] for i in sorted(range(len(cases)), key=sort_key)]
@@ -0,0 +1,257 @@
+from SimulationCache import SimulationCache
+from ParallelModal import run_modal_tasks
+
+import numpy as np
+
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+
+
+class ModalCache:
+    """Modal results of lines (and of the whole system), reused by batch
+    cases that do not change them
+
+    Entries are keyed by a hash of the line definition: the model (input
+    sections and reference Orcaflex file, see 'SimulationCache'), the modal
+    analysis specification and outputs, the data of the line and of its
+    line types (e.g.: stiffness and added mass, which change the modes but
+    not always the statics) and the static state of the line (node
+    positions and effective tensions), which reflects the changes of a
+    case that affect the line (e.g.: platform offset, loads). Entries are
+    kept on disk, with a "dir" (shared by executions and worker processes),
+    or in memory, up to "max entries" (least recently used are dropped).
+    Input example ("Analysis" -> "modal", also used by batch cases, or
+    "modal sweep"):
+
+        "cache": {"dir": "./modal_cache/"}
+
+    or 'true' (in memory only, up to 64 entries).
+    """
+
+    # Static state variables of the lines used in the key
+    state_vars = ["X", "Y", "Z", "Effective tension"]
+
+    def __init__(self, opt) -> None:
+        """[summary]
+
+        Args:
+            opt (dict | bool): "cache" modal option
+        """
+
+        if not isinstance(opt, dict):
+            opt = dict()
+
+        self.dir = opt.get("dir")
+        if self.dir is not None:
+            os.makedirs(self.dir, exist_ok=True)
+        # In memory (without "dir"), in order of use
+        self.entries = OrderedDict()
+        self.max_entries = opt.get("max entries", 64)
+        self.hits = 0
+
+        self.model_hash = SimulationCache.get_model_hash()
+
+    @staticmethod
+    def get_static_state(obj) -> bytes:
+        """Static node positions and tensions of a line (or of all lines of
+        the model, for the whole system)
+
+        Args:
+            obj (orca.OrcaFlexObject | orca.Model): [description]
+
+        Returns:
+            bytes: [description]
+        """
+
+        import OrcFxAPI as orca
+        from Post import Post
+
+        if isinstance(obj, orca.Model):
+            return b"".join(
+                ModalCache.get_static_state(line)
+                for line in obj.objects
+                if line.type == orca.otLine
+            )
+
+        state = Post.get_nodes_time_history(
+            obj,
+            ModalCache.state_vars,
+            orca.pnStaticState,
+            len(obj.NodeArclengths),
+        )
+        # Round-off of the statics solver -> same state
+        return np.round(np.asarray(state, dtype=float), 6).tobytes()
+
+    @staticmethod
+    def get_data(text: str, obj) -> bytes:
+        """Text data of a line and of its line types (or of the whole model,
+        for the whole system)
+
+        Args:
+            text (str): text data of the model (see 'get_model_text')
+            obj (orca.OrcaFlexObject | orca.Model): [description]
+
+        Returns:
+            bytes: [description]
+        """
+
+        import OrcFxAPI as orca
+
+        if isinstance(obj, orca.Model):
+            return text.encode()
+
+        names = {obj.Name} | {
+            str(name) for name in getattr(obj, "LineType", [])
+        }
+        items = ModalCache.get_items(text, names)
+        # Unknown layout of the text data -> whole model
+        return (items or text).encode()
+
+    @staticmethod
+    def get_model_text(model) -> str:
+        """Text data of the model, saved once for all tasks of a case
+
+        Args:
+            model (orca.Model): [description]
+
+        Returns:
+            str: [description]
+        """
+
+        import OrcFxAPI as orca
+
+        return model.SaveDataMem(orca.DataFileType.Text).decode(
+            errors="replace"
+        )
+
+    @staticmethod
+    def get_items(text: str, names: set[str]) -> str:
+        """Items of the text data of a model with the given names, e.g.:
+
+            Lines:
+              - Name: Line1
+                ...
+
+        Args:
+            text (str): text data of the model
+            names (set[str]): [description]
+
+        Returns:
+            str: rows of the items (empty if not found)
+        """
+
+        rows, keep = [], False
+        for row in text.splitlines():
+            # New item or section
+            if row.startswith("  - ") or not row.startswith("  "):
+                name = row[len("  - Name:") :].strip().strip("'\"")
+                keep = row.startswith("  - Name:") and name in names
+            if keep:
+                rows.append(row)
+        return "\n".join(rows)
+
+    def get_key(
+        self, text: str, obj, name: str, spec: dict, outputs: dict
+    ) -> str:
+        """Key of the modal results of an object
+
+        Args:
+            text (str): text data of the model (see 'get_model_text')
+            obj (orca.OrcaFlexObject | orca.Model): line or model (whole
+                system)
+            name (str): e.g.: "Line1"
+            spec (dict): modal analysis specification
+            outputs (dict): modal outputs
+
+        Returns:
+            str: [description]
+        """
+
+        data = hashlib.sha256(ModalCache.get_data(text, obj)).hexdigest()
+        state = hashlib.sha256(ModalCache.get_static_state(obj)).hexdigest()
+        return SimulationCache.hash_data(
+            [self.model_hash, name, spec, outputs, data, state]
+        )
+
+    def run_tasks(
+        self, model, tasks: list, n_workers=1, mode="threads"
+    ) -> list:
+        """Modal results of each task, from the cache or calculated (and
+        stored)
+
+        Args:
+            model (orca.Model): model in the static state
+            tasks (list[ModalTask]): [description]
+            n_workers (int, optional): [description]. Defaults to 1.
+            mode (str, optional): [description]. Defaults to "threads".
+
+        Returns:
+            list[ModalResults]: in the same order of 'tasks'
+        """
+
+        # Model serialized once -> items of each line filtered from it
+        text = ModalCache.get_model_text(model) if tasks else ""
+        keys, results = [], []
+        for task in tasks:
+            obj = model if task.object is None else model[task.object]
+            keys.append(
+                self.get_key(text, obj, task.name, task.spec, task.outputs)
+            )
+            results.append(self.get(keys[-1]))
+
+        missing = [i for i, output in enumerate(results) if output is None]
+        outputs = run_modal_tasks(
+            model, [tasks[i] for i in missing], n_workers, mode
+        )
+        for i, output in zip(missing, outputs):
+            results[i] = output
+            self.store(keys[i], output)
+
+        if len(missing) < len(tasks):
+            loaded = len(tasks) - len(missing)
+            print(f"{loaded} modal result(s) loaded from cache")
+        return results
+
+    def get_file(self, key: str) -> str:
+        return os.path.join(self.dir, key + ".pkl")
+
+    def get(self, key: str):
+        """Cached results
+
+        Args:
+            key (str): [description]
+
+        Returns:
+            ModalResults: None if not cached
+        """
+
+        results = None
+        if self.dir is None:
+            results = self.entries.get(key)
+            if results is not None:
+                self.entries.move_to_end(key)
+        else:
+            file_name = self.get_file(key)
+            if os.path.isfile(file_name):
+                with open(file_name, "rb") as file:
+                    results = pickle.load(file)
+
+        if results is not None:
+            self.hits += 1
+        return results
+
+    def store(self, key: str, results) -> None:
+        if self.dir is None:
+            self.entries[key] = results
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return None
+
+        # Complete files only (read by other processes or executions)
+        file_name = self.get_file(key)
+        tmp_file = f"{file_name}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as file:
+            pickle.dump(results, file)
+        os.replace(tmp_file, file_name)
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+import os
+
+
+class ModalResults:
+    """Modal results of an object, extracted in bulk from 'orca.Modes'
+
+    Periods, masses and stiffnesses are 1D arrays (one value per mode) and
+    the mode shapes are 3D arrays (mode x node x DoF), copied at once from
+    the bulk properties of 'orca.Modes' instead of calling 'modeDetails'
+    for each mode. Shapes may be stored in a memory-mapped file ("memmap")
+    so the results of large models (e.g.: thousands of DoFs and hundreds
+    of modes) are not kept in memory. The wide table (a column per node
+    and DoF) is only created when exporting ('to_frame'). Input example
+    (modal output definitions):
+
+        "modal": {"period": true, "global shape": true, "memmap": "D:/tmp/"}
+
+    where "memmap" may also be 'true' (results directory). The "npz" export
+    format saves the arrays instead of the wide table.
+    """
+
+    # Output option -> attribute of 'orca.Modes'
+    value_attrs = {
+        "period": "period",
+        "mass": "mass",
+        "stiffness": "stiffness",
+    }
+    # Output option -> attribute of 'orca.Modes' and frame (column names)
+    shape_attrs = {
+        "local shape": ("shapeWrtLocal", "Local"),
+        "global shape": ("shapeWrtGlobal", "Global"),
+    }
+
+    def __init__(self, modes, outputs, memmap_file: str = None) -> None:
+        """[summary]
+
+        Args:
+            modes (orca.Modes): [description]
+            outputs (list[str] | dict): requested results, e.g.: ["period",
+                "global shape"] or the modal output definitions
+                ({"period": true, ...})
+            memmap_file (str, optional): base name of the memory-mapped
+                shape files. Defaults to None (in memory).
+        """
+
+        if isinstance(outputs, dict):
+            outputs = [opt for opt, val in outputs.items() if val]
+
+        self.mode_number = np.asarray(modes.modeNumber)
+        self.data = {
+            opt: np.asarray(getattr(modes, attr), dtype=float)
+            for opt, attr in ModalResults.value_attrs.items()
+            if opt in outputs
+        }
+
+        # DoF (column of the shapes) -> node and DoF name. Nodes of the
+        # whole system are labelled with the object (owner) name
+        labels = np.char.add("Node", np.asarray(modes.nodeNumber).astype(str))
+        owners = getattr(modes, "owner", None)
+        if owners is not None and len(owners):
+            names = np.array([owner.Name for owner in owners])
+            if len(set(names)) > 1:
+                labels = np.char.add(np.char.add(names, "_"), labels)
+        self.nodes, node_index = ModalResults.get_index(labels)
+        self.dofs, dof_index = ModalResults.get_index(
+            np.asarray(modes.dofName).astype(str)
+        )
+
+        self.shapes = dict()
+        for opt, (attr, _) in ModalResults.shape_attrs.items():
+            if opt not in outputs:
+                continue
+            self.shapes[opt] = self.get_shape_array(
+                np.asarray(getattr(modes, attr), dtype=float),
+                node_index,
+                dof_index,
+                None if memmap_file is None else f"{memmap_file}_{attr}.npy",
+            )
+
+    def __len__(self) -> int:
+        return len(self.mode_number)
+
+    @staticmethod
+    def get_index(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Unique values, in order of appearance, and index of each value
+
+        Args:
+            values (np.ndarray): [description]
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: [description]
+        """
+
+        unique, first, inverse = np.unique(
+            values, return_index=True, return_inverse=True
+        )
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return unique[order], rank[inverse.ravel()]
+
+    def get_shape_array(
+        self, shape: np.ndarray, node_index, dof_index, file_name: str = None
+    ) -> np.ndarray:
+        """Mode shapes as a 3D array
+
+        Args:
+            shape (np.ndarray): mode x DoF of the model
+            node_index (np.ndarray): node of each DoF
+            dof_index (np.ndarray): DoF name of each DoF
+            file_name (str, optional): memory-mapped file. Defaults to None.
+
+        Returns:
+            np.ndarray: mode x node x DoF (NaN for DoFs not in the model)
+        """
+
+        dims = (len(self.mode_number), len(self.nodes), len(self.dofs))
+        if file_name is None:
+            array = np.empty(dims)
+        else:
+            os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+            array = np.lib.format.open_memmap(file_name, "w+", float, dims)
+
+        if shape.shape[1] == dims[1] * dims[2]:
+            # Every node with all DoFs (e.g.: lines) -> reshape
+            order = np.argsort(node_index * dims[2] + dof_index, kind="stable")
+            array[:] = shape[:, order].reshape(dims)
+        else:
+            array[:] = np.nan
+            array[:, node_index, dof_index] = shape
+        return array
+
+    def to_frame(self) -> pd.DataFrame:
+        """Results with a row per mode and a column per output (and per node
+        and DoF for shapes)
+
+        Returns:
+            pd.DataFrame: [description]
+        """
+
+        blocks = [self.mode_number.reshape(-1, 1)]
+        columns = ["Mode"]
+        for opt, values in self.data.items():
+            blocks.append(values.reshape(-1, 1))
+            columns.append(opt.title())
+
+        for opt, shape in self.shapes.items():
+            frame = ModalResults.shape_attrs[opt][1]
+            blocks.append(shape.reshape(len(self), -1))
+            columns += [
+                f"{node}_{frame}{dof}"
+                for node in self.nodes
+                for dof in self.dofs
+            ]
+
+        return pd.DataFrame(np.hstack(blocks), columns=columns)
+
+    def save(self, file_name: str) -> str:
+        """Save the arrays (compressed NumPy format), without the wide table
+
+        Args:
+            file_name (str): file name, without extension
+
+        Returns:
+            str: saved file
+        """
+
+        full_name = file_name + ".npz"
+        print(f'\nSaving "{full_name}" file . . .')
+        arrays = {
+            "mode": self.mode_number,
+            "nodes": self.nodes,
+            "dofs": self.dofs,
+        }
+        arrays |= {opt: values for opt, values in self.data.items()}
+        arrays |= {
+            opt.replace(" ", "_"): shape for opt, shape in self.shapes.items()
+        }
+        np.savez_compressed(full_name, **arrays)
+        return full_name
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+def get_mac(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Modal assurance criterion between two sets of mode shapes
+
+    Args:
+        a (np.ndarray): modes x DoFs
+        b (np.ndarray): modes x DoFs
+
+    Returns:
+        np.ndarray: MAC matrix (modes of 'a' x modes of 'b')
+    """
+
+    a = np.nan_to_num(np.asarray(a, dtype=float))
+    b = np.nan_to_num(np.asarray(b, dtype=float))
+    cross = np.abs(a @ b.conj().T) ** 2
+    norms = np.outer(
+        np.einsum("ij,ij->i", a, a.conj()).real,
+        np.einsum("ij,ij->i", b, b.conj()).real,
+    )
+    return np.divide(cross, norms, out=np.zeros_like(cross), where=norms > 0.0)
+
+
+def resample_shapes(shapes: np.ndarray, n_points: int) -> np.ndarray:
+    """Mode shapes interpolated at equally spaced positions along the nodes
+    (e.g.: cases with different number of nodes)
+
+    Args:
+        shapes (np.ndarray): mode x node x DoF
+        n_points (int): number of positions
+
+    Returns:
+        np.ndarray: mode x (n_points * DoF), or mode x DoF for a single node
+    """
+
+    n_modes, n_nodes, n_dofs = shapes.shape
+    # Single node -> nothing to interpolate
+    if n_nodes == n_points or n_nodes == 1:
+        return shapes.reshape(n_modes, -1)
+
+    # Linear interpolation of all modes and DoFs at once
+    position = np.linspace(0.0, n_nodes - 1, n_points)
+    lower = np.minimum(position.astype(int), n_nodes - 2)
+    weight = (position - lower)[None, :, None]
+    resampled = (
+        shapes[:, lower] * (1.0 - weight) + shapes[:, lower + 1] * weight
+    )
+    return resampled.reshape(n_modes, -1)
+
+
+def match_modes(mac: np.ndarray, threshold: float) -> list[tuple[int, int]]:
+    """Pairs (row, column) of a MAC matrix with the best correlation (each
+    row and column matched once)
+
+    Args:
+        mac (np.ndarray): [description]
+        threshold (float): minimum MAC of a pair
+
+    Returns:
+        list[tuple[int, int]]: [description]
+    """
+
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        linear_sum_assignment = None
+
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(mac, maximize=True)
+        return [(r, c) for r, c in zip(rows, cols) if mac[r, c] >= threshold]
+
+    # Greedy -> pairs in decreasing order of MAC
+    pairs, used_rows, used_cols = [], set(), set()
+    order = np.argsort(mac, axis=None)[::-1]
+    for r, c in zip(*np.unravel_index(order, mac.shape)):
+        if mac[r, c] < threshold:
+            break
+        if r in used_rows or c in used_cols:
+            continue
+        pairs.append((int(r), int(c)))
+        used_rows.add(r)
+        used_cols.add(c)
+    return pairs
+
+
+class ModeTracker:
+    """Continuous mode curves along a sequence of modal analyses
+
+    The modes of each analysis are matched to the tracks (modes found in
+    the previous analyses) by the MAC of their shapes, so a track follows
+    the same mode when modes cross (e.g.: bending and axial modes of a
+    cable with changing tension). Modes that do not match any track start
+    a new one.
+    """
+
+    def __init__(self, threshold=0.8, n_points=100) -> None:
+        """[summary]
+
+        Args:
+            threshold (float, optional): minimum MAC of a match.
+                Defaults to 0.8.
+            n_points (int, optional): positions used to compare shapes with
+                different number of nodes. Defaults to 100.
+        """
+
+        self.threshold = threshold
+        self.n_points = n_points
+        # Last shape of each track -> tracks x (n_points * DoF)
+        self.shapes: np.ndarray = None
+        # MAC matrix of each analysis (tracks x modes)
+        self.mac: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return 0 if self.shapes is None else len(self.shapes)
+
+    def update(self, shapes: np.ndarray) -> np.ndarray:
+        """Track of each mode of an analysis
+
+        Args:
+            shapes (np.ndarray): mode x node x DoF
+
+        Returns:
+            np.ndarray: track (starting with 1) of each mode
+        """
+
+        shapes = resample_shapes(np.asarray(shapes), self.n_points)
+        tracks = np.zeros(len(shapes), dtype=int)
+
+        if self.shapes is None:
+            self.shapes = np.empty((0, shapes.shape[1]))
+        elif self.shapes.shape[1] != shapes.shape[1]:
+            raise ValueError(
+                "Mode shapes with different DoFs can not be tracked"
+            )
+
+        if len(self.shapes):
+            mac = get_mac(self.shapes, shapes)
+            self.mac.append(mac)
+            for track, mode in match_modes(mac, self.threshold):
+                tracks[mode] = track + 1
+                self.shapes[track] = shapes[mode]
+
+        # Unmatched modes -> new tracks
+        new = np.flatnonzero(tracks == 0)
+        tracks[new] = len(self.shapes) + 1 + np.arange(len(new))
+        self.shapes = np.vstack([self.shapes, shapes[new]])
+        return tracks
@@ -0,0 +1,275 @@
+from IO import IO
+from SimulationCache import SimulationCache
+
+import json
+import os
+
+
+class ModelTemplate:
+    """Generated model reused by runs with a similar input
+
+    The first run generates the model (see 'OrcaflexModel.generate_model')
+    and saves it as binary data, with the input sections used to generate
+    it. The next runs (e.g.: a parameter swept across input files) load
+    that data and apply only the items of the input that changed: the
+    generators get the existing objects by name and set the properties of
+    changed items only. Input example:
+
+        "Model template": {"dir": "./templates/", "name": "FOWTC"}
+
+    or 'true' for the default options (name "base").
+    """
+
+    # Input sections of the generated objects
+    sections = [
+        "Environment",
+        "Platforms",
+        "Line types",
+        "Lines",
+        "Keypoints",
+        "Segment Set",
+        "Towers",
+        "Tower sections",
+        "Turbines",
+    ]
+
+    def __init__(self, opt) -> None:
+        """[summary]
+
+        Args:
+            opt (dict | bool): "Model template" input. If 'true', the
+                default options are used
+        """
+
+        if not isinstance(opt, dict):
+            opt = dict()
+
+        self.dir = opt.get("dir", IO.output_dir + "templates/")
+        self.name = opt.get("name", "base")
+
+        # Section -> changed keys (None -> all changed / not loaded)
+        self.changes: dict[str, set] = None
+        self.generation_time = 0.0
+        # Objects of the template (name -> object) and objects generated
+        # from each section (section -> key -> name)
+        self.objects: dict = dict()
+        self.names: dict[str, dict[str, str]] = dict()
+        self.loaded_names: dict[str, dict[str, str]] = dict()
+        # Input used to generate the model (e.g.: with farm objects)
+        self.input: dict = dict()
+
+    def get_files(self) -> tuple[str, str]:
+        base = os.path.join(self.dir, self.name)
+        return base + ".dat", base + ".json"
+
+    @staticmethod
+    def get_input(data: dict) -> dict:
+        return {
+            sec: data[sec] for sec in ModelTemplate.sections if sec in data
+        }
+
+    @staticmethod
+    def get_base() -> str:
+        """Hash of the model before generating objects (loaded data file)
+
+        Returns:
+            str: [description]
+        """
+
+        inp = IO.input_data.get("File IO", dict()).get("input", dict())
+        if IO.actions.get("load data") and inp.get("Orcaflex data"):
+            return SimulationCache.hash_file(
+                inp.get("dir", "./") + inp["Orcaflex data"]
+            )
+        return SimulationCache.hash_data(None)
+
+    def load(self, model, data: dict) -> bool:
+        """Load the template (if valid) and find the changes of the input
+
+        Args:
+            model (orca.Model): [description]
+            data (dict): input sections of the model
+
+        Returns:
+            bool: if the template was loaded
+        """
+
+        self.input = ModelTemplate.get_input(data)
+        data_file, meta_file = self.get_files()
+        if not (os.path.isfile(data_file) and os.path.isfile(meta_file)):
+            return False
+        with open(meta_file, "r") as file:
+            meta = json.load(file)
+        if meta["base"] != ModelTemplate.get_base():
+            print(f'\nModel template "{self.name}" has a different base model')
+            return False
+
+        with open(data_file, "rb") as file:
+            model.LoadDataMem(file.read())
+        self.objects = {obj.Name: obj for obj in model.objects}
+        self.loaded_names = meta["objects"]
+        self.generation_time = meta["generation time"]
+        self.changes = ModelTemplate.get_changes(meta["input"], self.input)
+
+        # Objects of items removed from the input (or renamed)
+        for section in self.changes:
+            names = self.get_input_names(section)
+            for name in self.loaded_names.get(section, dict()).values():
+                if name in self.objects and name not in names:
+                    model.DestroyObject(self.objects.pop(name))
+        return True
+
+    @staticmethod
+    def get_changes(old: dict, new: dict) -> dict[str, set]:
+        """Changed items of each section (list index, starting with '1', or
+        dict key, as strings)
+
+        Args:
+            old (dict): input sections of the template
+            new (dict): current input sections
+
+        Returns:
+            dict[str, set]: section -> changed keys
+        """
+
+        changes = dict()
+        for section in ModelTemplate.sections:
+            a, b = old.get(section), new.get(section)
+            if a == b:
+                continue
+            if isinstance(a, list) and isinstance(b, list):
+                keys = {
+                    str(i + 1)
+                    for i in range(max(len(a), len(b)))
+                    if i >= len(a) or i >= len(b) or a[i] != b[i]
+                }
+            elif isinstance(a, dict) and isinstance(b, dict):
+                keys = {
+                    str(k) for k in a.keys() | b.keys() if a.get(k) != b.get(k)
+                }
+            else:
+                keys = {"all"}
+            changes[section] = keys
+
+        # Lines and towers depend on end points, segments and sections
+        if changes.get("Keypoints") or changes.get("Segment Set"):
+            changes["Lines"] = {"all"}
+        if changes.get("Platforms"):
+            for section in ["Lines", "Towers", "Turbines"]:
+                changes.setdefault(section, set()).add("all")
+        if changes.get("Tower sections"):
+            changes["Towers"] = {"all"}
+        # Constant current profile depends on the water depth
+        if "water depth" in changes.get("Environment", set()):
+            changes["Environment"].add("sea current")
+        return changes
+
+    def get_input_names(self, section: str) -> set[str]:
+        """Names of the objects of the items of a section of the input
+
+        Args:
+            section (str): e.g.: "Lines"
+
+        Returns:
+            set[str]: item names (dict keys) or, for unnamed items, names
+                given when the template was generated (see 'get_object')
+        """
+
+        items = self.input.get(section)
+        if isinstance(items, dict):
+            return {str(key) for key in items}
+        if not isinstance(items, list):
+            return set()
+
+        loaded = self.loaded_names.get(section, dict())
+        names = set()
+        for i, item in enumerate(items, 1):
+            name = item.get("name") if isinstance(item, dict) else None
+            names.add(name or loaded.get(str(i)))
+        return names
+
+    def is_changed(self, section: str, key=None) -> bool:
+        """If an item (or any item, if 'key' is None) must be (re)applied
+
+        Args:
+            section (str): e.g.: "Lines"
+            key (optional): list index (starting with 1) or dict key.
+                Defaults to None.
+
+        Returns:
+            bool: [description]
+        """
+
+        if self.changes is None:
+            return True
+        keys = self.changes.get(section, set())
+        if key is None:
+            return bool(keys)
+        return "all" in keys or str(key) in keys
+
+    def get_object(
+        self, model, obj_type, section: str, key, name: str = None, source=None
+    ):
+        """Object of an item: from the template, if it exists, or created
+
+        Args:
+            model (orca.Model): [description]
+            obj_type (int): Orcaflex object type (e.g.: orca.otLine)
+            section (str): e.g.: "Lines"
+            key (int | str): list index (starting with 1) or dict key
+            name (str, optional): [description]. Defaults to None.
+            source (orca.OrcaFlexObject, optional): object to be cloned.
+                Defaults to None.
+
+        Returns:
+            orca.OrcaFlexObject: [description]
+        """
+
+        key = str(key)
+        # Unnamed items -> name given when the template was generated
+        name = name or self.loaded_names.get(section, dict()).get(key)
+        obj = self.objects.get(name)
+        if obj is None and source is not None:
+            obj = source.CreateClone(name)
+        elif obj is None:
+            obj = model.CreateObject(obj_type, name)
+
+        self.names.setdefault(section, dict())[key] = obj.Name
+        return obj
+
+    def save(self, model, generation_time: float) -> None:
+        """Save the generated model as a template
+
+        Args:
+            model (orca.Model): [description]
+            generation_time (float): time to generate the model (s)
+        """
+
+        os.makedirs(self.dir, exist_ok=True)
+        data_file, meta_file = self.get_files()
+        with open(data_file, "wb") as file:
+            file.write(model.SaveDataMem())
+        meta = {
+            "base": ModelTemplate.get_base(),
+            "input": self.input,
+            "objects": self.names,
+            "generation time": generation_time,
+        }
+        with open(meta_file, "w") as file:
+            json.dump(meta, file, indent=4)
+        print(f'\nModel template saved: "{data_file}"')
+
+    def report(self, elapsed: float) -> None:
+        """Print the time saved by the template
+
+        Args:
+            elapsed (float): time to load the template and apply changes (s)
+        """
+
+        n_changes = sum(len(keys) for keys in self.changes.values())
+        print(
+            f'\nModel template "{self.name}": {n_changes} changed item(s)'
+            f" applied in {elapsed:.3f} s (full generation:"
+            f" {self.generation_time:.3f} s,"
+            f" saved {self.generation_time - elapsed:.3f} s)"
+        )
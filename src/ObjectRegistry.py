@@ -0,0 +1,300 @@
+import OrcFxAPI as orca
+
+from collections.abc import Mapping
+from itertools import count
+import re
+
+
+class ObjectRegistry(Mapping):
+    """Index of the Orcaflex objects of a model
+
+    Objects are classified once, when registered, and indexed by type
+    (e.g.: registry["lines"][1], as the former 'orca_refs' dict), by name
+    and by user tags. IDs are kept by name: after reloading a file (see
+    'rebuild'), an object with the same name has the same ID, regardless
+    of the order of the objects in the model. New names take the lowest
+    free IDs of their type.
+
+    Tags are given in the definitions of generated objects (e.g.:
+    {"name": "Line1", "tags": ["mooring"], ...}) or by regular
+    expressions of names, for objects of loaded files:
+
+        "Object tags": {
+            "mooring": "^Line",
+            "shared": ["Line1[0-9]", "Line2[0-9]"]
+        }
+    """
+
+    categories = [
+        "lines",
+        "line_types",
+        "line_diameter_types",
+        "vessels",
+        "vessel_types",
+        "buoys",
+        "constraints",
+        "morison",
+        "towers",
+        "tower_sections",
+        "turbines",
+        "external_functions",
+    ]
+
+    def __init__(self, environment=None) -> None:
+        """[summary]
+
+        Args:
+            environment (orca.OrcaFlexObject, optional): environment of the
+                model (registry["environment"]). Defaults to None.
+        """
+
+        self.environment = environment
+
+        # Type -> ID -> object
+        self.objects: dict[str, dict] = {
+            cat: dict() for cat in self.categories
+        }
+        # Name -> object, name -> (type, ID) and (type, ID) -> name
+        self.names: dict[str, object] = dict()
+        self.locations: dict[str, tuple[str, int]] = dict()
+        self.slots: dict[tuple[str, int], str] = dict()
+        # Type -> name -> ID and name -> type (kept for the objects still in
+        # the model when the registry is rebuilt, e.g. for generated objects
+        # not found by 'classify')
+        self.ids: dict[str, dict[str, int]] = {
+            cat: dict() for cat in self.categories
+        }
+        self.known: dict[str, str] = dict()
+
+        # Tag -> names (ordered) and tag -> regular expressions of names
+        self.tagged: dict[str, dict[str, None]] = dict()
+        self.tag_patterns: dict[str, list[re.Pattern]] = dict()
+        # Results of 'find' (cleared when an object is registered)
+        self.search_cache: dict[tuple, list] = dict()
+
+    def __getitem__(self, category: str):
+        if category == "environment":
+            return self.environment
+        return self.objects[category]
+
+    def __iter__(self):
+        yield from self.categories
+        yield "environment"
+
+    def __len__(self) -> int:
+        return len(self.categories) + 1
+
+    @staticmethod
+    def classify(obj) -> str:
+        """Type of an object, as indexed in the registry
+
+        Args:
+            obj (orca.OrcaFlexObject): [description]
+
+        Returns:
+            str: e.g.: "lines", None if the type is not indexed
+        """
+
+        obj_type = obj.type
+        if obj_type == orca.otLine:
+            return "towers" if "tower" in obj.Name.lower() else "lines"
+        if obj_type == orca.otLineType:
+            return (
+                "tower_sections"
+                if "tower" in obj.Name.lower()
+                else "line_types"
+            )
+        if obj_type == orca.otTurbine:
+            return "turbines"
+        if obj_type == orca.otVessel or (
+            obj_type == orca.otConstraint and "platform" in obj.Name.lower()
+        ):
+            return "vessels"
+        if obj_type == orca.otVesselType:
+            return "vessel_types"
+        return None
+
+    def register(
+        self, obj, category: str = None, obj_id: int = None, tags=None
+    ):
+        """Add (or replace) an object
+
+        Args:
+            obj (orca.OrcaFlexObject): [description]
+            category (str, optional): type of the object. Defaults to None
+                (previous type of the name or 'classify').
+            obj_id (int, optional): ID of the object. Defaults to None (the
+                previous ID of the name or the next free ID of the type).
+            tags (list[str], optional): user tags. Defaults to None.
+
+        Returns:
+            int: ID of the object, None if its type is not indexed
+        """
+
+        name = obj.Name
+        category = (
+            category or self.known.get(name) or ObjectRegistry.classify(obj)
+        )
+        if category is None:
+            return None
+
+        ids = self.ids[category]
+        if obj_id is None:
+            obj_id = ids.get(name)
+        if obj_id is None:
+            used = set(ids.values())
+            obj_id = next(i for i in count(1) if i not in used)
+
+        # Replaced object (same ID, other name) -> removed from the registry
+        replaced = self.slots.pop((category, obj_id), None)
+        if replaced is not None and replaced != name:
+            self.forget(replaced)
+        # Object with a new ID or type (same name)
+        if name in self.locations:
+            slot = self.locations.pop(name)
+            self.objects[slot[0]].pop(slot[1], None)
+            self.slots.pop(slot, None)
+            if slot[0] != category:
+                self.ids[slot[0]].pop(name, None)
+
+        self.objects[category][obj_id] = obj
+        self.names[name] = obj
+        self.locations[name] = (category, obj_id)
+        self.slots[(category, obj_id)] = name
+        ids[name] = obj_id
+        self.known[name] = category
+
+        for tag in tags or []:
+            self.tagged.setdefault(tag, dict())[name] = None
+        for tag, patterns in self.tag_patterns.items():
+            if any(pattern.search(name) for pattern in patterns):
+                self.tagged.setdefault(tag, dict())[name] = None
+
+        self.search_cache.clear()
+        return obj_id
+
+    def forget(self, name: str) -> None:
+        """Remove an object name (ID, type and tags)
+
+        Args:
+            name (str): [description]
+        """
+
+        slot = self.locations.pop(name, None)
+        if slot is not None:
+            self.objects[slot[0]].pop(slot[1], None)
+            self.slots.pop(slot, None)
+        self.names.pop(name, None)
+        category = self.known.pop(name, None)
+        if category is not None:
+            self.ids[category].pop(name, None)
+        for names in self.tagged.values():
+            names.pop(name, None)
+
+    def rebuild(self, objects, environment=None) -> None:
+        """Index all objects of a model (e.g.: after loading a file)
+
+        Args:
+            objects (list[orca.OrcaFlexObject]): objects of the model
+            environment (orca.OrcaFlexObject, optional): [description].
+                Defaults to None (the current environment).
+        """
+
+        if environment is not None:
+            self.environment = environment
+
+        # Names not in the model anymore -> their IDs are free
+        current = {obj.Name for obj in objects}
+        for name in [name for name in self.known if name not in current]:
+            self.forget(name)
+
+        for category in self.categories:
+            self.objects[category].clear()
+        self.names.clear()
+        self.locations.clear()
+        self.slots.clear()
+        self.search_cache.clear()
+
+        for obj in objects:
+            self.register(obj)
+
+    def set_tag_patterns(self, tags: dict) -> None:
+        """Tag the objects with names matching regular expressions
+
+        Args:
+            tags (dict): tag -> regular expression(s) (see 'Object tags')
+        """
+
+        for tag, patterns in tags.items():
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            self.tag_patterns[tag] = [re.compile(p) for p in patterns]
+
+            names = self.tagged.setdefault(tag, dict())
+            for name in self.names:
+                if any(
+                    pattern.search(name) for pattern in self.tag_patterns[tag]
+                ):
+                    names[name] = None
+
+    def get_object(self, name: str):
+        """Object by name
+
+        Args:
+            name (str): [description]
+
+        Returns:
+            orca.OrcaFlexObject: None if not registered
+        """
+
+        return self.names.get(name)
+
+    def get_id(self, name: str) -> tuple[str, int]:
+        """Type and ID of an object
+
+        Args:
+            name (str): [description]
+
+        Returns:
+            tuple[str, int]: e.g.: ("lines", 1), None if not registered
+        """
+
+        return self.locations.get(name)
+
+    def get_tagged(self, tag: str) -> list:
+        """Objects with a tag
+
+        Args:
+            tag (str): [description]
+
+        Returns:
+            list[orca.OrcaFlexObject]: [description]
+        """
+
+        return [
+            self.names[name]
+            for name in self.tagged.get(tag, [])
+            if name in self.names
+        ]
+
+    def find(self, pattern: str, category: str = None) -> list:
+        """Objects with names matching a regular expression
+
+        Args:
+            pattern (str): [description]
+            category (str, optional): type of the objects. Defaults to None.
+
+        Returns:
+            list[orca.OrcaFlexObject]: [description]
+        """
+
+        key = (pattern, category)
+        if key not in self.search_cache:
+            regex = re.compile(pattern)
+            self.search_cache[key] = [
+                obj
+                for name, obj in self.names.items()
+                if regex.search(name)
+                and (category is None or self.locations[name][0] == category)
+            ]
+        return self.search_cache[key]
@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+
+
+class OnlineStatistics:
+    """Single-pass statistics of result channels (columns)
+
+    Each update receives a block of samples (samples x channels); its
+    moments are computed with vectorized operations and merged with the
+    accumulated ones (pairwise formulas of Pebay, 2008), so the samples
+    do not need to be kept. A channel may be updated with several blocks
+    (e.g.: parts of a simulation, or seeds of the same case).
+
+    Percentiles are exact for channels updated with a single block (e.g.:
+    whole time histories); for more blocks they are the count weighted
+    average of the percentiles of each block (an approximation).
+    """
+
+    # Rows of the accumulated state (one column per channel)
+    fields = ["count", "mean", "M2", "M3", "M4", "min", "max"]
+
+    def __init__(self, percentiles=(5, 50, 95), n_channels: int = 0) -> None:
+        """[summary]
+
+        Args:
+            percentiles (list[float], optional): in [0, 100].
+                Defaults to (5, 50, 95).
+            n_channels (int, optional): expected number of channels.
+                Defaults to 0.
+        """
+
+        self.percentiles = np.asarray(percentiles, dtype=float)
+        n_fields = len(self.fields) + len(self.percentiles)
+
+        self.capacity = max(n_channels, 1)
+        self.state = np.zeros((n_fields, self.capacity))
+        self.channels: list[str] = []
+        self.index: dict[str, int] = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def reserve(self, n_channels: int) -> None:
+        required = len(self.channels) + n_channels
+        if required <= self.capacity:
+            return None
+
+        # Grow geometrically (channels are usually added one block at a time)
+        self.capacity = max(required, 2 * self.capacity)
+        state = np.zeros((self.state.shape[0], self.capacity))
+        state[:, : len(self.channels)] = self.state[:, : len(self.channels)]
+        self.state = state
+
+    @staticmethod
+    def get_block_state(
+        block: np.ndarray, percentiles: np.ndarray
+    ) -> np.ndarray:
+        """Moments, extremes and percentiles of a block
+
+        Args:
+            block (np.ndarray): samples x channels
+            percentiles (np.ndarray): [description]
+
+        Returns:
+            np.ndarray: rows as in 'fields' + percentiles
+        """
+
+        n = block.shape[0]
+        mean = block.mean(axis=0)
+        dev = block - mean
+        dev2 = dev * dev
+
+        state = [
+            np.full(block.shape[1], float(n)),
+            mean,
+            dev2.sum(axis=0),
+            (dev2 * dev).sum(axis=0),
+            (dev2 * dev2).sum(axis=0),
+            block.min(axis=0),
+            block.max(axis=0),
+        ]
+        if len(percentiles):
+            state.extend(np.percentile(block, percentiles, axis=0))
+
+        return np.vstack(state)
+
+    @staticmethod
+    def merge_states(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Merge accumulated states (same channels)
+
+        Args:
+            a (np.ndarray): [description]
+            b (np.ndarray): [description]
+
+        Returns:
+            np.ndarray: [description]
+        """
+
+        na, mean_a, m2a, m3a, m4a = a[:5]
+        nb, mean_b, m2b, m3b, m4b = b[:5]
+        n = na + nb
+        delta = mean_b - mean_a
+        delta_n = delta / n
+
+        merged = np.empty_like(a)
+        merged[0] = n
+        merged[1] = mean_a + nb * delta_n
+        merged[2] = m2a + m2b + delta * delta_n * na * nb
+        merged[3] = (
+            m3a
+            + m3b
+            + delta * delta_n**2 * na * nb * (na - nb)
+            + 3.0 * delta_n * (na * m2b - nb * m2a)
+        )
+        merged[4] = (
+            m4a
+            + m4b
+            + delta * delta_n**3 * na * nb * (na * na - na * nb + nb * nb)
+            + 6.0 * delta_n**2 * (na * na * m2b + nb * nb * m2a)
+            + 4.0 * delta_n * (na * m3b - nb * m3a)
+        )
+        merged[5] = np.minimum(a[5], b[5])
+        merged[6] = np.maximum(a[6], b[6])
+        # Percentiles -> count weighted average
+        merged[7:] = (na * a[7:] + nb * b[7:]) / n
+
+        return merged
+
+    def update(self, names: list[str], block) -> None:
+        """Add samples of a set of channels
+
+        Args:
+            names (list[str]): channel names
+            block (array_like): 2D array (samples x len(names))
+        """
+
+        block = np.asarray(block, dtype=float).reshape(-1, len(names))
+        if block.shape[0] == 0:
+            return None
+        self.merge(names, self.get_block_state(block, self.percentiles))
+
+    def merge(self, names: list[str], state: np.ndarray) -> None:
+        """Merge accumulated states of a set of channels
+
+        Args:
+            names (list[str]): channel names
+            state (np.ndarray): rows as in 'fields' + percentiles
+        """
+
+        new_names = [name for name in names if name not in self.index]
+        self.reserve(len(new_names))
+        for name in new_names:
+            self.index[name] = len(self.channels)
+            self.channels.append(name)
+
+        cols = np.array([self.index[name] for name in names])
+        # Channels without samples are set, the others are merged
+        empty = self.state[0, cols] == 0
+        if empty.any():
+            self.state[:, cols[empty]] = state[:, empty]
+        if not empty.all():
+            cur = cols[~empty]
+            self.state[:, cur] = self.merge_states(
+                self.state[:, cur], state[:, ~empty]
+            )
+
+    def combine(self, other) -> None:
+        """Merge the statistics of another accumulator (same percentiles)
+
+        Args:
+            other (OnlineStatistics): [description]
+        """
+
+        n = len(other.channels)
+        self.merge(other.channels, other.state[:, :n])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Statistics (rows) of each channel (columns)
+
+        Returns:
+            pd.DataFrame: mean, std, min, max, skewness, kurtosis (excess)
+                and percentiles (e.g.: "p95")
+        """
+
+        n_channels = len(self.channels)
+        count, mean, m2, m3, m4, min_, max_ = self.state[:7, :n_channels]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(m2 / (count - 1))
+            skewness = np.sqrt(count) * m3 / m2**1.5
+            kurtosis = count * m4 / (m2 * m2) - 3.0
+
+        stats = {
+            "mean": mean,
+            "std": std,
+            "min": min_,
+            "max": max_,
+            "skewness": skewness,
+            "kurtosis": kurtosis,
+        }
+        for q, values in zip(self.percentiles, self.state[7:, :n_channels]):
+            stats[f"p{q:g}"] = values
+
+        return pd.DataFrame.from_dict(
+            stats, orient="index", columns=self.channels
+        )
+
+    def to_row(self) -> dict[str, float]:
+        """Statistics as a flat row (e.g.: "Platform1_X_mean")
+
+        Returns:
+            dict[str, float]: [description]
+        """
+
+        frame = self.to_frame()
+        return {
+            f"{channel}_{stat}": float(value)
+            for channel, column in frame.items()
+            for stat, value in column.items()
+        }
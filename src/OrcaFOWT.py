@@ -2,28 +2,70 @@ from OrcaflexModel import OrcaflexModel
 from IO import IO
 from Post import Post
 from BatchSimulations import set_and_run_batch
+from PostOnly import run_post_only
+from Profiler import Profiler
 
 import matplotlib.pyplot as plt
 from datetime import datetime
+import argparse
 
 # Global variables
 orca_model: OrcaflexModel
 post = Post()
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OrcaFlex FOWT simulations")
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="FOWTC-EvalThrust",
+        help="input file name, without extension",
+    )
+    parser.add_argument(
+        "--input-dir", default="inputs/", help="input directory"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip batch cases finished in a previous execution",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="save wall/CPU time and peak memory of each phase",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     t0 = datetime.now()  # Start counting time
 
-    IO.read_input("FOWTC-EvalThrust", "inputs/")
+    args = parse_args(argv)
+    IO.read_input(args.input, args.input_dir)
+    IO.resume = args.resume
+    Profiler.set_options(
+        IO.input_data.get("Profiling"),
+        args.profile,
+        IO.results_dir + IO.name_no_extension + "_",
+    )
 
-    # Reference model
-    orca_model = OrcaflexModel(post)
+    if IO.actions.get("post only"):
+        # Postprocess existing simulation files (no reference model)
+        with Profiler.phase("post only"):
+            run_post_only(post)
+    else:
+        # Reference model
+        with Profiler.phase("reference model"):
+            orca_model = OrcaflexModel(post)
 
-    # Run batch simulations (if defined) from the reference model
-    if IO.actions.get("batch simulations"):
-        set_and_run_batch(orca_model, post)
+        # Run batch simulations (if defined) from the reference model
+        if IO.actions.get("batch simulations"):
+            with Profiler.phase("batch simulations"):
+                set_and_run_batch(orca_model, post)
 
-    IO.save(orca_model, post)
+        IO.save(orca_model, post)
+    Profiler.write_report()
 
     print(f"\n\nElapsed time: {datetime.now() - t0} \n\nEnd execution!")
 
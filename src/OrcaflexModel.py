@@ -1,8 +1,14 @@
 from collections import namedtuple
+import time
 import OrcFxAPI as orca
 from Analysis import Analysis
 import AuxFunctions as aux
 from IO import IO
+from ModelTemplate import ModelTemplate
+from ObjectRegistry import ObjectRegistry
+from FarmLayout import FarmLayout
+from PropertyTable import PropertyWriter
+from Profiler import Profiler
 
 
 class OrcaflexModel:
@@ -14,24 +20,15 @@ class OrcaflexModel:
 
         self.model = orca.Model()
         self.analysis: Analysis
+        self.template: ModelTemplate = None
+        self.properties = PropertyWriter()
 
         orca.SetLibraryPolicy("EnableBooleanDataType")
 
-        # References to Orcaflex objects
-        self.orca_refs: dict = {
-            "lines": dict(),
-            "line_types": dict(),
-            "line_diameter_types": dict(),
-            "vessels": dict(),
-            "vessel_types": dict(),
-            "buoys": dict(),
-            "constraints": dict(),
-            "morison": dict(),
-            "towers": dict(),
-            "tower_sections": dict(),
-            "turbines": dict(),
-            "external_functions": dict(),
-        }
+        # References to Orcaflex objects (by type and ID, name or tag)
+        self.orca_refs = ObjectRegistry(self.model.environment)
+        if IO.input_data.get("Object tags"):
+            self.orca_refs.set_tag_patterns(IO.input_data["Object tags"])
 
         post.set_options(IO.input_data["PostProcessing"])
 
@@ -43,7 +40,8 @@ class OrcaflexModel:
             input_file_name = inp.get("dir", "./") + inp["Orcaflex data"]
 
             print(f'\nLoading data file: "{input_file_name}". . .')
-            self.model.LoadData(input_file_name)
+            with Profiler.phase("load data"):
+                self.model.LoadData(input_file_name)
             # Organize objects references in the dict 'orca_refs'
             self.set_orcaflex_objects_ref()
 
@@ -51,7 +49,8 @@ class OrcaflexModel:
             print("\nLoading simulation . . .")
             sim = IO.input_data["File IO"]["input"]
             sim_name = sim.get("dir", "./") + sim["Orcaflex simulation"]
-            self.model.LoadSimulation(sim_name)
+            with Profiler.phase("load simulation"):
+                self.model.LoadSimulation(sim_name)
             # Organize objects references in the dict 'orca_refs'
             self.set_orcaflex_objects_ref()
 
@@ -82,15 +81,53 @@ class OrcaflexModel:
             if IO.actions["plot results"]:
                 post.plot.plot_simulation_results(post)
 
+    def reload_simulation(self, sim_name: str) -> None:
+        """Load a simulation file in the current model and update references
+
+        Args:
+            sim_name (str): [description]
+        """
+
+        print(f'\nLoading simulation "{sim_name}" . . .')
+        with Profiler.phase("load simulation"):
+            self.model.LoadSimulation(sim_name)
+        # Previous references are invalid after loading a file
+        self.set_orcaflex_objects_ref()
+
+    @Profiler.timed()
     def generate_model(self) -> None:
 
         data = IO.input_data
-        if data.get("Environment"):
-            self.set_environment(data["Environment"])
+        t0 = time.perf_counter()
+
+        # Farm layout -> platforms, lines, towers and turbines of the farm
+        if data.get("Farm"):
+            data = data | FarmLayout(data["Farm"]).get_sections(data)
+
+        # Base model generated in a previous run (only changes are applied)
+        self.template = None
+        if data.get("Model template") and not IO.actions["load simulation"]:
+            self.template = ModelTemplate(data["Model template"])
+            if self.template.load(self.model, data):
+                self.set_orcaflex_objects_ref()
+
+        if data.get("Environment") and self.is_changed("Environment"):
+            self.set_environment(
+                {
+                    key: value
+                    for key, value in data["Environment"].items()
+                    if key == "water depth"
+                    or self.is_changed("Environment", key)
+                }
+            )
 
         if data.get("Platforms"):
             self.generate_platforms(data["Platforms"])
 
+        # Before towers (nacelle connection)
+        if data.get("Turbines"):
+            self.generate_turbines(data["Turbines"])
+
         if data.get("Line types"):
             self.generate_line_types(data["Line types"])
 
@@ -107,6 +144,13 @@ class OrcaflexModel:
                 data.get("Tower sections", None),
             )
 
+        if self.template is not None:
+            elapsed = time.perf_counter() - t0
+            if self.template.changes is None:
+                self.template.save(self.model, elapsed)
+            else:
+                self.template.report(elapsed)
+
     # Functions to set/edit Orcaflex Environment objects
 
     def set_environment(self, env_data: dict) -> None:
@@ -458,46 +502,65 @@ class OrcaflexModel:
 
     # Functions to generate Orcaflex objects
 
+    def get_object(
+        self, obj_type, section: str, key, name: str = None, source=None
+    ):
+        """Object of an input item: created or from the model template
+
+        Args:
+            obj_type (int): Orcaflex object type (e.g.: orca.otLine)
+            section (str): input section (e.g.: "Lines")
+            key (int | str): list index (starting with 1) or dict key
+            name (str, optional): [description]. Defaults to None.
+            source (orca.OrcaFlexObject, optional): object to be cloned.
+                Defaults to None.
+
+        Returns:
+            orca.OrcaFlexObject: [description]
+        """
+
+        if self.template is not None:
+            return self.template.get_object(
+                self.model, obj_type, section, key, name, source
+            )
+        if source is not None:
+            return source.CreateClone(name)
+        return self.model.CreateObject(obj_type, name)
+
+    def is_changed(self, section: str, key=None) -> bool:
+        # Without template, all items are applied
+        return self.template is None or self.template.is_changed(section, key)
+
     def generate_platforms(self, constraints: list) -> None:
         cont = 1
         # Generating constraints (without platform)
         for it in constraints:
-            constraint = self.model.CreateObject(orca.otConstraint)
-            constraint.Name = it["name"]
-
-            # Initial configuration
-            constraint.InitialX, constraint.InitialY, constraint.InitialZ = it[
-                "position"
-            ]
-            (
-                constraint.InitialAzimuth,
-                constraint.InitialDeclination,
-                constraint.InitialGamma,
-            ) = it["angles"]
-
-            # Parameters
-            constraint.Connection = "Fixed"
-            cons_type = it["constraint type"]
-            if cons_type["imposed motion"]:
-                constraint.ConstraintType = "Imposed motion"
-                constraint.TimeHistoryDataSource = "External"
-                constraint.TimeHistoryFileName = cons_type["file name"]
-                # it['constraint type']['file name']
-                # './database/' + it['constraint type']['file name']
-                constraint.TimeHistoryInterpolation = cons_type.get(
-                    "interpolation", "Cubic spline"
-                )
-            # else:
-            # constraint.ConstraintType = 'Calculated DOFs'
-            # free_dofs = it['constraint type'].get('free dofs', None)
-            # if free_dofs and len(free_dofs) > 0:
-            # for dof in free_dofs:
-            # constraint.DOFFree[dof] = True
-            # constraint.DOFInitialValue[dof] = it['constraint type'].get(
-            # )
+            constraint = self.get_object(
+                orca.otConstraint, "Platforms", cont, it["name"]
+            )
+            if self.is_changed("Platforms", cont):
+                self.properties.write(constraint, "platforms", it)
 
             # Save reference to current constraint
-            self.orca_refs["vessels"][cont] = constraint
+            self.orca_refs.register(
+                constraint, "vessels", cont, it.get("tags")
+            )
+            cont += 1
+
+    def generate_turbines(self, turbines: list) -> None:
+        cont = 1
+        for it in turbines:
+            # Copy of a turbine of the model (e.g.: loaded data) or new
+            source = self.model[it["clone"]] if it.get("clone") else None
+            turbine = self.get_object(
+                orca.otTurbine, "Turbines", cont, it.get("name"), source
+            )
+            if self.is_changed("Turbines", cont):
+                self.properties.write(
+                    turbine, "turbines", it, {"refs": self.orca_refs}
+                )
+
+            self.orca_refs.register(turbine, "turbines", cont, it.get("tags"))
             cont += 1
 
     def generate_lines(
@@ -506,76 +569,34 @@ class OrcaflexModel:
         end_points: list,
         segment_sets: list,
     ) -> None:
+        context = {
+            "end points": end_points,
+            "segment sets": segment_sets,
+            "refs": self.orca_refs,
+        }
         cont = 1
         for it in lines:
             # Initialize line
-            line = self.model.CreateObject(orca.otLine, it.get("name"))
-
-            #
-            # Edit parameters
-            #
-
-            # Anchor or fairlead (if is shared)
-            if it["has anchor"]:
-                keypoint = "anchors"
-                connectionA = "Anchored"
-                connectionB = self.orca_refs["vessels"][it["platform"]].name
-            else:
-                keypoint = "fairleads"
-                connectionA = self.orca_refs["vessels"][it["platform"][0]].Name
-                connectionB = self.orca_refs["vessels"][it["platform"][1]].Name
-
-            coord = end_points[keypoint][it["ends"][1] - 1]
-            line.EndBX, line.EndBY, line.EndBZ = coord
-            line.EndBConnection = connectionB
-
-            # Fairlead
-            coord = end_points["fairleads"][it["ends"][0] - 1]
-            line.EndAX, line.EndAY, line.EndAZ = coord
-            line.EndAConnection = connectionA
-
-            segset = it["segment set"] - 1  # segment set id
-
-            line.Length = [seg["length"] for seg in segment_sets[segset]]
-            line.TargetSegmentLength = [
-                seg["target length"] for seg in segment_sets[segset]
-            ]
-            line.LineType = [seg["type"] for seg in segment_sets[segset]]
-            line.StaticsSeabedFrictionPolicy = "None"
+            line = self.get_object(orca.otLine, "Lines", cont, it.get("name"))
+            if self.is_changed("Lines", cont):
+                self.properties.write(line, "lines", it, context)
 
             # Save reference to current line
-            self.orca_refs["lines"][cont] = line
+            self.orca_refs.register(line, "lines", cont, it.get("tags"))
             cont += 1
 
     def generate_line_types(self, types: list) -> None:
         cont = 1
         for name, data in types.items():
-            lin_type = self.model.CreateObject(orca.otLineType, name)
-
-            lin_type.OD, lin_type.ID = data["OD"], data["ID"]
-            lin_type.MassPerUnitLength = data["mass"]
-            lin_type.CompressionIsLimited = data["limit compression"]
-            if type(data["allowable tension"]) != str:
-                lin_type.AllowableTension = data["allowable tension"]
-            lin_type.EIx, lin_type.EIy, lin_type.EA, lin_type.GJ = (
-                data["EIx"],
-                data["EIy"],
-                data["EA"],
-                data["GJ"],
+            lin_type = self.get_object(
+                orca.otLineType, "Line types", name, name
             )
-            lin_type.Cdx, lin_type.Cdz, lin_type.Cl = (
-                data["Cdx"],
-                data["Cdz"],
-                data["Cl"],
+            if self.is_changed("Line types", name):
+                self.properties.write(lin_type, "line_types", data)
+
+            self.orca_refs.register(
+                lin_type, "line_types", cont, data.get("tags")
             )
-            lin_type.Cax, lin_type.Caz = data["Cax"], data["Caz"]
-            # lin_type.Cmx, lin_type.Cmy, lin_type.Cmz = \
-            #     it['Cmx'], it['Cmy'], it['Cmz']
-            friction = data["friction"]
-            lin_type.SeabedLateralFrictionCoefficient = friction["lateral"]
-            # lin_type.SeabedAxialFrictionCoefficient = it['friction']['axial']
-
-            self.orca_refs["line_types"][cont] = lin_type
             cont += 1
 
     def generate_towers(self, towers, sections) -> None:
@@ -587,115 +608,43 @@ class OrcaflexModel:
         cont = 1
         for it in towers:
             # Initialize line
-            tower = self.model.CreateObject(
-                orca.otLine, it.get("name", "Tower " + str(cont))
-            )
-
-            # Edit parameters
-
-            tower.EndAConnection = it["nacelle"]["id"]
-            coord = it["nacelle"]["end"]
-            tower.EndAX, tower.EndAY, tower.EndAZ = coord
-            tower.EndAAzimuth, tower.EndADeclination, tower.EndAGamma = (
-                coord[3],
-                coord[4],
-                coord[5],
+            tower = self.get_object(
+                orca.otLine,
+                "Towers",
+                cont,
+                it.get("name", "Tower " + str(cont)),
             )
-
-            tower.EndBConnection = it["platform"]["id"]
-            coords = it["nacelle"]["end"]
-            tower.EndBX, tower.EndBY, tower.EndBZ = coords
-            tower.EndBAzimuth, tower.EndBDeclination, tower.EndBGamma = (
-                coords[3],
-                coords[4],
-                coords[5],
-            )
-
-            # Fairlead
-            tower.IncludedInStatics = True
-            tower.StaticsSeabedFrictionPolicy = "None"
-
-            section_id = tower["section"]
-            tower.LineType = self.orca_refs["line_types"][section_id]
-            tower.TargetSegmentLength = sections[section_id]["target length"]
+            if self.is_changed("Towers", cont):
+                self.properties.write(
+                    tower, "towers", it, {"sections": sections}
+                )
 
             # Save reference to current line
-            self.orca_refs["towers"][cont] = tower
+            self.orca_refs.register(tower, "towers", cont, it.get("tags"))
             cont += 1
 
     def generate_tower_sections(self, sections) -> None:
         cont = 1
         for name, data in sections.items():
-            tower_sec = self.model.CreateObject(orca.otLineType, name)
-
-            tower_sec.Category = "Homogeneous pipe"
-            # TODO: define variable data for inner/outer diameters
-            tower_sec.OD, tower_sec.ID = self.set_tower_diameters(
-                data["OD"], data["ID"]
+            tower_sec = self.get_object(
+                orca.otLineType, "Tower sections", name, name
             )
-            tower_sec.MaterialDensity = data["density"]
-            tower_sec.E = data["E"]
-            tower_sec.PoissonRatio = data["Poisson"]
-
-            tower_sec.Cdx, tower_sec.Cdz, tower_sec.Cl = (
-                data["Cdx"],
-                data["Cdz"],
-                data.get("Cl", 0.0),
-            )
-            tower_sec.Cax, tower_sec.Caz = data["Cax"], data["Caz"]
-            tower_sec.SeabedNormalFrictionCoefficient = 0.0
+            if self.is_changed("Tower sections", name):
+                self.properties.write(tower_sec, "tower_sections", data)
 
-            self.orca_refs["tower_sections"][cont] = tower_sec
+            self.orca_refs.register(
+                tower_sec, "tower_sections", cont, data.get("tags")
+            )
             cont += 1
 
     def set_orcaflex_objects_ref(self) -> None:
-        # Starts references with '1'
-        cur_line = cur_line_type = 1
-        cur_vessel = cur_vessel_type = 1
-        cur_tower = cur_tower_sec = 1
-        # cur_buoy = cur_constraint = cur_morison = 1
-        # cur_external_function
-        cur_turbine = 1
-
-        for obj in self.model.objects:
-            if obj.type == orca.otLine:
-                if "tower" in obj.Name.lower():
-                    self.orca_refs["towers"][cur_tower] = obj
-                    cur_tower += 1
-                else:
-                    self.orca_refs["lines"][cur_line] = obj
-                    cur_line += 1
+        # Objects of the loaded file (IDs kept by name, see 'ObjectRegistry')
+        self.orca_refs.rebuild(self.model.objects, self.model.environment)
 
-            elif obj.type == orca.otLineType:
-                if "tower" in obj.Name.lower():
-                    self.orca_refs["tower_sections"][cur_tower_sec] = obj
-                    cur_tower_sec += 1
-                else:
-                    self.orca_refs["line_types"][cur_line_type] = obj
-                    cur_line_type += 1
-
-            elif obj.type == orca.otTurbine:
-                self.orca_refs["turbines"][cur_turbine] = obj
-                cur_turbine += 1
-
-            elif obj.type == orca.otVessel or (
-                obj.type == orca.otConstraint and "platform" in obj.Name.lower()
-            ):
-                self.orca_refs["vessels"][cur_vessel] = obj
-                cur_vessel += 1
-
-            elif obj.type == orca.otVesselType:
-                self.orca_refs["vessel_types"][cur_vessel_type] = obj
-                cur_vessel_type += 1
-
-            # TODO
-            # "buoys": dict(),
-            # "constraints": dict(),
-            # "morison": dict(),
-            # "external_functions": dict(),
-
-    def set_vessel_harmonic_motion(self, dof_data: namedtuple) -> None:
-        vessel = self.orca_refs["vessels"][1]
+    def set_vessel_harmonic_motion(
+        self, dof_data: namedtuple, vessel_id=1
+    ) -> None:
+        vessel = self.orca_refs["vessels"][vessel_id]
 
         # Redefine all variables as zero
         self.reset_harmonic_motion(vessel)
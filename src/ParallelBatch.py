@@ -0,0 +1,177 @@
+"""Run the cases of a batch simulation in worker processes.
+
+Each worker rebuilds (or loads) the reference model once, from the IO
+state of the parent process, and then runs the cases it takes from the
+pool queue. Results are yielded in case order or, for blocks of cases
+(warm start), as each case finishes.
+
+Only modules that do not import 'OrcFxAPI' are imported at module level,
+so a stub API module registered as "OrcFxAPI" in the parent process can
+be installed in the workers before the model is created.
+"""
+
+from IO import IO
+from Profiler import Profiler
+
+from collections import deque
+import importlib
+import multiprocessing as mp
+import queue
+import sys
+
+# State of the worker process -> reference model, Post and batch objects
+_worker = dict()
+
+
+def run_parallel(cases, n_workers: int, is_finished=None, blocks=None):
+    """Run cases in a pool of worker processes
+
+    Args:
+        cases (iterable): cases of the batch (see 'BatchSimulations')
+        n_workers (int): number of worker processes
+        is_finished (callable, optional): check if a case must be skipped
+        blocks (list[list], optional): contiguous blocks of 'cases', each
+            one run by a single worker, in order (warm start). Defaults to
+            None (cases taken one by one).
+
+    Yields:
+        tuple: (case, CaseOutput), in the same order of 'cases' (with
+            'blocks', in the order of each block, as the cases finish).
+            The output is None for skipped cases
+    """
+
+    print(f"Running batch with {n_workers} worker processes . . .")
+
+    # Outputs of the cases of blocks, sent as each case finishes
+    outputs = mp.Queue()
+    with mp.Pool(
+        n_workers,
+        initializer=_init_worker,
+        initargs=(
+            IO.get_state(),
+            get_api_name(),
+            Profiler.get_state(),
+            outputs,
+        ),
+    ) as pool:
+        if blocks is not None:
+            yield from _run_blocks(pool, outputs, blocks, is_finished)
+            return
+
+        pending = deque()
+        for case in cases:
+            if is_finished is not None and is_finished(case):
+                pending.append((case, None))
+            else:
+                pending.append((case, pool.apply_async(_run_case, (case,))))
+            # Bound the number of cases in flight (cases may be lazy)
+            if len(pending) >= 2 * n_workers:
+                yield _get_output(*pending.popleft())
+
+        while pending:
+            yield _get_output(*pending.popleft())
+
+
+def _run_blocks(pool, outputs, blocks: list[list], is_finished=None):
+    # All blocks submitted at once -> one per worker. Each case is yielded
+    # as it finishes (exported, journaled and released by the sink), not
+    # when its block finishes
+    todo, results, finished = [], [], []
+    for block in blocks:
+        cases = []
+        for case in block:
+            if is_finished is not None and is_finished(case):
+                finished.append(case)
+            else:
+                cases.append(case)
+        results.append(pool.apply_async(_run_block, (cases, len(todo))))
+        todo.append(cases)
+
+    for case in finished:
+        yield case, None
+
+    for _ in range(sum(len(cases) for cases in todo)):
+        while True:
+            try:
+                block, index, output, records = outputs.get(timeout=1.0)
+                break
+            except queue.Empty:
+                # Error in a worker -> raised here
+                for result in results:
+                    if result.ready() and not result.successful():
+                        result.get()
+        Profiler.add_records(records)
+        yield todo[block][index], output
+
+
+def _get_output(case, result):
+    if result is None:
+        return case, None
+
+    # Phases recorded in the worker -> profile of the parent process
+    output, records = result.get()
+    Profiler.add_records(records)
+    return case, output
+
+
+def get_api_name() -> str:
+    """Name of the module loaded as "OrcFxAPI" (the API or a stub of it)
+
+    Returns:
+        str: [description]
+    """
+
+    api = sys.modules.get("OrcFxAPI")
+    return "OrcFxAPI" if api is None else api.__name__
+
+
+def _init_worker(
+    io_state: dict, api_name: str, profiler_state: dict, outputs
+) -> None:
+    # Use the same API module of the parent process
+    if api_name != "OrcFxAPI":
+        sys.modules["OrcFxAPI"] = importlib.import_module(api_name)
+
+    IO.set_state(io_state)
+    # Files written before the case is returned (and journaled): a writer
+    # inherited from the parent process (fork) has no threads and it is
+    # not flushed before the pool is terminated
+    IO.writer = None
+    Profiler.set_state(profiler_state)
+
+    from BatchSimulations import create_batch
+    from OrcaflexModel import OrcaflexModel
+    from Post import Post
+
+    # Reference model -> created once per worker
+    post = Post()
+    orca_model = OrcaflexModel(post)
+    batch = create_batch(post)
+    batch.prepare_model(orca_model)
+
+    _worker["post"] = post
+    _worker["model"] = orca_model
+    _worker["batch"] = batch
+    _worker["outputs"] = outputs
+
+
+def _run_case(case):
+    post = _worker["post"]
+    post.clear_results()
+
+    batch = _worker["batch"]
+    with Profiler.profile_case(batch.get_file_name(case)):
+        output = batch.run_case(_worker["model"], post, case)
+
+    return output, Profiler.pop_records()
+
+
+def _run_block(cases: list, block: int) -> None:
+    # Cases of a block in sequence -> each case starts from the statics of
+    # the previous one (not from the last case of another block)
+    _worker["batch"].warm_state = None
+
+    for index, case in enumerate(cases):
+        output, records = _run_case(case)
+        # Sent to the parent process as soon as the case finishes
+        _worker["outputs"].put((block, index, output, records))
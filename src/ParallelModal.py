@@ -0,0 +1,174 @@
+"""Modal analyses of several objects (lines and/or the whole system) at once.
+
+The analyses of the lines are independent, so they may run concurrently,
+in threads (same model) or, when the API does not release the GIL, in
+worker processes. Each worker loads a copy of the model in the static
+state (saved in memory by the parent process) and returns the modal
+results ('ModalResults') of its objects. Input example ("Analysis" ->
+"modal"):
+
+    "parallel": {"workers": 4, "mode": "processes"}
+
+Worker processes are created per call, unless the call is within
+'modal_pool' (e.g.: the cases of a batch), which keeps them for the next
+calls. Batch worker processes (see 'ParallelBatch') are daemonic and
+cannot create processes, so there "processes" falls back to "threads".
+
+As in 'ParallelBatch', modules that import 'OrcFxAPI' are imported only
+inside functions, so a stub API can be installed in worker processes.
+"""
+
+from Profiler import Profiler
+from ParallelBatch import get_api_name
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import importlib
+import multiprocessing as mp
+import sys
+
+# Modal analysis of an object: "object" is the object name (None -> whole
+# system) and "spec" the arguments of 'orca.ModalAnalysisSpecification'
+ModalTask = namedtuple(
+    "ModalTask", ["name", "object", "spec", "outputs", "memmap_file"]
+)
+
+# State of the worker process -> model in the static state
+_worker = dict()
+# Pool reused by the calls within 'modal_pool' ("reuse" -> pool or None)
+_pool = dict()
+
+
+@contextmanager
+def modal_pool():
+    """Reuse the worker processes of the modal analyses ("processes" mode)
+    in the calls of the block, e.g.: all cases of a batch
+    """
+
+    _pool["reuse"] = None
+    try:
+        yield
+    finally:
+        pool = _pool.pop("reuse")
+        _pool.pop("size", None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def get_pool(n_workers: int):
+    """Reused pool (within 'modal_pool') with at least 'n_workers' processes
+
+    Args:
+        n_workers (int): [description]
+
+    Returns:
+        multiprocessing.pool.Pool: None outside 'modal_pool'
+    """
+
+    if "reuse" not in _pool:
+        return None
+
+    pool = _pool["reuse"]
+    if pool is None or _pool["size"] < n_workers:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        pool = _pool["reuse"] = create_pool(n_workers)
+        _pool["size"] = n_workers
+    return pool
+
+
+def create_pool(n_workers: int):
+    return mp.Pool(
+        n_workers,
+        initializer=_init_worker,
+        initargs=(get_api_name(), Profiler.get_state()),
+    )
+
+
+def run_modal_tasks(model, tasks: list, n_workers=1, mode="threads") -> list:
+    """Modal results of each task
+
+    Args:
+        model (orca.Model): model in the static state
+        tasks (list[ModalTask]): [description]
+        n_workers (int, optional): [description]. Defaults to 1.
+        mode (str, optional): "threads" or "processes". Defaults to "threads".
+
+    Returns:
+        list[ModalResults]: in the same order of 'tasks'
+    """
+
+    n_workers = min(n_workers, len(tasks))
+    if n_workers <= 1:
+        return [get_modal_results(model, task) for task in tasks]
+
+    # Batch worker process -> no child processes
+    if mode == "processes" and mp.current_process().daemon:
+        mode = "threads"
+
+    print(f"Running modal analyses with {n_workers} {mode} . . .")
+    if mode == "threads":
+        with ThreadPoolExecutor(n_workers) as executor:
+            return list(
+                executor.map(lambda t: get_modal_results(model, t), tasks)
+            )
+
+    # Static state sent with each block of tasks (one block per worker)
+    simulation = model.SaveSimulationMem()
+    blocks = [(simulation, tasks[i::n_workers]) for i in range(n_workers)]
+    pool = get_pool(n_workers)
+    if pool is not None:
+        outputs = pool.map(_run_tasks, blocks)
+    else:
+        with create_pool(n_workers) as pool:
+            outputs = pool.map(_run_tasks, blocks)
+
+    results = [None] * len(tasks)
+    for i, (block_outputs, records) in enumerate(outputs):
+        Profiler.add_records(records)
+        results[i::n_workers] = block_outputs
+    return results
+
+
+def get_modal_results(model, task: ModalTask):
+    """Run the modal analysis of a task
+
+    Args:
+        model (orca.Model): [description]
+        task (ModalTask): [description]
+
+    Returns:
+        ModalResults: [description]
+    """
+
+    import OrcFxAPI as orca
+    from ModalResults import ModalResults
+
+    obj = model if task.object is None else model[task.object]
+    with Profiler.phase("modal", task.name):
+        modes = orca.Modes(obj, orca.ModalAnalysisSpecification(**task.spec))
+        return ModalResults(modes, task.outputs, task.memmap_file)
+
+
+def _init_worker(api_name: str, profiler_state: dict) -> None:
+    # Use the same API module of the parent process
+    if api_name != "OrcFxAPI":
+        sys.modules["OrcFxAPI"] = importlib.import_module(api_name)
+
+    Profiler.set_state(profiler_state)
+
+    import OrcFxAPI as orca
+
+    _worker["model"] = orca.Model()
+
+
+def _run_tasks(block: tuple):
+    # Model of the worker -> static state of the current call
+    simulation, tasks = block
+    model = _worker["model"]
+    model.LoadSimulationMem(simulation)
+    outputs = [get_modal_results(model, task) for task in tasks]
+    return outputs, Profiler.pop_records()
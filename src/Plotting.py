@@ -2,6 +2,7 @@ import BatchSimulations as bs
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from Profiler import Profiler
 
 
 class Plotting:
@@ -28,15 +29,21 @@ class Plotting:
     def set_options(self, plot_opt: dict) -> None:
         self.options = plot_opt
 
+    @Profiler.timed()
     def plot_simulation_results(self, post) -> None:
         self.plot_statics(post.results["statics"])
-        self.plot_dynamics(post.results["dynamics"])
+        # Series may be dropped (summary only)
+        if not post.results["dynamics"].empty:
+            self.plot_dynamics(post.results["dynamics"])
         # TODO: modal results
         # -> bar plot with periods/frequencies and first modes
 
+    @Profiler.timed()
     def plot_batch(self, post, batch) -> None:
         if isinstance(batch, bs.ThrustCurve):
             self.plot_thurst_curve(post, batch.names)
+        elif isinstance(batch, bs.ModalSweep):
+            self.plot_modal_sweep(post, batch.parameters[0]["label"])
 
     def new_plot(
         self,
@@ -308,6 +315,30 @@ class Plotting:
                 self.plots["batch"]["thrust curve"],
             )
 
+    def plot_modal_sweep(self, post, param: str) -> None:
+        # Natural frequency of each tracked mode vs the first parameter
+        if not self.options.get("modal sweep") or post.batch_results.empty:
+            return None
+
+        res = post.batch_results
+        tracks = [col for col in res.columns if col.endswith(" period")]
+        plot = self.new_plot(
+            title="Modal sweep", labely=["Frequency (Hz)"], labelx=[param]
+        )
+        x = res[param].to_numpy()
+        if not pd.api.types.is_numeric_dtype(res[param]):
+            x = np.arange(len(res))
+        order = np.argsort(x, kind="stable")
+        for col in tracks:
+            plot.plot(
+                x[order],
+                1.0 / res[col].to_numpy()[order],
+                marker=".",
+                label=col[: -len(" period")],
+            )
+        plot.legend()
+        self.plots["batch"] = {"modal sweep": plot}
+
 
 # plots["line tension"]["fairleads"]
 # plots["platforms"]["equilibrium"][1]
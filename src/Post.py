@@ -3,8 +3,16 @@ from Plotting import Plotting
 import pandas as pd
 import numpy as np
 from IO import IO
+from ResultsBuilder import ResultsBuilder
+from OnlineStatistics import OnlineStatistics
+from Fatigue import Fatigue
+from Spectral import Spectral
+from ModalResults import ModalResults
+from Profiler import Profiler
 import AuxFunctions as aux
 
+import os
+
 
 class Post:
 
@@ -12,17 +20,38 @@ class Post:
     row_list = []
     batch_results = pd.DataFrame()
     period = None
+    # Request results of all nodes at once (see 'get_nodes_time_history')
+    batched_extraction = True
 
     def __init__(self) -> None:
         self.results = {
             "statics": pd.DataFrame(),
-            "modal": dict[str, pd.DataFrame](),
+            "modal": dict[str, ModalResults](),
             "dynamics": pd.DataFrame(),
+            # Statistics of dynamic results (see 'OnlineStatistics')
+            "summary": pd.DataFrame(),
+            # Damage of tension channels (see 'Fatigue')
+            "fatigue": pd.DataFrame(),
+            # PSDs and transfer functions from wave elevation (see 'Spectral')
+            "spectra": pd.DataFrame(),
+            "rao": pd.DataFrame(),
         }
 
+        # Accumulators of the simulation being postprocessed
+        self.builders: dict[str, ResultsBuilder] = dict()
+
         self.plot = Plotting()
-        self.formats: dict[str, str]
+        self.formats: dict[str, str] = dict()
         self.options: dict
+        # Statistics of dynamic results, e.g.:
+        #   {"percentiles": [5, 50, 95], "keep series": false}
+        self.summary: dict = None
+        # Fatigue damage of dynamic results (see 'Fatigue')
+        self.fatigue: dict = None
+        # Spectra of dynamic results (see 'Spectral')
+        self.spectral: dict = None
+        # Batch case being postprocessed (see 'get_modal_memmap_file')
+        self.case_name: str = None
 
     def set_options(self, input_definitions: dict) -> None:
         """Define options and simulation period to plot and/or export
@@ -36,18 +65,192 @@ class Post:
         if input_definitions.get("export format"):
             self.formats = input_definitions["export format"]
         Post.period = Post.set_result_period(input_definitions.get("period"))
+        Post.batched_extraction = input_definitions.get(
+            "batched extraction", True
+        )
+
+        summary = input_definitions.get("summary")
+        if summary:
+            self.summary = summary if isinstance(summary, dict) else dict()
+        self.fatigue = input_definitions.get("fatigue")
+        self.spectral = input_definitions.get("spectral")
+
+    def clear_results(self) -> None:
+        """Release the results of the previous simulation (batch case)"""
 
+        self.results = {
+            "statics": pd.DataFrame(),
+            "modal": dict[str, ModalResults](),
+            "dynamics": pd.DataFrame(),
+            # Statistics of dynamic results (see 'OnlineStatistics')
+            "summary": pd.DataFrame(),
+            # Damage of tension channels (see 'Fatigue')
+            "fatigue": pd.DataFrame(),
+            # PSDs and transfer functions from wave elevation (see 'Spectral')
+            "spectra": pd.DataFrame(),
+            "rao": pd.DataFrame(),
+        }
+
+    @Profiler.timed()
     def process_simulation_results(self, orca_obj_ref) -> None:
+        # Statistics of dynamic results -> updated as columns are extracted
+        stats, keep_series = None, True
+        if self.summary is not None:
+            stats = OnlineStatistics(
+                self.summary.get("percentiles", (5, 50, 95))
+            )
+            keep_series = self.summary.get("keep series", True)
+        fatigue = None if self.fatigue is None else Fatigue(self.fatigue)
+        spectral = None
+        if self.spectral is not None:
+            spectral = self.get_spectral_reference(orca_obj_ref["environment"])
+
+        self.builders = {
+            "statics": ResultsBuilder(),
+            "dynamics": ResultsBuilder(
+                stats=stats,
+                keep_series=keep_series,
+                fatigue=fatigue,
+                spectral=spectral,
+            ),
+        }
 
         if self.options.get("lines"):
-            self.process_lines(orca_obj_ref["lines"])
+            self.process_lines(
+                orca_obj_ref["lines"],
+                Post.get_definitions(
+                    self.options["lines"], orca_obj_ref, "lines"
+                ),
+            )
         if self.options.get("platforms"):
-            self.process_platforms(orca_obj_ref["vessels"])
+            self.process_platforms(
+                orca_obj_ref["vessels"],
+                Post.get_definitions(
+                    self.options["platforms"], orca_obj_ref, "vessels"
+                ),
+            )
+
+        # Create DataFrames once, after all results were extracted
+        for sim, builder in self.builders.items():
+            self.results[sim] = builder.to_frame()
+        if stats is not None:
+            self.results["summary"] = stats.to_frame()
+        if fatigue is not None:
+            self.results["fatigue"] = fatigue.to_frame()
+        if spectral is not None:
+            spectral.release_segments()
+            self.results["spectra"] = spectral.get_spectra()
+            self.results["rao"] = spectral.get_rao()
+
+    def get_spectral_reference(self, environment) -> Spectral:
+        """Spectral accumulator with the wave elevation as reference
+
+        Args:
+            environment (orca.OrcaFlexObject): [description]
+
+        Returns:
+            Spectral: [description]
+        """
+
+        times = environment.SampleTimes(Post.period)
+        spectral = Spectral(self.spectral, times[1] - times[0])
+
+        point = self.spectral.get("wave point", [0.0, 0.0, 0.0])
+        spectral.set_reference(
+            environment.TimeHistory(
+                "Elevation", Post.period, orca.oeEnvironment(*point)
+            )
+        )
+        return spectral
+
+    def get_spectral(self) -> Spectral:
+        """Spectra of the last postprocessed simulation (None if disabled)
+
+        Returns:
+            Spectral: [description]
+        """
+
+        builder = self.builders.get("dynamics")
+        return None if builder is None else builder.spectral
+
+    def get_case_row(self) -> dict[str, float]:
+        """Statistics and fatigue damage of the dynamic results as a row
+        of the batch results
+
+        Returns:
+            dict[str, float]: e.g.: {"Platform1_X_mean": ..., ...}
+        """
+
+        row = dict()
+        builder = self.builders.get("dynamics")
+        if builder is None:
+            return row
+        if builder.stats is not None:
+            row |= builder.stats.to_row()
+        if builder.fatigue is not None:
+            row |= builder.fatigue.to_row()
+        return row
+
+    @staticmethod
+    def set_case_results(rows: list[dict]) -> None:
+        """Batch results with a row (case parameters, summary and fatigue
+        damage) per case
+
+        Args:
+            rows (list[dict]): [description]
+        """
 
-    def process_lines(self, lines) -> None:
-        self.check_dynamic_time(aux.get_first_dict_element(lines))
+        Post.batch_results = pd.DataFrame(rows)
 
-        for cur_line_definition in self.options["lines"]:
+    @staticmethod
+    def get_definitions(
+        definitions: list[dict], refs, category: str
+    ) -> list[dict]:
+        """Definition of each object to postprocess. A definition with
+        "id": "all", or with a "tag" or "pattern" (regular expression of the
+        names) instead of an ID, is repeated for each object (e.g.: farm)
+
+        Args:
+            definitions (list[dict]): e.g.: "lines" of "PostProcessing"
+            refs (ObjectRegistry): [description]
+            category (str): e.g.: "lines"
+
+        Returns:
+            list[dict]: definitions with an integer "id"
+        """
+
+        expanded = []
+        for definition in definitions:
+            if definition.get("id") == "all":
+                ids = list(refs[category])
+            elif "id" not in definition and definition.get("tag"):
+                ids = Post.get_ids(
+                    refs, refs.get_tagged(definition["tag"]), category
+                )
+            elif "id" not in definition and definition.get("pattern"):
+                objs = refs.find(definition["pattern"], category)
+                ids = Post.get_ids(refs, objs, category)
+            else:
+                expanded.append(definition)
+                continue
+            expanded.extend(definition | {"id": obj_id} for obj_id in ids)
+        return expanded
+
+    @staticmethod
+    def get_ids(refs, objs: list, category: str) -> list[int]:
+        locations = [refs.get_id(obj.Name) for obj in objs]
+        return [loc[1] for loc in locations if loc and loc[0] == category]
+
+    @Profiler.timed()
+    def process_lines(self, lines, definitions: list[dict] = None) -> None:
+        if definitions is None:
+            definitions = self.options["lines"]
+        if not definitions:
+            return None
+        # Any requested line (references may be resolved on demand)
+        self.check_dynamic_time(lines[definitions[0]["id"]])
+
+        for cur_line_definition in definitions:
             # Line ID number
             num = cur_line_definition["id"]
 
@@ -65,10 +268,13 @@ class Post:
                     statics = self.options["output definitions"]["lines"]["statics"]
                 else:
                     statics = cur_line_definition["statics"]
+                self.builders["statics"].reserve(
+                    Post.count_node_columns(statics, lines[num])
+                )
 
                 if statics.get("tension"):
                     self.process_line_tension(
-                        self.results["statics"],
+                        self.builders["statics"],
                         statics["tension"],
                         lines[num],
                         num,
@@ -76,7 +282,7 @@ class Post:
                     )
                 if statics.get("position"):
                     self.process_line_position(
-                        self.results["statics"],
+                        self.builders["statics"],
                         statics["position"],
                         lines[num],
                         num,
@@ -84,7 +290,7 @@ class Post:
                     )
                 if statics.get("other results"):
                     self.process_line_other_results(
-                        self.results["statics"],
+                        self.builders["statics"],
                         statics["other results"],
                         lines[num],
                         num,
@@ -96,29 +302,33 @@ class Post:
                     dynamics = self.options["output definitions"]["lines"]["dynamics"]
                 else:
                     dynamics = cur_line_definition["dynamics"]
+                self.builders["dynamics"].reserve(
+                    Post.count_node_columns(dynamics, lines[num])
+                )
 
                 if dynamics.get("tension"):
                     self.process_line_tension(
-                        self.results["dynamics"],
+                        self.builders["dynamics"],
                         dynamics["tension"],
                         lines[num],
                         num,
                     )
                 if dynamics.get("position"):
                     self.process_line_position(
-                        self.results["dynamics"],
+                        self.builders["dynamics"],
                         dynamics["position"],
                         lines[num],
                         num,
                     )
                 if dynamics.get("other results"):
                     self.process_line_other_results(
-                        self.results["dynamics"],
+                        self.builders["dynamics"],
                         dynamics["other results"],
                         lines[num],
                         num,
                     )
 
+    @Profiler.timed()
     def process_line_tension(
         self, results, points, line, line_id, is_dynamic=True
     ) -> None:
@@ -130,20 +340,12 @@ class Post:
         # points: dict | string
         if isinstance(points, str) and points == "all nodes":
             tot_nodes = len(line.NodeArclengths)
-            for node in range(1, tot_nodes + 1):
-                # Set name of DataFrame column
-                if node == 1:
-                    node_id = "A_Tension"
-                elif node == tot_nodes:
-                    node_id = "B_Tension"
-                else:
-                    node_id = str(node) + "_Tension"
-                col_name = "Line" + str(line_id) + "_Node" + node_id
-
-                # self.results[col_name] = line.TimeHistory(
-                results[col_name] = line.TimeHistory(
-                    "Effective tension", period, orca.oeNodeNum(node)
-                )
+            results.add_block(
+                Post.get_node_colnames(line_id, tot_nodes, ["Tension"]),
+                Post.get_nodes_time_history(
+                    line, ["Effective tension"], period, tot_nodes
+                ),
+            )
             return None
 
         if "fairleads" in points:
@@ -182,6 +384,57 @@ class Post:
                     orca.oeArcLength(line.CumulativeLength[seg]),
                 )
 
+    @staticmethod
+    def get_all_nodes_dofs(option) -> tuple[str]:
+        """DoFs of the "all nodes" position results
+
+        Args:
+            option (str | list[str]): "all dofs", "all dofs - dynamic" or
+                list of DoFs
+
+        Returns:
+            tuple[str]: [description]
+        """
+
+        if option == "all dofs":
+            return ("X", "Y", "Z", "Azimuth", "Declination", "Gamma")
+        if option == "all dofs - dynamic":
+            return (
+                "Dynamic X",
+                "Dynamic Y",
+                "Dynamic Z",
+                "Dynamic Rx",
+                "Dynamic Ry",
+                "Dynamic Rz",
+            )
+        return tuple(option)
+
+    @staticmethod
+    def count_node_columns(definition: dict, line) -> int:
+        """Columns of the "all nodes" results of a line (reserved before
+        extracting them, see 'ResultsBuilder.reserve')
+
+        Args:
+            definition (dict): statics or dynamics results of the line
+            line (orca.OrcaFlexObject): [description]
+
+        Returns:
+            int: [description]
+        """
+
+        n_vars = 0
+        if definition.get("tension") == "all nodes":
+            n_vars += 1
+        position = definition.get("position")
+        if isinstance(position, dict) and "all nodes" in position:
+            n_vars += len(Post.get_all_nodes_dofs(position["all nodes"]))
+        n_vars += sum(
+            val == "all nodes"
+            for val in definition.get("other results", {}).values()
+        )
+        return n_vars * len(line.NodeArclengths) if n_vars else 0
+
+    @Profiler.timed()
     def process_line_position(
         self, results, points: dict, line, line_id, is_dynamic=True
     ) -> None:
@@ -194,45 +447,15 @@ class Post:
             tot_nodes = len(line.NodeArclengths)
 
             # Define DoFs to monitor
-            if points["all nodes"] == "all dofs":
-                dofs = (
-                    "X",
-                    "Y",
-                    "Z",
-                    "Azimuth",
-                    "Declination",
-                    "Gamma",
-                )
-            elif points["all nodes"] == "all dofs - dynamic":
-                dofs = (
-                    "Dynamic X",
-                    "Dynamic Y",
-                    "Dynamic Z",
-                    "Dynamic Rx",
-                    "Dynamic Ry",
-                    "Dynamic Rz",
-                )
-            else:
-                dofs = tuple(points["all nodes"])
-
-            # Iterate nodes
-            for node in range(1, tot_nodes + 1):
-                # Set name of DataFrame column
-                if node == 1:
-                    node_id = "A"
-                elif node == tot_nodes:
-                    node_id = "B"
-                else:
-                    node_id = str(node)
-                col_name = "Line" + str(line_id) + "_Node" + node_id + "_"
-
-                # Iterate DoFs and push to DataFrame
-                for dof in dofs:
-                    results[col_name + dof.replace(" ", "")] = line.TimeHistory(
-                        dof,
-                        period,
-                        orca.oeNodeNum(node),
-                    )
+            dofs = Post.get_all_nodes_dofs(points["all nodes"])
+
+            # All nodes and DoFs -> (samples x (nodes * DoFs)) block
+            results.add_block(
+                Post.get_node_colnames(
+                    line_id, tot_nodes, [dof.replace(" ", "") for dof in dofs]
+                ),
+                Post.get_nodes_time_history(line, dofs, period, tot_nodes),
+            )
 
             return None
 
@@ -317,89 +540,149 @@ class Post:
                         dof, period, orca.oeArcLength(float(arc_len))
                     )
 
+    @staticmethod
+    def get_node_colnames(line_id, tot_nodes, var_names) -> list[str]:
+        """Column names for variables at all nodes of a line (node-major)
+
+        Args:
+            line_id (int): [description]
+            tot_nodes (int): [description]
+            var_names (list[str]): variable names (without spaces)
+
+        Returns:
+            list[str]: [description]
+        """
+
+        node_ids = ["A"] + [str(node) for node in range(2, tot_nodes)] + ["B"]
+        return [
+            "Line" + str(line_id) + "_Node" + node_id + "_" + var
+            for node_id in node_ids[:tot_nodes]
+            for var in var_names
+        ]
+
+    @staticmethod
+    def get_nodes_time_history(
+        line, var_names, period, tot_nodes
+    ) -> np.ndarray:
+        """Time histories of variables at all nodes of a line
+
+        With batched extraction (default), all nodes and variables are
+        requested at once, otherwise one request is made per node and variable.
+
+        Args:
+            line (orca.OrcaFlexObject): [description]
+            var_names (list[str]): [description]
+            period ([type]): [description]
+            tot_nodes (int): [description]
+
+        Returns:
+            np.ndarray: samples x (nodes * variables), node-major
+        """
+
+        nodes = range(1, tot_nodes + 1)
+        if Post.batched_extraction:
+            specs = [
+                orca.TimeHistorySpecification(line, var, orca.oeNodeNum(node))
+                for node in nodes
+                for var in var_names
+            ]
+            return orca.GetMultipleTimeHistories(specs, period)
+
+        return np.column_stack(
+            [
+                line.TimeHistory(var, period, orca.oeNodeNum(node))
+                for node in nodes
+                for var in var_names
+            ]
+        )
+
+    @Profiler.timed()
     def process_line_modal(self, line_id, mode_details) -> None:
-        line_post_opt = IO.input_data["PostProcessing"]["lines"][line_id - 1]
+        modal_def = self.get_line_modal_definition(line_id)
+        if modal_def is None:
+            return None
+
+        # All modes at once (bulk arrays of 'orca.Modes')
+        name = "Line" + str(line_id)
+        self.results["modal"][name] = ModalResults(
+            mode_details,
+            modal_def,
+            self.get_modal_memmap_file(modal_def, name),
+        )
+
+    def get_line_modal_definition(self, line_id) -> dict:
+        """Modal outputs of a line (e.g.: {"period": true, ...})
+
+        Args:
+            line_id (int): [description]
+
+        Returns:
+            dict: None if modal results are not requested
+        """
+
+        lines = IO.input_data["PostProcessing"].get("lines", [])
+        line_post_opt = next(
+            (d for d in lines if d.get("id") in (line_id, "all")), dict()
+        )
 
         # Check if default definition must be used,
         # otherwise uses the specific line definition
-        opt_defined = False
-        if line_post_opt.get("defined") and "modal" in line_post_opt["defined"]:
-            opt_defined = True
-
-        # Check if modal results are requested
-        if "modal" in line_post_opt or opt_defined is True:
-            if opt_defined:
-                modal_def = IO.input_data["PostProcessing"]["output definitions"][
-                    "lines"
-                ]["modal"]
-            else:
-                modal_def = line_post_opt["modal"]
+        if (
+            line_post_opt.get("defined")
+            and "modal" in line_post_opt["defined"]
+        ):
+            return IO.input_data["PostProcessing"]["output definitions"][
+                "lines"
+            ]["modal"]
+        return line_post_opt.get("modal")
 
-        tot_dofs = mode_details.dofCount
-        tot_modes = mode_details.modeCount
+    @staticmethod
+    def get_system_modal_definition(shapes=True) -> dict:
+        """Modal outputs of the whole system ("output definitions" ->
+        "system" -> "modal"), by default periods, masses, stiffnesses and
+        global shapes (if calculated)
 
-        # Number of results -> total number of dataframe columns
-        n_cols = 1
-        outputs = ["Mode"]
-        for opt, val in modal_def.items():
-            if not val:
-                continue
-            # If output option was set to 'true' the result will be requested...
-            outputs.append(opt)
-            # ...thus, check if all DoFs will be added to results...
-            if "shape" in opt:
-                n_cols += tot_dofs
-            # ... or just one column (for period, mass, and stiffness)
-            else:
-                n_cols += 1
-
-        # Initialize numpy 2D array to save modal results
-        # each mode results in a separated line
-        data = np.zeros((tot_modes, n_cols))
-
-        # Set column names
-        col_names = [name.title() for name in outputs if "shape" not in name]
-        if "local shape" in outputs:
-            for node in range(2, mode_details.nodeNumber[-1] + 1):
-                col_names += [
-                    "Node" + str(node) + dof
-                    for dof in ["_LocalX", "_LocalY", "_LocalZ"]
-                ]
-        if "global shape" in outputs:
-            for node in range(2, mode_details.nodeNumber[-1] + 1):
-                col_names += [
-                    "Node" + str(node) + dof
-                    for dof in ["_GlobalX", "_GlobalY", "_GlobalZ"]
-                ]
-
-        # Set result data
-        for lin in range(tot_modes):
-            mode = mode_details.modeDetails(lin)
-            data[lin, 0] = mode.modeNumber
-            col = 1
-            if "period" in outputs:
-                data[lin, col] = mode.period
-                col += 1
-            if "mass" in outputs:
-                data[lin, col] = mode.mass
-                col += 1
-            if "stiffness" in outputs:
-                data[lin, col] = mode.stiffness
-                col += 1
-
-            if "local shape" in outputs:
-                data[lin, col : col + tot_dofs] = mode.shapeWrtLocal
-                col += tot_dofs
-
-            if "global shape" in outputs:
-                data[lin, col : col + tot_dofs] = mode.shapeWrtGlobal
-                col += tot_dofs
-
-        self.results["modal"]["Line" + str(line_id)] = pd.DataFrame(
-            data,
-            columns=col_names,
+        Args:
+            shapes (bool, optional): shapes calculated. Defaults to True.
+
+        Returns:
+            dict: [description]
+        """
+
+        definitions = IO.input_data["PostProcessing"].get(
+            "output definitions", {}
+        )
+        default = {"period": True, "mass": True, "stiffness": True}
+        return definitions.get("system", dict()).get(
+            "modal", default | {"global shape": shapes}
         )
 
+    def get_modal_memmap_file(self, modal_def: dict, name: str) -> str:
+        """Base name of the memory-mapped shape files (see 'ModalResults')
+
+        Files are named by batch case and process, so cases postprocessed
+        at the same time (workers) or kept in memory (results exported in
+        background, cache) do not share files.
+
+        Args:
+            modal_def (dict): modal outputs
+            name (str): e.g.: "Line1"
+
+        Returns:
+            str: None if shapes are kept in memory
+        """
+
+        if not modal_def.get("memmap"):
+            return None
+        memmap_dir = modal_def["memmap"]
+        if not isinstance(memmap_dir, str):
+            memmap_dir = IO.results_dir
+        prefix = IO.name_no_extension
+        if self.case_name is not None:
+            prefix += "_" + self.case_name
+        return os.path.join(memmap_dir, f"{prefix}_{name}_{os.getpid()}")
+
+    @Profiler.timed()
     def process_line_other_results(
         self, results, results_opt: dict, line, line_id, is_dynamic=True
     ) -> None:
@@ -413,22 +696,16 @@ class Post:
             # definition: dict | string
             if isinstance(definition, str) and definition == "all nodes":
                 tot_nodes = len(line.NodeArclengths)
-
-                for node in range(1, tot_nodes + 1):
-                    ret_after_all_nodes = True
-                    # Set name of DataFrame column
-                    if node == 1:
-                        node_id = "A_" + aux.to_title_and_remove_ws(res_name)
-                    elif node == tot_nodes:
-                        node_id = "B_" + aux.to_title_and_remove_ws(res_name)
-                    else:
-                        node_id = str(node) + "_" + aux.to_title_and_remove_ws(res_name)
-                    col_name = "Line" + str(line_id) + "_Node" + node_id
-
-                    # self.results[col_name] = line.TimeHistory(
-                    results[col_name] = line.TimeHistory(
-                        res_name, period, orca.oeNodeNum(node)
-                    )
+                results.add_block(
+                    Post.get_node_colnames(
+                        line_id,
+                        tot_nodes,
+                        [aux.to_title_and_remove_ws(res_name)],
+                    ),
+                    Post.get_nodes_time_history(
+                        line, [res_name], period, tot_nodes
+                    ),
+                )
 
             if "fairleads" in definition:
                 predicate = "Line" + str(line_id)
@@ -470,11 +747,18 @@ class Post:
 
     ####################################
 
-    def process_platforms(self, platforms) -> None:
-        self.check_dynamic_time(aux.get_first_dict_element(platforms))
+    @Profiler.timed()
+    def process_platforms(
+        self, platforms, definitions: list[dict] = None
+    ) -> None:
+        if definitions is None:
+            definitions = self.options["platforms"]
+        if not definitions:
+            return None
+        self.check_dynamic_time(platforms[definitions[0]["id"]])
 
         # Position
-        for cur_platf in self.options["platforms"]:
+        for cur_platf in definitions:
             # Platform ID number
             num = cur_platf["id"]
 
@@ -485,6 +769,7 @@ class Post:
             # if motion:
             #     self.process_platform_motion(position, platforms[num], num)
 
+    @Profiler.timed()
     def process_platform_position(self, opt, platf, platf_id) -> None:
         # Define DoFs to monitor
         if opt["position"]["dofs"] == "all":
@@ -499,17 +784,11 @@ class Post:
 
         data = platf.TimeHistory(dofs, Post.period, obj_extra)
         colnames = aux.prepend_to_colnames(dofs, f"Platform{platf_id}")
-        self.results["dynamics"] = pd.concat(
-            [
-                self.results["dynamics"],
-                pd.DataFrame(data, columns=colnames),
-            ],
-            axis=1,
-        )
+        self.builders["dynamics"].add_block(colnames, data)
 
     def check_dynamic_time(self, first) -> None:
-        if self.results["dynamics"].empty:
-            self.results["dynamics"]["Time"] = first.SampleTimes(Post.period)
+        if "Time" not in self.builders["dynamics"]:
+            self.builders["dynamics"]["Time"] = first.SampleTimes(Post.period)
 
     @staticmethod
     def set_result_period(definitions=None):
@@ -541,10 +820,16 @@ class Post:
                 )
                 cur_row.extend([stats.Query(var, var).Mean for var in data[0]])
 
-        # Mount row with (mean values of) requested data
-        Post.row_list.append(cur_row)
+        # Row with (mean values of) requested data
+        return cur_row
 
     @staticmethod
     def set_thrust_curves(var_names, eval_range):
         Post.batch_results = pd.DataFrame(Post.row_list, columns=var_names)
         Post.batch_results.insert(0, "Wind speed", eval_range)
+        # Range may be non-uniform and unsorted (adaptive sampling)
+        Post.batch_results = (
+            Post.batch_results.sort_values("Wind speed", kind="stable")
+            .drop_duplicates("Wind speed", keep="last")
+            .reset_index(drop=True)
+        )
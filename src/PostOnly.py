@@ -0,0 +1,272 @@
+"""Postprocess existing simulation files, without a reference model.
+
+Input example (action "post only": true):
+
+    "Post only": {
+        "simulations": "D:/results/seeds/*.sim",
+        "workers": 4
+    }
+
+"simulations" may be a directory (all '.sim' files), a glob pattern or a
+list of them. Object references are resolved on first access, by the
+"name" given in the PostProcessing definitions of lines and platforms
+(e.g.: {"id": 1, "name": "Mooring1", ...}), so only the objects to be
+postprocessed are looked up. Without a name, the objects of the model
+are indexed once, as in 'OrcaflexModel.set_orcaflex_objects_ref'.
+
+As in 'ParallelBatch', modules that import 'OrcFxAPI' are imported only
+inside functions, so a stub API can be installed in worker processes.
+"""
+
+from IO import IO
+import AuxFunctions as aux
+from Profiler import Profiler
+from ParallelBatch import get_api_name
+
+from collections.abc import Mapping
+import glob
+import importlib
+import multiprocessing as mp
+import os
+import sys
+
+# State of the worker process -> model and Post objects
+_worker = dict()
+
+
+class LazyObjects(Mapping):
+    """References (ID -> object) of a type, resolved on first access"""
+
+    def __init__(self, refs, category: str, names: dict) -> None:
+        """[summary]
+
+        Args:
+            refs (LazyReferences): [description]
+            category (str): e.g. "lines" (see 'OrcaflexModel.orca_refs')
+            names (dict): object ID -> name
+        """
+
+        self.refs = refs
+        self.category = category
+        self.names = names
+        self.objects = dict()
+
+    def __getitem__(self, obj_id):
+        if obj_id not in self.objects:
+            name = self.names.get(obj_id)
+            if name is not None:
+                self.objects[obj_id] = self.refs.model[name]
+            else:
+                self.objects[obj_id] = self.refs.get_sorted()[self.category][
+                    obj_id
+                ]
+        return self.objects[obj_id]
+
+    def __iter__(self):
+        return iter(self.refs.get_sorted()[self.category])
+
+    def __len__(self) -> int:
+        return len(self.refs.get_sorted()[self.category])
+
+
+class LazyReferences(Mapping):
+    """Replacement of 'OrcaflexModel.orca_refs' for a loaded simulation"""
+
+    def __init__(self, model, names: dict[str, dict]) -> None:
+        """[summary]
+
+        Args:
+            model (orca.Model): model with the loaded simulation
+            names (dict[str, dict]): type (e.g. "lines") -> ID -> name
+        """
+
+        self.model = model
+        self.names = names
+        self.categories: dict[str, LazyObjects] = dict()
+        self.sorted = None  # ObjectRegistry
+
+    def __getitem__(self, category: str):
+        if category == "environment":
+            return self.model.environment
+        if category not in self.categories:
+            self.categories[category] = LazyObjects(
+                self, category, self.names.get(category, dict())
+            )
+        return self.categories[category]
+
+    def __iter__(self):
+        return iter(self.get_sorted())
+
+    def __len__(self) -> int:
+        return len(self.get_sorted())
+
+    def get_id(self, name: str):
+        return self.get_sorted().get_id(name)
+
+    def get_tagged(self, tag: str) -> list:
+        return self.get_sorted().get_tagged(tag)
+
+    def find(self, pattern: str, category: str = None) -> list:
+        return self.get_sorted().find(pattern, category)
+
+    def get_sorted(self):
+        """All objects sorted by type (only if an object has no name)
+
+        Returns:
+            ObjectRegistry: as 'OrcaflexModel.orca_refs'
+        """
+
+        if self.sorted is None:
+            from ObjectRegistry import ObjectRegistry
+
+            self.sorted = ObjectRegistry(self.model.environment)
+            if IO.input_data.get("Object tags"):
+                self.sorted.set_tag_patterns(IO.input_data["Object tags"])
+            self.sorted.rebuild(self.model.objects)
+        return self.sorted
+
+
+def get_object_names(options: dict) -> dict[str, dict]:
+    """Names of the objects defined in the PostProcessing input
+
+    Args:
+        options (dict): "PostProcessing" input
+
+    Returns:
+        dict[str, dict]: type -> ID -> name
+    """
+
+    names = {"lines": dict(), "vessels": dict()}
+    for key, category in [("lines", "lines"), ("platforms", "vessels")]:
+        for definition in options.get(key, []):
+            # Only a single object (not "all", a tag or a pattern)
+            if definition.get("name") and isinstance(
+                definition.get("id"), int
+            ):
+                names[category][definition["id"]] = definition["name"]
+    return names
+
+
+def get_simulation_files(spec) -> list[str]:
+    """Simulation files from a directory, glob pattern or list of them
+
+    Args:
+        spec (str | list[str]): [description]
+
+    Returns:
+        list[str]: sorted file names
+    """
+
+    if isinstance(spec, list):
+        return [f for item in spec for f in get_simulation_files(item)]
+    if os.path.isdir(spec):
+        spec = os.path.join(spec, "*.sim")
+    return sorted(glob.glob(spec))
+
+
+def run_post_only(post) -> None:
+    """Postprocess the simulation files defined in the input
+
+    Args:
+        post (Post): [description]
+    """
+
+    opt = IO.input_data["Post only"]
+    files = get_simulation_files(opt["simulations"])
+    if not files:
+        print(f'\nNo simulation files found in "{opt["simulations"]}"')
+        return None
+
+    from BatchSimulations import BatchSimulations
+
+    post.set_options(IO.input_data["PostProcessing"])
+    n_workers = min(
+        BatchSimulations.set_n_workers(opt.get("workers", 1)), len(files)
+    )
+    print(f"\nPostprocessing {len(files)} simulation files . . .")
+
+    if n_workers > 1:
+        with mp.Pool(
+            n_workers,
+            initializer=_init_worker,
+            initargs=(IO.get_state(), get_api_name(), Profiler.get_state()),
+        ) as pool:
+            outputs = []
+            for name, row, records in pool.imap(_process_file, files):
+                Profiler.add_records(records)
+                outputs.append((name, row))
+    else:
+        _set_worker(post)
+        outputs = [_process_file(file_name)[:2] for file_name in files]
+
+    # Statistics and damage of each file -> batch results
+    rows = [row for _, row in outputs if row is not None]
+    if rows:
+        post.set_case_results(rows)
+        formats = post.formats
+        if IO.save_options["results"] and formats.get("batch"):
+            aux.export_results(
+                post.batch_results,
+                IO.results_dir + IO.name_no_extension,
+                formats["batch"],
+                "_batch",
+                formats.get("options"),
+            )
+
+
+def _init_worker(io_state: dict, api_name: str, profiler_state: dict) -> None:
+    # Use the same API module of the parent process
+    if api_name != "OrcFxAPI":
+        sys.modules["OrcFxAPI"] = importlib.import_module(api_name)
+
+    IO.set_state(io_state)
+    Profiler.set_state(profiler_state)
+
+    from Post import Post
+
+    post = Post()
+    post.set_options(IO.input_data["PostProcessing"])
+    _set_worker(post)
+
+
+def _set_worker(post) -> None:
+    import OrcFxAPI as orca
+
+    _worker["post"] = post
+    _worker["model"] = orca.Model()
+    _worker["names"] = get_object_names(IO.input_data["PostProcessing"])
+
+
+def _process_file(file_name: str):
+    """Load, postprocess and export the results of a simulation file
+
+    Args:
+        file_name (str): [description]
+
+    Returns:
+        tuple: name, row of the batch results (or None) and profile records
+    """
+
+    post, model = _worker["post"], _worker["model"]
+    name = os.path.splitext(os.path.basename(file_name))[0]
+
+    with Profiler.profile_case(name):
+        print(f'\nLoading simulation "{file_name}" . . .')
+        with Profiler.phase("load simulation"):
+            model.LoadSimulation(file_name)
+
+        post.clear_results()
+        post.process_simulation_results(
+            LazyReferences(model, _worker["names"])
+        )
+
+        if IO.save_options["results"] and post.formats:
+            IO.export_simulation_results(
+                IO.results_dir + name, post.results, post.formats
+            )
+
+    row = None
+    if post.summary is not None or post.fatigue is not None:
+        row = {"file": name} | post.get_case_row()
+
+    return name, row, Profiler.pop_records()
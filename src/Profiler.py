@@ -0,0 +1,277 @@
+from contextlib import contextmanager
+from functools import wraps
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+
+class Profiler:
+    """Wall time, CPU time and peak RSS of each phase of an execution
+
+    Phases are functions decorated with 'Profiler.timed' or blocks within
+    'Profiler.phase'. Nothing is recorded unless profiling is enabled,
+    in the input file ("Profiling": {"enabled": true}) or with the command
+    line option '--profile'. The report is saved, at the end of the
+    execution, as '<name>_profile.json' and/or '<name>_profile.csv'.
+
+    Options of the "Profiling" input:
+        "report": "json", "csv" or both (list). Defaults to "json"
+        "case profiler": "cprofile" or "pyinstrument" -> call profile
+            of each batch case, saved with the case name
+    """
+
+    enabled: bool = False
+    report_formats: list[str] = ["json"]
+    case_profiler: str = None
+    # Report and case profiles are saved as 'prefix' + ...
+    prefix: str = "./"
+
+    records: list[dict] = []
+    # Nesting depth of the phases of each thread (e.g.: background writers)
+    _local = threading.local()
+    _t0: float = time.perf_counter()
+
+    @staticmethod
+    def set_options(opt: dict = None, enable=False, prefix="./") -> None:
+        """[summary]
+
+        Args:
+            opt (dict, optional): "Profiling" input. Defaults to None.
+            enable (bool, optional): enabled from the command line.
+                Defaults to False.
+            prefix (str, optional): directory and name of the input.
+                Defaults to "./".
+        """
+
+        if opt is None:
+            opt = dict()
+
+        Profiler.enabled = enable or opt.get("enabled", bool(opt))
+        report = opt.get("report", "json")
+        Profiler.report_formats = (
+            [report] if isinstance(report, str) else report
+        )
+        Profiler.case_profiler = opt.get("case profiler")
+        Profiler.prefix = prefix
+
+        Profiler.records = []
+        Profiler._t0 = time.perf_counter()
+
+    @staticmethod
+    def get_state() -> dict:
+        """Options used to initialize worker processes (see 'ParallelBatch')
+
+        Returns:
+            dict: [description]
+        """
+
+        return {
+            "enabled": Profiler.enabled,
+            "report_formats": Profiler.report_formats,
+            "case_profiler": Profiler.case_profiler,
+            "prefix": Profiler.prefix,
+        }
+
+    @staticmethod
+    def set_state(state: dict) -> None:
+        for name, value in state.items():
+            setattr(Profiler, name, value)
+        Profiler.records = []
+
+    @staticmethod
+    def get_peak_rss() -> float:
+        """Peak resident set size of the process, in MB
+
+        Returns:
+            float: None if not available (Windows without 'psutil')
+        """
+
+        try:
+            import resource
+        except ImportError:
+            try:
+                import psutil
+            except ImportError:
+                return None
+            return psutil.Process().memory_info().peak_wset / 2**20
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kB on Linux, bytes on macOS
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+    @staticmethod
+    @contextmanager
+    def phase(name: str, label: str = ""):
+        """Record a phase (block of code)
+
+        Args:
+            name (str): phase (e.g.: "statics")
+            label (str, optional): e.g. batch case. Defaults to "".
+        """
+
+        if not Profiler.enabled:
+            yield
+            return
+
+        depth = getattr(Profiler._local, "depth", 0)
+        Profiler._local.depth = depth + 1
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            Profiler._local.depth = depth
+            Profiler.records.append(
+                {
+                    "phase": name,
+                    "label": label,
+                    "start": wall0 - Profiler._t0,
+                    "wall": time.perf_counter() - wall0,
+                    "cpu": time.process_time() - cpu0,
+                    "peak rss": Profiler.get_peak_rss(),
+                    "depth": depth,
+                    "pid": os.getpid(),
+                }
+            )
+
+    @staticmethod
+    def timed(name: str = None):
+        """Decorator to record each call of a function as a phase
+
+        Args:
+            name (str, optional): Defaults to the function name.
+        """
+
+        def decorator(func):
+            phase_name = name if name is not None else func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not Profiler.enabled:
+                    return func(*args, **kwargs)
+                with Profiler.phase(phase_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    @contextmanager
+    def profile_case(label: str):
+        """Record a batch case and, if requested, save its call profile
+
+        Args:
+            label (str): case name (see 'BatchSimulations.get_file_name')
+        """
+
+        if not Profiler.enabled:
+            yield
+            return
+
+        with Profiler.phase("batch case", label):
+            if Profiler.case_profiler == "cprofile":
+                import cProfile
+
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+                    profile.dump_stats(Profiler.prefix + label + ".prof")
+            elif Profiler.case_profiler == "pyinstrument":
+                from pyinstrument import Profiler as CallProfiler
+
+                profile = CallProfiler()
+                profile.start()
+                try:
+                    yield
+                finally:
+                    profile.stop()
+                    with open(
+                        Profiler.prefix + label + "_profile.html", "w"
+                    ) as f:
+                        f.write(profile.output_html())
+            else:
+                yield
+
+    @staticmethod
+    def pop_records() -> list[dict]:
+        """Records since the last call (e.g.: from a worker process)
+
+        Returns:
+            list[dict]: [description]
+        """
+
+        records, Profiler.records = Profiler.records, []
+        return records
+
+    @staticmethod
+    def add_records(records: list[dict]) -> None:
+        Profiler.records.extend(records)
+
+    @staticmethod
+    def write_report() -> list[str]:
+        """Save the recorded phases and print a summary (by phase)
+
+        Returns:
+            list[str]: saved files
+        """
+
+        if not Profiler.enabled:
+            return []
+
+        saved = []
+        file_name = Profiler.prefix + "profile"
+        if "json" in Profiler.report_formats:
+            print(f'\nSaving "{file_name}.json" file . . .')
+            with open(file_name + ".json", "w") as f:
+                json.dump(
+                    {
+                        "phases": Profiler.records,
+                        "summary": Profiler.summarize(),
+                    },
+                    f,
+                    indent=2,
+                )
+            saved.append(file_name + ".json")
+
+        if "csv" in Profiler.report_formats and Profiler.records:
+            print(f'\nSaving "{file_name}.csv" file . . .')
+            with open(file_name + ".csv", "w", newline="") as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=list(Profiler.records[0])
+                )
+                writer.writeheader()
+                writer.writerows(Profiler.records)
+            saved.append(file_name + ".csv")
+
+        print("\nProfile (phase: calls, wall [s], cpu [s]):")
+        for name, total in Profiler.summarize().items():
+            print(
+                f"\t{name}: {total['calls']},",
+                f"{total['wall']:.3f}, {total['cpu']:.3f}",
+            )
+
+        return saved
+
+    @staticmethod
+    def summarize() -> dict[str, dict]:
+        """Calls, wall and CPU time of each phase
+
+        Returns:
+            dict[str, dict]: [description]
+        """
+
+        summary = dict()
+        for record in Profiler.records:
+            total = summary.setdefault(
+                record["phase"], {"calls": 0, "wall": 0.0, "cpu": 0.0}
+            )
+            total["calls"] += 1
+            total["wall"] += record["wall"]
+            total["cpu"] += record["cpu"]
+        return summary
@@ -0,0 +1,279 @@
+"""Declarative property writes of generated Orcaflex objects.
+
+Each table maps an item of an input section (e.g.: an element of "Lines")
+to the data items of its Orcaflex object: {property: source}, where the
+source is a key of the item (dotted for nested keys, e.g.:
+"friction.lateral") or a function of the item and of a context (other
+input sections, object references). Sources that return 'SKIP' are not
+written. Raw Orcaflex properties may also be given in an item:
+
+    {"name": "Line1", ..., "properties": {"IncludeTorsion": true}}
+
+Dependent properties (e.g.: "Length" defines the number of sections used
+by "TargetSegmentLength") are always written after their dependencies.
+
+The tables only gather the mapping and the order of the writes: each
+property is still written as an attribute (one API call), as before.
+"""
+
+SKIP = object()
+
+
+def key(path: str, default=SKIP):
+    """Source of a property from a (nested) key of the item
+
+    Args:
+        path (str): e.g.: "friction.lateral"
+        default (optional): value if the key is not defined. Defaults to
+            SKIP (not written).
+
+    Returns:
+        Callable: [description]
+    """
+
+    keys = path.split(".")
+
+    def get(item, context):
+        for k in keys:
+            if not isinstance(item, dict) or k not in item:
+                return default
+            item = item[k]
+        return item
+
+    return get
+
+
+def const(value):
+    return lambda item, context: value
+
+
+def _line_end(item, context, end: str):
+    # End A -> fairlead, end B -> anchor (or fairlead of the second platform)
+    if end == "A":
+        keypoint = "fairleads"
+        index = item["ends"][0] - 1
+    else:
+        keypoint = "anchors" if item["has anchor"] else "fairleads"
+        index = item["ends"][1] - 1
+    return context["end points"][keypoint][index]
+
+
+def _line_connection(item, context, end: str):
+    # Same ends as the coordinates (see '_line_end'): anchored lines are
+    # connected to the platform at end A and anchored at end B
+    vessels = context["refs"]["vessels"]
+    if item["has anchor"]:
+        return vessels[item["platform"]].Name if end == "A" else "Anchored"
+    return vessels[item["platform"][0 if end == "A" else 1]].Name
+
+
+def _segments(item, context, name: str):
+    segment_set = context["segment sets"][item["segment set"] - 1]
+    return [seg[name] for seg in segment_set]
+
+
+def _imposed_motion(source):
+    # Constraint data only used if the motion is imposed
+    def get(item, context):
+        if not item["constraint type"]["imposed motion"]:
+            return SKIP
+        return source(item, context)
+
+    return get
+
+
+# Input section -> {property: source}, in the writing order
+tables = {
+    "platforms": {
+        "InitialX": lambda it, ctx: it["position"][0],
+        "InitialY": lambda it, ctx: it["position"][1],
+        "InitialZ": lambda it, ctx: it["position"][2],
+        "InitialAzimuth": lambda it, ctx: it["angles"][0],
+        "InitialDeclination": lambda it, ctx: it["angles"][1],
+        "InitialGamma": lambda it, ctx: it["angles"][2],
+        "Connection": const("Fixed"),
+        "ConstraintType": _imposed_motion(const("Imposed motion")),
+        "TimeHistoryDataSource": _imposed_motion(const("External")),
+        "TimeHistoryFileName": _imposed_motion(
+            key("constraint type.file name")
+        ),
+        "TimeHistoryInterpolation": _imposed_motion(
+            key("constraint type.interpolation", "Cubic spline")
+        ),
+    },
+    "line_types": {
+        "OD": key("OD"),
+        "ID": key("ID"),
+        "MassPerUnitLength": key("mass"),
+        "CompressionIsLimited": key("limit compression"),
+        "AllowableTension": lambda it, ctx: (
+            SKIP
+            if isinstance(it["allowable tension"], str)
+            else it["allowable tension"]
+        ),
+        "EIx": key("EIx"),
+        "EIy": key("EIy"),
+        "EA": key("EA"),
+        "GJ": key("GJ"),
+        "Cdx": key("Cdx"),
+        "Cdz": key("Cdz"),
+        "Cl": key("Cl"),
+        "Cax": key("Cax"),
+        "Caz": key("Caz"),
+        "SeabedLateralFrictionCoefficient": key("friction.lateral"),
+    },
+    "lines": {
+        "EndBX": lambda it, ctx: _line_end(it, ctx, "B")[0],
+        "EndBY": lambda it, ctx: _line_end(it, ctx, "B")[1],
+        "EndBZ": lambda it, ctx: _line_end(it, ctx, "B")[2],
+        "EndBConnection": lambda it, ctx: _line_connection(it, ctx, "B"),
+        "EndAX": lambda it, ctx: _line_end(it, ctx, "A")[0],
+        "EndAY": lambda it, ctx: _line_end(it, ctx, "A")[1],
+        "EndAZ": lambda it, ctx: _line_end(it, ctx, "A")[2],
+        "EndAConnection": lambda it, ctx: _line_connection(it, ctx, "A"),
+        "Length": lambda it, ctx: _segments(it, ctx, "length"),
+        "TargetSegmentLength": lambda it, ctx: _segments(
+            it, ctx, "target length"
+        ),
+        "LineType": lambda it, ctx: _segments(it, ctx, "type"),
+        "StaticsSeabedFrictionPolicy": const("None"),
+    },
+    "turbines": {
+        "Connection": lambda it, ctx: (
+            ctx["refs"]["vessels"][it["platform"]].Name
+            if "platform" in it
+            else SKIP
+        ),
+        "InitialX": lambda it, ctx: (
+            it["position"][0] if "position" in it else SKIP
+        ),
+        "InitialY": lambda it, ctx: (
+            it["position"][1] if "position" in it else SKIP
+        ),
+        "InitialZ": lambda it, ctx: (
+            it["position"][2] if "position" in it else SKIP
+        ),
+    },
+    "towers": {
+        "EndAConnection": key("nacelle.id"),
+        "EndAX": lambda it, ctx: it["nacelle"]["end"][0],
+        "EndAY": lambda it, ctx: it["nacelle"]["end"][1],
+        "EndAZ": lambda it, ctx: it["nacelle"]["end"][2],
+        "EndAAzimuth": lambda it, ctx: it["nacelle"]["end"][3],
+        "EndADeclination": lambda it, ctx: it["nacelle"]["end"][4],
+        "EndAGamma": lambda it, ctx: it["nacelle"]["end"][5],
+        "EndBConnection": key("platform.id"),
+        "EndBX": lambda it, ctx: it["platform"]["end"][0],
+        "EndBY": lambda it, ctx: it["platform"]["end"][1],
+        "EndBZ": lambda it, ctx: it["platform"]["end"][2],
+        "EndBAzimuth": lambda it, ctx: it["platform"]["end"][3],
+        "EndBDeclination": lambda it, ctx: it["platform"]["end"][4],
+        "EndBGamma": lambda it, ctx: it["platform"]["end"][5],
+        "IncludedInStatics": const(True),
+        "StaticsSeabedFrictionPolicy": const("None"),
+        # Section -> line type with the same name
+        "LineType": key("section"),
+        "TargetSegmentLength": lambda it, ctx: (
+            ctx["sections"][it["section"]]["target length"]
+        ),
+    },
+    "tower_sections": {
+        "Category": const("Homogeneous pipe"),
+        # TODO: define variable data for inner/outer diameters
+        "OD": key("OD"),
+        "ID": key("ID"),
+        "MaterialDensity": key("density"),
+        "E": key("E"),
+        "PoissonRatio": key("Poisson"),
+        "Cdx": key("Cdx"),
+        "Cdz": key("Cdz"),
+        "Cl": key("Cl", 0.0),
+        "Cax": key("Cax"),
+        "Caz": key("Caz"),
+        "SeabedNormalFrictionCoefficient": const(0.0),
+    },
+}
+
+# Property -> properties that must be written before it
+dependencies = {
+    "TargetSegmentLength": ["Length"],
+    "LineType": ["Length"],
+    "OD": ["Category"],
+    "ID": ["Category"],
+    "MaterialDensity": ["Category"],
+    "E": ["Category"],
+    "PoissonRatio": ["Category"],
+    "TimeHistoryDataSource": ["ConstraintType"],
+    "TimeHistoryFileName": ["TimeHistoryDataSource"],
+    "TimeHistoryInterpolation": ["ConstraintType"],
+}
+
+
+def get_writes(table: str, item: dict, context: dict = None) -> dict:
+    """Property writes of an item, sorted by dependencies
+
+    Args:
+        table (str): e.g.: "lines" (see 'tables')
+        item (dict): input definition of the object
+        context (dict, optional): other input sections and references.
+            Defaults to None.
+
+    Returns:
+        dict: property -> value
+    """
+
+    writes = dict()
+    for prop, source in tables[table].items():
+        value = source(item, context or dict())
+        if value is not SKIP:
+            writes[prop] = value
+    writes |= item.get("properties", dict())
+    return sort_writes(writes)
+
+
+def sort_writes(writes: dict) -> dict:
+    """Sort writes so that dependencies are written first (otherwise, the
+    order is kept)
+
+    Args:
+        writes (dict): property -> value
+
+    Returns:
+        dict: [description]
+    """
+
+    ordered = dict()
+
+    def add(prop):
+        if prop in ordered:
+            return None
+        for dependency in dependencies.get(prop, []):
+            if dependency in writes:
+                add(dependency)
+        ordered[prop] = writes[prop]
+
+    for prop in writes:
+        add(prop)
+    return ordered
+
+
+class PropertyWriter:
+    """Apply the property writes of generated objects, attribute by
+    attribute"""
+
+    def write(self, obj, table: str, item: dict, context: dict = None) -> None:
+        """Write the properties of an object
+
+        Args:
+            obj (orca.OrcaFlexObject): [description]
+            table (str): e.g.: "lines" (see 'tables')
+            item (dict): input definition of the object
+            context (dict, optional): [description]. Defaults to None.
+        """
+
+        PropertyWriter.set_attributes(obj, get_writes(table, item, context))
+
+    @staticmethod
+    def set_attributes(obj, writes: dict) -> None:
+        for prop, value in writes.items():
+            setattr(obj, prop, value)
@@ -0,0 +1,113 @@
+from IO import IO
+from BatchJournal import BatchJournal
+import AuxFunctions as aux
+
+import json
+
+
+class ResultSink:
+    """Destination of the results of each batch case
+
+    Results are exported and journaled as soon as a case finishes. With
+    streaming (PostProcessing option "streaming": true), the results of the
+    case are then released and the rows of the batch results are appended
+    to a file, so memory does not grow with the number of cases.
+    """
+
+    def __init__(self, post) -> None:
+        """[summary]
+
+        Args:
+            post (Post): [description]
+        """
+
+        self.post = post
+        self.streaming = post.options.get("streaming", False)
+        self.journal = BatchJournal()
+
+        # Rows of the batch results, in case order
+        self.rows = []
+        self.rows_file = IO.results_dir + IO.name_no_extension + "_rows.jsonl"
+        if self.streaming:
+            open(self.rows_file, "w").close()
+
+    def push(self, name: str, params: dict, output) -> None:
+        """Export, journal and release the results of a case
+
+        Args:
+            name (str): case name (see 'BatchSimulations.get_file_name')
+            params (dict): case parameters
+            output (CaseOutput): [description]
+        """
+
+        # Results exported in background -> not changed by the next case
+        # (e.g.: modal results added to the same dictionary)
+        results = dict(output.results)
+        results["modal"] = dict(results.get("modal", dict()))
+        output = output._replace(results=results)
+
+        if IO.writer is not None:
+            # Files of the case being written -> journal after them
+            IO.writer.submit(
+                self.persist, name, params, output, IO.writer.pop_recent()
+            )
+        else:
+            self.persist(name, params, output)
+        self.add_row(output.row)
+
+        if self.streaming:
+            self.post.clear_results()
+        else:
+            # Keep the results of the last case (as in sequential runs)
+            self.post.results = output.results
+
+    def persist(self, name: str, params: dict, output, pending=None) -> None:
+        """Export results and journal the case
+
+        Args:
+            name (str): [description]
+            params (dict): [description]
+            output (CaseOutput): [description]
+            pending (list[Future], optional): files of the case being
+                written in background. Defaults to None.
+        """
+
+        files = output.files + IO.export_step_from_batch(
+            name, output.results, self.post.formats
+        )
+        if pending:
+            IO.writer.wait(pending)
+        self.journal.record(name, params, files, output.row)
+
+    def push_finished(self, name: str) -> None:
+        """Add a case finished in a previous execution
+
+        Args:
+            name (str): [description]
+        """
+
+        print(f'Case "{name}" already finished')
+        self.add_row(self.journal.get_row(name))
+
+    def add_row(self, row) -> None:
+        if not self.streaming:
+            self.rows.append(row)
+            return None
+
+        with open(self.rows_file, "a") as rows_file:
+            rows_file.write(
+                json.dumps(row, default=aux.to_serializable) + "\n"
+            )
+
+    def get_rows(self) -> list:
+        """Rows of all cases pushed to the sink
+
+        Returns:
+            list: [description]
+        """
+
+        if not self.streaming:
+            return self.rows
+
+        with open(self.rows_file, "r") as rows_file:
+            return [json.loads(line) for line in rows_file]
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from OnlineStatistics import OnlineStatistics
+from Fatigue import Fatigue
+from Spectral import Spectral
+
+
+class ResultsBuilder:
+    """Columnar accumulator of postprocessed results
+
+    Columns are copied into a preallocated 2D array (samples x columns)
+    and the DataFrame is created once, in 'to_frame', instead of
+    inserting each time history as a new DataFrame column.
+
+    With an 'OnlineStatistics' accumulator, the statistics of each column
+    (except "Time") are updated as it is added; the series may then be
+    dropped ('keep_series=False') and only the statistics are kept. The
+    same applies to the fatigue damage of tension channels ('Fatigue')
+    and to the spectra of selected channels ('Spectral').
+    """
+
+    def __init__(
+        self,
+        n_cols: int = 0,
+        stats: OnlineStatistics = None,
+        keep_series=True,
+        fatigue: Fatigue = None,
+        spectral: Spectral = None,
+    ) -> None:
+        """[summary]
+
+        Args:
+            n_cols (int, optional): expected number of columns. Defaults to 0.
+            stats (OnlineStatistics, optional): statistics of the columns.
+                Defaults to None.
+            keep_series (bool, optional): store the columns. Defaults to True.
+            fatigue (Fatigue, optional): damage of the columns.
+                Defaults to None.
+            spectral (Spectral, optional): spectra of the columns.
+                Defaults to None.
+        """
+
+        self.capacity = max(n_cols, 1)
+        self.n_rows = 0
+        self.data: np.ndarray = None  # allocated with the first column
+        self.columns: list[str] = []
+        self.col_index: dict[str, int] = dict()
+
+        self.stats = stats
+        self.fatigue = fatigue
+        self.spectral = spectral
+        self.keep_series = keep_series or stats is None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.col_index
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __setitem__(self, name: str, values) -> None:
+        self.add(name, values)
+
+    def reserve(self, n_cols: int) -> None:
+        """Ensure space for (at least) 'n_cols' new columns
+
+        Args:
+            n_cols (int): number of columns to be added
+        """
+
+        required = len(self.columns) + n_cols
+        if required <= self.capacity:
+            return None
+
+        # Grow geometrically to amortize unexpected columns
+        self.capacity = max(required, 2 * self.capacity)
+        if self.data is not None:
+            data = np.empty((self.n_rows, self.capacity))
+            data[:, : len(self.columns)] = self.data[:, : len(self.columns)]
+            self.data = data
+
+    def add(self, name: str, values) -> None:
+        """Add (or replace) a column
+
+        Args:
+            name (str): column name
+            values (array_like): time history (or static value)
+        """
+
+        self.add_block([name], np.asarray(values, dtype=float).reshape(-1, 1))
+
+    def add_block(self, names: list[str], block) -> None:
+        """Add (or replace) a set of columns
+
+        Args:
+            names (list[str]): column names (repeated names -> last column)
+            block (array_like): 2D array (samples x len(names))
+        """
+
+        block = np.asarray(block, dtype=float).reshape(-1, len(names))
+        if len(set(names)) < len(names):
+            # Repeated names -> last column (as a replaced column), so no
+            # column is left unwritten
+            last = {name: i for i, name in enumerate(names)}
+            names, block = list(last), block[:, list(last.values())]
+
+        if self.stats is not None:
+            summarized = [i for i, name in enumerate(names) if name != "Time"]
+            if summarized:
+                self.stats.update(
+                    [names[i] for i in summarized], block[:, summarized]
+                )
+        for consumer in (self.fatigue, self.spectral):
+            if consumer is not None:
+                consumer.update(names, block)
+        if not self.keep_series:
+            # Only the names are kept (see '__contains__')
+            for name in names:
+                if name not in self.col_index:
+                    self.col_index[name] = len(self.columns)
+                    self.columns.append(name)
+            return None
+
+        if self.data is None:
+            self.n_rows = block.shape[0]
+            self.data = np.empty((self.n_rows, self.capacity))
+
+        new_names = [name for name in names if name not in self.col_index]
+        self.reserve(len(new_names))
+        for name in new_names:
+            self.col_index[name] = len(self.columns)
+            self.columns.append(name)
+
+        cols = [self.col_index[name] for name in names]
+        # Contiguous columns (the usual case) -> copy without fancy indexing
+        if cols == list(range(cols[0], cols[0] + len(cols))):
+            self.data[:, cols[0] : cols[0] + len(cols)] = block
+        else:
+            self.data[:, cols] = block
+
+    def to_frame(self) -> pd.DataFrame:
+        """Create the DataFrame with all columns added
+
+        Returns:
+            pd.DataFrame: [description]
+        """
+
+        if self.data is None or not self.keep_series:
+            return pd.DataFrame()
+
+        n_cols = len(self.columns)
+        # Copy only if there is unused (preallocated) space
+        data = (
+            self.data
+            if n_cols == self.capacity
+            else self.data[:, :n_cols].copy()
+        )
+
+        return pd.DataFrame(data, columns=self.columns)
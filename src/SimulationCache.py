@@ -0,0 +1,213 @@
+from IO import IO
+import AuxFunctions as aux
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+
+class SimulationCache:
+    """On-disk cache of batch cases
+
+    Entries are keyed by a hash of the model definition (sections of the
+    input file and digest of the reference Orcaflex file) and of the case
+    parameters. Each entry keeps the simulation file of the case and the
+    postprocessed output for each postprocessing definition, so a change in
+    "PostProcessing" reloads the simulation instead of solving it again.
+
+    The total size is bounded, evicting the least recently used entries.
+    """
+
+    # Sections of the input file that define the model and the analyses
+    model_sections = [
+        "Environment",
+        "Analysis",
+        "Line types",
+        "Lines",
+        "Keypoints",
+        "Segment Set",
+        "Platforms",
+        "Towers",
+        "Tower sections",
+        "Turbines",
+        # Farm objects are only expanded in memory (see 'FarmLayout')
+        "Farm",
+    ]
+
+    sim_file = "case.sim"
+
+    def __init__(self, opt) -> None:
+        """[summary]
+
+        Args:
+            opt (dict | bool): "cache" batch option. If 'true', the default
+                options are used
+        """
+
+        if not isinstance(opt, dict):
+            opt = dict()
+
+        self.dir = opt.get("dir", IO.output_dir + "cache/")
+        os.makedirs(self.dir, exist_ok=True)
+        # Maximum size (GB)
+        self.max_size = opt.get("max size", 10.0) * 1024**3
+        self.store_simulation = opt.get("store simulation", True)
+
+        self.model_hash = self.get_model_hash()
+
+    @staticmethod
+    def hash_data(data) -> str:
+        """SHA-256 of JSON serializable data (arrays are converted to lists)
+
+        Args:
+            data ([type]): [description]
+
+        Returns:
+            str: [description]
+        """
+
+        text = json.dumps(data, sort_keys=True, default=aux.to_serializable)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def hash_file(file_name) -> str:
+        digest = hashlib.sha256()
+        with open(file_name, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_model_hash() -> str:
+        data = IO.input_data
+        model = {
+            section: data[section]
+            for section in SimulationCache.model_sections
+            if section in data
+        }
+
+        # Digest of the reference model, if loaded from a file
+        inp = data.get("File IO", dict()).get("input", dict())
+        for action, file_key in [
+            ("load data", "Orcaflex data"),
+            ("load simulation", "Orcaflex simulation"),
+        ]:
+            if IO.actions.get(action) and inp.get(file_key):
+                model[file_key] = SimulationCache.hash_file(
+                    inp.get("dir", "./") + inp[file_key]
+                )
+
+        return SimulationCache.hash_data(model)
+
+    def get_key(self, batch_type: str, case_params: dict) -> str:
+        """Key of a case -> model and case parameters
+
+        Args:
+            batch_type (str): [description]
+            case_params (dict): [description]
+
+        Returns:
+            str: [description]
+        """
+
+        return self.hash_data([self.model_hash, batch_type, case_params])
+
+    def get_post_key(self, post_params: dict) -> str:
+        return self.hash_data(
+            [IO.input_data.get("PostProcessing"), post_params]
+        )
+
+    def get_simulation(self, key: str):
+        """Simulation file of a case (None if not cached)
+
+        Args:
+            key (str): [description]
+
+        Returns:
+            str | None: [description]
+        """
+
+        sim_file = os.path.join(self.dir, key, SimulationCache.sim_file)
+        if not os.path.isfile(sim_file):
+            return None
+
+        self.touch(key)
+        return sim_file
+
+    def get_output(self, key: str, post_key: str):
+        """Postprocessed output of a case (None if not cached)
+
+        Args:
+            key (str): [description]
+            post_key (str): [description]
+
+        Returns:
+            CaseOutput | None: [description]
+        """
+
+        output_file = os.path.join(self.dir, key, post_key + ".pkl")
+        if not os.path.isfile(output_file):
+            return None
+
+        self.touch(key)
+        with open(output_file, "rb") as file:
+            return pickle.load(file)
+
+    def store(self, key: str, post_key: str, output, model) -> None:
+        """Save the output (and simulation) of a case
+
+        Args:
+            key (str): [description]
+            post_key (str): [description]
+            output (CaseOutput): [description]
+            model (orca.Model): [description]
+        """
+
+        entry = os.path.join(self.dir, key)
+        os.makedirs(entry, exist_ok=True)
+
+        sim_file = os.path.join(entry, SimulationCache.sim_file)
+        if self.store_simulation and not os.path.isfile(sim_file):
+            model.SaveSimulation(sim_file + ".tmp")
+            os.replace(sim_file + ".tmp", sim_file)
+
+        # Write and rename -> other processes never read partial files
+        output_file = os.path.join(entry, post_key + ".pkl")
+        with open(output_file + ".tmp", "wb") as file:
+            pickle.dump(output, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(output_file + ".tmp", output_file)
+
+        self.touch(key)
+        self.evict()
+
+    def touch(self, key: str) -> None:
+        # Last access -> modification time of the entry directory
+        try:
+            os.utime(os.path.join(self.dir, key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under 'max size'"""
+
+        entries = []
+        for key in os.listdir(self.dir):
+            entry = os.path.join(self.dir, key)
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry, file))
+                    for file in os.listdir(entry)
+                )
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                continue  # removed by another process
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            print(f'Removing "{entry}" from cache')
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
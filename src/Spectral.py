@@ -0,0 +1,212 @@
+import re
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class Spectral:
+    """Welch power and cross spectral densities of dynamic results
+
+    Selected channels are updated as the results are extracted (see
+    'ResultsBuilder'): the segments of all channels of a block are
+    transformed at once (batched real FFT). Cross spectra are evaluated
+    against a reference channel (wave elevation), to estimate transfer
+    functions (RAOs). Sums over segments are kept, so spectra of several
+    simulations (e.g.: wave seeds) are averaged with 'combine'.
+
+    Options (PostProcessing "spectral"):
+        "segment": samples per segment. Defaults to 256
+        "overlap": fraction of overlapping samples. Defaults to 0.5
+        "channels": regular expressions of the columns to evaluate.
+            Defaults to ["^Platform"] (DoFs of all platforms)
+        "wave point": position [x, y, z] of the wave elevation.
+            Defaults to [0, 0, 0]
+    """
+
+    reference_name = "Wave elevation"
+
+    def __init__(self, opt: dict, sample_interval: float) -> None:
+        """[summary]
+
+        Args:
+            opt (dict): [description]
+            sample_interval (float): time between samples (s)
+        """
+
+        self.segment = opt.get("segment", 256)
+        self.overlap = opt.get("overlap", 0.5)
+        self.patterns = [
+            re.compile(p) for p in opt.get("channels", ["^Platform"])
+        ]
+        self.sample_interval = sample_interval
+
+        # Samples per segment (limited by the simulation samples)
+        self.n_fft = self.segment
+        # Sums over segments (and simulations)
+        self.n_segments = 0
+        self.ref_fft: np.ndarray = None  # segments of the current simulation
+        self.ref_psd: np.ndarray = None
+        self.psd: dict[str, np.ndarray] = dict()
+        self.csd: dict[str, np.ndarray] = dict()
+
+    def is_selected(self, name: str) -> bool:
+        return any(pattern.search(name) for pattern in self.patterns)
+
+    def get_segments_fft(self, block: np.ndarray) -> np.ndarray:
+        """FFT of the (detrended and windowed) segments of each channel
+
+        Args:
+            block (np.ndarray): samples x channels
+
+        Returns:
+            np.ndarray: segments x channels x frequencies
+        """
+
+        segment = min(self.segment, block.shape[0])
+        self.n_fft = segment
+        step = max(int(segment * (1.0 - self.overlap)), 1)
+        segments = sliding_window_view(block, segment, axis=0)[::step]
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        return np.fft.rfft(segments * self.get_window(segment), axis=-1)
+
+    @staticmethod
+    def get_window(segment: int) -> np.ndarray:
+        # Periodic Hann window
+        return 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(segment) / segment)
+
+    def set_reference(self, elevation) -> None:
+        """Set the reference channel (wave elevation) of a simulation
+
+        Args:
+            elevation (array_like): time history
+        """
+
+        ref = self.get_segments_fft(
+            np.asarray(elevation, dtype=float)[:, None]
+        )
+        self.ref_fft = ref[:, 0, :]
+        ref_psd = np.sum(np.abs(self.ref_fft) ** 2, axis=0)
+        self.ref_psd = (
+            ref_psd if self.ref_psd is None else self.ref_psd + ref_psd
+        )
+        self.n_segments += len(self.ref_fft)
+
+    def update(self, names: list[str], block) -> None:
+        """Add the spectra of the selected channels of a block
+
+        Args:
+            names (list[str]): channel names
+            block (array_like): 2D array (samples x len(names))
+        """
+
+        cols = [i for i, name in enumerate(names) if self.is_selected(name)]
+        if not cols:
+            return None
+
+        block = np.asarray(block, dtype=float).reshape(-1, len(names))
+        fft = self.get_segments_fft(block[:, cols])
+        psd = np.sum(np.abs(fft) ** 2, axis=0)
+        csd = None
+        if self.ref_fft is not None:
+            csd = np.einsum("sf,scf->cf", np.conj(self.ref_fft), fft)
+
+        for i, col in enumerate(cols):
+            name = names[col]
+            self.psd[name] = self.psd.get(name, 0.0) + psd[i]
+            if csd is not None:
+                self.csd[name] = self.csd.get(name, 0.0) + csd[i]
+
+    def combine(self, other) -> None:
+        """Add the spectra of another simulation (same options)
+
+        Args:
+            other (Spectral): [description]
+        """
+
+        self.n_fft = other.n_fft
+        self.n_segments += other.n_segments
+        if other.ref_psd is not None:
+            self.ref_psd = (
+                other.ref_psd
+                if self.ref_psd is None
+                else self.ref_psd + other.ref_psd
+            )
+        for name, psd in other.psd.items():
+            self.psd[name] = self.psd.get(name, 0.0) + psd
+        for name, csd in other.csd.items():
+            self.csd[name] = self.csd.get(name, 0.0) + csd
+
+    def release_segments(self) -> None:
+        """Release the FFT of the reference (after the simulation)"""
+
+        self.ref_fft = None
+
+    def get_frequencies(self) -> np.ndarray:
+        return np.fft.rfftfreq(self.n_fft, self.sample_interval)
+
+    def get_scale(self) -> np.ndarray:
+        """One-sided density scale (average over segments)
+
+        Returns:
+            np.ndarray: scale of each frequency
+        """
+
+        window = self.get_window(self.n_fft)
+        scale = np.full(
+            self.n_fft // 2 + 1,
+            2.0
+            * self.sample_interval
+            / (np.sum(window**2) * max(self.n_segments, 1)),
+        )
+        # Zero and Nyquist frequencies are not folded
+        scale[0] /= 2.0
+        if self.n_fft % 2 == 0:
+            scale[-1] /= 2.0
+        return scale
+
+    def get_spectra(self) -> pd.DataFrame:
+        """Power spectral densities (columns "<channel>_PSD")
+
+        Returns:
+            pd.DataFrame: indexed by frequency (Hz)
+        """
+
+        if not self.psd and self.ref_psd is None:
+            return pd.DataFrame()
+
+        frequencies = self.get_frequencies()
+        scale = self.get_scale()
+        spectra = dict()
+        if self.ref_psd is not None:
+            spectra[self.reference_name + "_PSD"] = self.ref_psd * scale
+        for name, psd in self.psd.items():
+            spectra[name + "_PSD"] = psd * scale
+
+        return pd.DataFrame(
+            spectra, index=pd.Index(frequencies, name="Frequency")
+        )
+
+    def get_rao(self) -> pd.DataFrame:
+        """Transfer functions from the wave elevation (H1 estimator):
+        amplitude, phase (deg) and coherence of each channel
+
+        Returns:
+            pd.DataFrame: indexed by frequency (Hz)
+        """
+
+        if not self.csd:
+            return pd.DataFrame()
+
+        frequencies = self.get_frequencies()
+        rao = dict()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name, csd in self.csd.items():
+                transfer = csd / self.ref_psd
+                rao[name + "_RAO"] = np.abs(transfer)
+                rao[name + "_phase"] = np.degrees(np.angle(transfer))
+                rao[name + "_coherence"] = np.abs(csd) ** 2 / (
+                    self.ref_psd * self.psd[name]
+                )
+
+        return pd.DataFrame(rao, index=pd.Index(frequencies, name="Frequency"))